@@ -1,29 +1,464 @@
+import { performance } from 'perf_hooks'
 import { v4 as uuidv4 } from 'uuid'
 import { NextResponse } from 'next/server'
-import bcrypt from 'bcryptjs'
 import jwt from 'jsonwebtoken'
+import { createDB, COLLECTIONS, SEARCHABLE_COLLECTIONS, SEARCH_FIELDS } from '@/lib/db'
+import { readSeedSnapshot, writeSeedSnapshot, applySeedSnapshot } from '@/lib/seed'
+import { PasswordHasher, PasswordQueueFullError } from '@/lib/password-hasher'
+import { TokenCache } from '@/lib/token-cache'
+import { Persistence } from '@/lib/persistence'
+import { createStore, StoreConflictError } from '@/lib/store'
+import { Router } from '@/lib/router'
+import { EventFeed } from '@/lib/event-feed'
+import { Metrics, UNMATCHED_ROUTE } from '@/lib/metrics'
+import { TrafficCapture } from '@/lib/capture'
+import { AdmissionController, DEFAULT_CLASSES, parseLimits } from '@/lib/admission'
 
-// In-memory storage (for development)
-let inMemoryDB = {
-  users: [],
-  rockets: [],
-  missions: [],
-  teams: [],
-  schedules: []
-}
+// In-memory storage (for development), indexed by id and user email
+const inMemoryDB = createDB()
 
 // JWT secret
 const JWT_SECRET = process.env.JWT_SECRET || 'your-secret-key-here'
 
+// Request, password queue and event-loop metrics for GET /metrics (per process)
+const metrics = new Metrics()
+
+// bcrypt runs on worker threads so hashing bursts don't block other routes
+const passwordHasher = new PasswordHasher({
+  workers: process.env.BCRYPT_WORKERS !== undefined ? Number(process.env.BCRYPT_WORKERS) : undefined,
+  maxQueue: Number(process.env.BCRYPT_MAX_QUEUE || 1000),
+  cost: Number(process.env.BCRYPT_COST || 10),
+  queueTime: metrics.passwordQueueTime
+})
+
+// Recently verified tokens with their users (TOKEN_CACHE_SIZE=0 disables)
+const tokenCache = new TokenCache({ maxEntries: Number(process.env.TOKEN_CACHE_SIZE ?? 10000) })
+
+// Optional seed snapshot: loaded at startup when present, written after the first bootstrap otherwise
+const SEED_SNAPSHOT = process.env.SEED_SNAPSHOT
+
+// Optional durable storage: with DATA_DIR set, writes go to a write-ahead log
+// in that directory and the collections are recovered from it on boot
+const DATA_DIR = process.env.DATA_DIR
+const persistence = DATA_DIR ? new Persistence({
+  dir: DATA_DIR,
+  fsync: process.env.WAL_FSYNC || 'batch',
+  intervalMs: Number(process.env.WAL_FSYNC_INTERVAL_MS || 1000),
+  snapshotEvery: Number(process.env.WAL_SNAPSHOT_EVERY || 100000)
+}) : null
+
+// Insert events for GET /events, the last EVENT_RING_SIZE of them kept for resuming
+const eventFeed = new EventFeed({
+  capacity: Number(process.env.EVENT_RING_SIZE || 1000),
+  collections: COLLECTIONS
+})
+
+// All writes go through the store: local to this process, or replicated to
+// every worker when started by the cluster launcher (server.js)
+const store = createStore(inMemoryDB, persistence, eventFeed)
+
+// Optional traffic capture for replay (backend_test.py --replay): every request
+// is appended to CAPTURE_FILE, suffixed with the worker id under the cluster launcher
+const CAPTURE_FILE = process.env.CAPTURE_FILE
+const capture = CAPTURE_FILE ? new TrafficCapture({
+  file: store.workerId ? `${CAPTURE_FILE}.${store.workerId}` : CAPTURE_FILE,
+  maxBodyBytes: Number(process.env.CAPTURE_MAX_BODY_BYTES || 64 * 1024),
+  worker: store.workerId
+}) : null
+
+// Admission control (ADMISSION=off disables it): each route waits for a slot
+// in its priority class, requests that would queue past ADMISSION_TARGET_MS
+// are answered 503 with Retry-After, and logins and full-collection reads
+// are shed while event-loop lag is over ADMISSION_LAG_MS. Concurrent
+// logins default to twice the bcrypt workers; ADMISSION_LIMITS=auth=16,heavy=4
+// overrides any class. RATE_LIMIT_RPS adds a token bucket per client.
+const admission = process.env.ADMISSION === 'off' ? null : new AdmissionController({
+  classes: parseLimits(process.env.ADMISSION_LIMITS, {
+    ...DEFAULT_CLASSES,
+    auth: { ...DEFAULT_CLASSES.auth, limit: Math.max(2, passwordHasher.size * 2) }
+  }),
+  targetMs: Number(process.env.ADMISSION_TARGET_MS || 500),
+  lag: () => metrics.recentLag(),
+  lagTargetMs: Number(process.env.ADMISSION_LAG_MS || 250),
+  rate: Number(process.env.RATE_LIMIT_RPS || 0),
+  burst: Number(process.env.RATE_LIMIT_BURST || 0)
+})
+
+metrics
+  .gauge('collection_records', 'Records per collection', () => Object.fromEntries(
+    ['users', ...COLLECTIONS].map(name => [name, inMemoryDB[name].size])
+  ), 'collection')
+  .gauge('password_queue_depth', 'Password tasks waiting for a bcrypt worker', () => passwordHasher.queue.length)
+  .gauge('password_workers_busy', 'bcrypt workers running a task', () => passwordHasher.busy.size)
+  .gauge('token_cache_entries', 'Verified tokens in the auth cache', () => tokenCache.size)
+  .gauge('event_feed_subscribers', 'Open GET /events streams', () => eventFeed.subscribers.size)
+
+if (admission) {
+  const perClass = read => () => Object.fromEntries([...admission.gates].map(([name, gate]) => [name, read(gate)]))
+  metrics
+    .gauge('admission_active', 'Admitted requests running, by priority class', perClass(gate => gate.active), 'class')
+    .gauge('admission_queued', 'Requests waiting for admission, by priority class', perClass(gate => gate.queue.length), 'class')
+}
+
 // Helper function to handle CORS
 function handleCORS(response) {
   response.headers.set('Access-Control-Allow-Origin', '*')
   response.headers.set('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-  response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+  response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match, Last-Event-ID')
+  response.headers.set('Access-Control-Expose-Headers', 'ETag')
   response.headers.set('Access-Control-Allow-Credentials', 'true')
+  if (store.workerId) response.headers.set('X-Worker-Id', store.workerId)
   return response
 }
 
+// Largest page a list route will return in one response
+const MAX_PAGE_SIZE = 1000
+
+// Page size of search results without ?limit
+const DEFAULT_SEARCH_LIMIT = 100
+
+// Distinguishes collection versions across restarts in ETags
+const BOOT_ID = uuidv4().slice(0, 8)
+
+// Serialized list bodies per collection, valid for a single collection version
+const MAX_CACHED_BODIES = 100
+const responseCache = new Map()
+
+function cachedBody(collection, key, build) {
+  let entry = responseCache.get(collection.name)
+  if (!entry || entry.version !== collection.version) {
+    entry = { version: collection.version, bodies: new Map() }
+    responseCache.set(collection.name, entry)
+  }
+
+  let body = entry.bodies.get(key)
+  if (body === undefined) {
+    body = JSON.stringify(build())
+    if (entry.bodies.size < MAX_CACHED_BODIES) entry.bodies.set(key, body)
+  }
+  return body
+}
+
+function etagMatches(request, etag) {
+  const header = request.headers.get('If-None-Match')
+  if (!header) return false
+  return header.split(',').some(tag => {
+    const value = tag.trim()
+    return value === '*' || value.replace(/^W\//, '') === etag
+  })
+}
+
+// Maps records to the ?fields= projection (id is always kept)
+function projection(fields) {
+  if (!fields) return item => item
+  const keys = ['id', ...fields.split(',').map(field => field.trim()).filter(Boolean)]
+  return item => Object.fromEntries(keys.filter(key => key in item).map(key => [key, item[key]]))
+}
+
+// Roughly how much NDJSON is serialized per pull from the response stream
+const STREAM_CHUNK_BYTES = 64 * 1024
+
+// Stream records as NDJSON. Serialization happens in pull(), which runs only
+// when the client has drained the previous chunk, so a slow reader holds the
+// server at one chunk instead of the whole collection.
+function streamCollection(records, limit, project, headers) {
+  const encoder = new TextEncoder()
+  let sent = 0
+  const stream = new ReadableStream({
+    pull(controller) {
+      let chunk = ''
+      while (chunk.length < STREAM_CHUNK_BYTES) {
+        const next = sent < limit ? records.next() : { done: true }
+        if (next.done) {
+          if (chunk) controller.enqueue(encoder.encode(chunk))
+          controller.close()
+          return
+        }
+        chunk += JSON.stringify(project(next.value)) + '\n'
+        sent++
+      }
+      controller.enqueue(encoder.encode(chunk))
+    },
+    cancel() {
+      records.return()
+    }
+  })
+  return new NextResponse(stream, { status: 200, headers })
+}
+
+function invalidLimit() {
+  return NextResponse.json({ error: "limit must be a positive integer" }, { status: 400 })
+}
+
+function parseLimit(limitParam) {
+  if (limitParam === null) return Infinity
+  const limit = Number(limitParam)
+  return Number.isInteger(limit) && limit >= 1 ? limit : null
+}
+
+// Serialized JSON list body: the plain array, or { items, nextCursor } when paged.
+// Cached under the query string, so identical list and dashboard queries share it.
+function listBody(collection, key, { limit, paged, after, status, fields }) {
+  return cachedBody(collection, key, () => {
+    const filter = status ? item => item.status === status : null
+    const page = collection.page({ limit: paged ? Math.min(limit, MAX_PAGE_SIZE) : Infinity, after, filter })
+    const items = fields ? page.items.map(projection(fields)) : page.items
+    return paged ? { items, nextCursor: page.nextCursor } : items
+  })
+}
+
+// ETag of a collection list in the representation the request accepts
+function listEtag(request, collection) {
+  const ndjson = (request.headers.get('Accept') || '').includes('application/x-ndjson')
+  return `"${BOOT_ID}-${collection.name}-${collection.version}${ndjson ? '-ndjson' : ''}"`
+}
+
+// List a collection newest first. Supports keyset pagination (?limit=&after=<id>),
+// ?status= filtering and ?fields= projection; without ?limit the plain array is returned.
+// Bodies are cached per collection version and served with an ETag for conditional GETs.
+// With Accept: application/x-ndjson the records are streamed one per line instead
+// (?limit is then an uncapped maximum and no cursor is returned).
+function listCollection(request, collection) {
+  const { searchParams } = new URL(request.url)
+  const limitParam = searchParams.get('limit')
+  const after = searchParams.get('after')
+  const status = searchParams.get('status')
+  const fields = searchParams.get('fields')
+  const ndjson = (request.headers.get('Accept') || '').includes('application/x-ndjson')
+
+  const limit = parseLimit(limitParam)
+  if (limit === null) return invalidLimit()
+
+  if (after && !collection.get(after)) {
+    return NextResponse.json({ error: "Invalid cursor" }, { status: 400 })
+  }
+
+  const etag = listEtag(request, collection)
+  const headers = {
+    'Content-Type': ndjson ? 'application/x-ndjson' : 'application/json',
+    'ETag': etag,
+    'Cache-Control': 'no-cache',
+    'Vary': 'Accept'
+  }
+  if (etagMatches(request, etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  if (ndjson) {
+    const filter = status ? item => item.status === status : null
+    return streamCollection(collection.iterate({ after, filter }), limit, projection(fields), headers)
+  }
+
+  const body = listBody(collection, searchParams.toString(), {
+    limit, paged: limitParam !== null, after, status, fields
+  })
+  return new NextResponse(body, { status: 200, headers })
+}
+
+// Collections served together by GET /dashboard, in payload order
+const DASHBOARD_COLLECTIONS = ['rockets', 'missions', 'teams', 'schedules']
+
+// Assembled dashboard bodies per query, valid for a single dashboard version
+const dashboardCache = new Map()
+
+// Changes whenever any dashboard collection is written
+function dashboardVersion() {
+  return `${BOOT_ID}-${DASHBOARD_COLLECTIONS.map(name => inMemoryDB[name].version).join('.')}`
+}
+
+// Everything the home page needs in one response: { version, rockets, missions,
+// teams, schedules }. Takes the list query (?limit=, ?status=, ?fields=) and
+// applies it to every collection, so each one matches its own list route; with
+// ?limit each collection is a first page to continue there with ?after=.
+function dashboard(request) {
+  const { searchParams } = new URL(request.url)
+  if (searchParams.has('after')) {
+    return NextResponse.json(
+      { error: "Cursors are per collection; continue paging through the collection's own route" },
+      { status: 400 }
+    )
+  }
+
+  const limit = parseLimit(searchParams.get('limit'))
+  if (limit === null) return invalidLimit()
+
+  const version = dashboardVersion()
+  const etag = `"${version}-dashboard"`
+  const headers = { 'Content-Type': 'application/json', 'ETag': etag, 'Cache-Control': 'no-cache' }
+  if (etagMatches(request, etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  const key = searchParams.toString()
+  let entry = dashboardCache.get(key)
+  if (!entry || entry.version !== version) {
+    const options = {
+      limit,
+      paged: searchParams.has('limit'),
+      status: searchParams.get('status'),
+      fields: searchParams.get('fields')
+    }
+    // Splice the cached list bodies together rather than re-serializing the records
+    const parts = DASHBOARD_COLLECTIONS.map(name => `"${name}":${listBody(inMemoryDB[name], key, options)}`)
+    entry = { version, body: `{"version":${JSON.stringify(version)},${parts.join(',')}}` }
+    if (dashboardCache.size < MAX_CACHED_BODIES || dashboardCache.has(key)) dashboardCache.set(key, entry)
+  }
+  return new NextResponse(entry.body, { status: 200, headers })
+}
+
+// Search missions or schedules through their indexes: ?from=&to= (launchDate
+// range, inclusive), ?status=, ?launchSite=, ?customer=, ?rocket= (exact,
+// case-insensitive), ?q= (all words must appear in name/missionName/description),
+// ?fields= projection. Results come in launchDate order as { items, nextCursor }
+// pages of ?limit= (default 100) continued with ?after=<nextCursor>.
+function searchCollection(request, collection) {
+  const { searchParams } = new URL(request.url)
+
+  const range = {}
+  for (const bound of ['from', 'to']) {
+    const value = searchParams.get(bound)
+    if (value === null) continue
+    range[bound] = Date.parse(value)
+    if (Number.isNaN(range[bound])) {
+      return NextResponse.json({ error: `${bound} must be a date` }, { status: 400 })
+    }
+  }
+
+  const limit = parseLimit(searchParams.get('limit') ?? String(DEFAULT_SEARCH_LIMIT))
+  if (limit === null) return invalidLimit()
+
+  const where = {}
+  for (const field of SEARCH_FIELDS) {
+    if (searchParams.has(field)) where[field] = searchParams.get(field)
+  }
+
+  const etag = `"${BOOT_ID}-${collection.name}-${collection.version}-search"`
+  const headers = { 'Content-Type': 'application/json', 'ETag': etag, 'Cache-Control': 'no-cache' }
+  if (etagMatches(request, etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  const page = collection.search({
+    ...range,
+    where,
+    text: searchParams.get('q') || '',
+    limit: Math.min(limit, MAX_PAGE_SIZE),
+    after: searchParams.get('after')
+  })
+  if (!page) {
+    return NextResponse.json({ error: "Invalid cursor" }, { status: 400 })
+  }
+
+  const fields = searchParams.get('fields')
+  const items = fields ? page.items.map(projection(fields)) : page.items
+  return new NextResponse(JSON.stringify({ items, nextCursor: page.nextCursor }), { status: 200, headers })
+}
+
+// Largest batch accepted by POST /<collection>/bulk
+const MAX_BULK_ITEMS = 100000
+// Largest bulk body; a JSON array is parsed in one piece, so this is what
+// bounds its memory (the item cap only applies once it is parsed)
+const MAX_BULK_BYTES = 64 * 1024 * 1024
+
+class BulkValidationError extends Error {
+  constructor(message, index, status = 400) {
+    super(message)
+    this.index = index
+    this.status = status
+  }
+}
+
+// Chunks of the body, refused with 413 past MAX_BULK_BYTES: up front from
+// Content-Length, else as soon as the running count passes it
+async function* bulkChunks(request) {
+  const tooLarge = () => new BulkValidationError(`Body larger than ${MAX_BULK_BYTES} bytes`, null, 413)
+  if (Number(request.headers.get('Content-Length')) > MAX_BULK_BYTES) throw tooLarge()
+  if (!request.body) return
+  let bytes = 0
+  for await (const chunk of request.body) {
+    bytes += chunk.byteLength
+    if (bytes > MAX_BULK_BYTES) throw tooLarge()
+    yield chunk
+  }
+}
+
+function validateBulkItem(item, index) {
+  if (item === null || typeof item !== 'object' || Array.isArray(item)) {
+    throw new BulkValidationError('Each item must be a JSON object', index)
+  }
+  if (index >= MAX_BULK_ITEMS) {
+    throw new BulkValidationError(`At most ${MAX_BULK_ITEMS} items per request`, index)
+  }
+  return item
+}
+
+// Bulk bodies are a JSON array or, with Content-Type application/x-ndjson, one
+// object per line. NDJSON is validated line by line as the body streams in.
+async function readBulkItems(request) {
+  const contentType = request.headers.get('Content-Type') || ''
+  if (!contentType.includes('application/x-ndjson')) {
+    const chunks = []
+    for await (const chunk of bulkChunks(request)) chunks.push(chunk)
+    let items
+    try {
+      items = JSON.parse(Buffer.concat(chunks).toString('utf8'))
+    } catch (error) {
+      throw new BulkValidationError('Body must be a JSON array', null)
+    }
+    if (!Array.isArray(items)) throw new BulkValidationError('Body must be a JSON array', null)
+    items.forEach(validateBulkItem)
+    return items
+  }
+
+  const items = []
+  const parseLine = line => {
+    if (!line.trim()) return
+    let item
+    try {
+      item = JSON.parse(line)
+    } catch (error) {
+      throw new BulkValidationError('Invalid JSON line', items.length)
+    }
+    items.push(validateBulkItem(item, items.length))
+  }
+
+  const decoder = new TextDecoder()
+  let buffered = ''
+  for await (const chunk of bulkChunks(request)) {
+    buffered += decoder.decode(chunk, { stream: true })
+    const lines = buffered.split('\n')
+    buffered = lines.pop()
+    lines.forEach(parseLine)
+  }
+  parseLine(buffered + decoder.decode())
+  return items
+}
+
+// Validate a whole batch before writing anything, then insert it in one go
+async function bulkInsert(request, collection) {
+  let items
+  try {
+    items = await readBulkItems(request)
+  } catch (error) {
+    if (!(error instanceof BulkValidationError)) throw error
+    return NextResponse.json({ error: error.message, index: error.index }, { status: error.status })
+  }
+
+  const createdAt = new Date()
+  const records = items.map(data => ({ id: uuidv4(), ...data, createdAt }))
+  const ids = new Set()
+  for (let i = 0; i < records.length; i++) {
+    const { id } = records[i]
+    if (ids.has(id) || collection.get(id)) {
+      return NextResponse.json({ error: `Duplicate id ${id}`, index: i }, { status: 400 })
+    }
+    ids.add(id)
+  }
+
+  await store.insert(collection, records)
+  return NextResponse.json({ count: records.length, ids: [...ids] }, { status: 201 })
+}
+
 // Auth middleware
 function verifyToken(request) {
   const authHeader = request.headers.get('Authorization')
@@ -39,14 +474,66 @@ function verifyToken(request) {
   }
 }
 
+// Role of the caller's token for traffic capture: admin, user, invalid, or null without a token
+function callerRole(request) {
+  if (!request.headers.get('Authorization')) return null
+  return authenticate(request)?.user?.role || 'invalid'
+}
+
+// Proxies in front of the app whose X-Forwarded-For entries are trusted
+// (TRUST_PROXY=1 for a single load balancer; unset: none, the header is
+// client-controlled and ignored)
+const TRUST_PROXY = Number(process.env.TRUST_PROXY || 0)
+
+// Rate-limit key: the user of a verified token, else the client address. A
+// trusted proxy appends the address it saw, so that is read TRUST_PROXY
+// entries from the right; entries further left are set by the client. Without
+// a trusted proxy or a platform-provided request.ip, anonymous clients share
+// one bucket rather than choosing their own.
+function clientKey(request) {
+  const userId = authenticate(request)?.decoded.userId
+  if (userId) return `user:${userId}`
+  if (TRUST_PROXY > 0) {
+    const forwarded = (request.headers.get('X-Forwarded-For') || '').split(',').map(entry => entry.trim()).filter(Boolean)
+    const address = forwarded[forwarded.length - TRUST_PROXY] || request.headers.get('X-Real-IP')
+    if (address) return `ip:${address}`
+  }
+  return request.ip ? `ip:${request.ip}` : 'anonymous'
+}
+
+// Verified token claims plus the user they belong to (user is undefined for
+// unknown ids). Tokens of existing users are cached until they expire.
+function authenticate(request) {
+  const token = request.headers.get('Authorization')?.split(' ')[1]
+  if (!token) return null
+
+  const cached = tokenCache.get(token)
+  if (cached) return cached
+
+  const decoded = verifyToken(request)
+  if (!decoded) return null
+  const user = inMemoryDB.users.get(decoded.userId)
+  if (user) tokenCache.set(token, decoded, user)
+  return { decoded, user }
+}
+
 // Initialize sample data
 async function initializeSampleData() {
+  if (SEED_SNAPSHOT) {
+    const snapshot = readSeedSnapshot(SEED_SNAPSHOT)
+    if (snapshot) {
+      applySeedSnapshot(inMemoryDB, snapshot)
+      console.log(`Seed data loaded from snapshot ${SEED_SNAPSHOT}`)
+      return
+    }
+  }
+
   // Create admin user if it doesn't exist
   const adminEmail = 'admin@astrolaunch.com'
-  const existingAdmin = inMemoryDB.users.find(user => user.email === adminEmail)
+  const existingAdmin = inMemoryDB.users.findByEmail(adminEmail)
   
   if (!existingAdmin) {
-    const hashedPassword = await bcrypt.hash('admin123', 10)
+    const hashedPassword = await passwordHasher.hash('admin123')
     const adminUser = {
       id: uuidv4(),
       email: adminEmail,
@@ -55,12 +542,12 @@ async function initializeSampleData() {
       role: 'admin',
       createdAt: new Date()
     }
-    inMemoryDB.users.push(adminUser)
+    inMemoryDB.users.insert(adminUser)
     console.log('Admin user created: admin@astrolaunch.com / admin123')
   }
   
   // Initialize sample data only if empty
-  if (inMemoryDB.rockets.length === 0) {
+  if (inMemoryDB.rockets.size === 0) {
     // Sample rockets
     const rockets = [
       {
@@ -203,239 +690,326 @@ async function initializeSampleData() {
     ]
 
     // Add sample data to in-memory storage
-    inMemoryDB.rockets = rockets
-    inMemoryDB.missions = missions
-    inMemoryDB.teams = teams
-    inMemoryDB.schedules = schedules
+    rockets.forEach(rocket => inMemoryDB.rockets.insert(rocket))
+    missions.forEach(mission => inMemoryDB.missions.insert(mission))
+    teams.forEach(teamMember => inMemoryDB.teams.insert(teamMember))
+    schedules.forEach(schedule => inMemoryDB.schedules.insert(schedule))
+  }
+
+  if (SEED_SNAPSHOT) {
+    writeSeedSnapshot(SEED_SNAPSHOT, inMemoryDB)
+    console.log(`Seed snapshot written to ${SEED_SNAPSHOT}`)
   }
 }
 
+// Bootstrap runs once per process: it starts when the module loads, the first
+// requests await it, and once finished the request path skips it entirely
+let bootstrapPromise = null
+let bootstrapped = false
+
+// Recover persisted data when DATA_DIR is set; seed only a brand-new store
+async function loadData() {
+  const recovered = await store.load(initializeSampleData)
+  if (recovered) {
+    console.log(`Recovered data from ${DATA_DIR} (snapshot: ${recovered.snapshot}, log entries replayed: ${recovered.replayed})`)
+  }
+}
+
+function bootstrap() {
+  if (!bootstrapPromise) {
+    bootstrapPromise = loadData()
+      .then(() => { bootstrapped = true })
+      .catch(error => {
+        bootstrapPromise = null
+        throw error
+      })
+  }
+  return bootstrapPromise
+}
+
+bootstrap().catch(error => console.error('Bootstrap failed:', error))
+
 // OPTIONS handler for CORS
 export async function OPTIONS() {
   return handleCORS(new NextResponse(null, { status: 200 }))
 }
 
-// Route handler function
-async function handleRoute(request, { params }) {
-  const { path = [] } = params
-  const route = `/${path.join('/')}`
-  const method = request.method
-
-  try {
-    // Initialize sample data on first request
-    await initializeSampleData()
+// MIDDLEWARE: (request, context, next) => response
 
-    // Root endpoint
-    if (route === '/' && method === 'GET') {
-      return handleCORS(NextResponse.json({ message: "AstroLaunch API" }))
-    }
-
-    // AUTH ROUTES
-    if (route === '/auth/register' && method === 'POST') {
-      const { email, password, name } = await request.json()
-      
-      if (!email || !password || !name) {
-        return handleCORS(NextResponse.json(
-          { error: "Email, password, and name are required" }, 
-          { status: 400 }
-        ))
-      }
+async function cors(request, context, next) {
+  return handleCORS(await next())
+}
 
-      const existingUser = inMemoryDB.users.find(user => user.email === email)
-      if (existingUser) {
-        return handleCORS(NextResponse.json(
-          { error: "User already exists" }, 
-          { status: 400 }
-        ))
-      }
+// Puts the verified token and user on context.auth
+function requireAuth(request, context, next) {
+  const auth = authenticate(request)
+  if (!auth) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+  }
+  context.auth = auth
+  return next()
+}
 
-      const hashedPassword = await bcrypt.hash(password, 10)
-      const user = {
-        id: uuidv4(),
-        email,
-        name,
-        password: hashedPassword,
-        role: 'user',
-        createdAt: new Date()
-      }
+function requireAdmin(request, context, next) {
+  const { user } = context.auth
+  if (!user || user.role !== 'admin') {
+    return NextResponse.json({ error: "Admin privileges required" }, { status: 403 })
+  }
+  return next()
+}
 
-      inMemoryDB.users.push(user)
-      const token = jwt.sign({ 
-        userId: user.id, 
-        email: user.email, 
-        role: user.role 
-      }, JWT_SECRET, { expiresIn: '24h' })
-      
-      const { password: _, ...userWithoutPassword } = user
-      return handleCORS(NextResponse.json({ user: userWithoutPassword, token }))
+// Holds a slot in the priority class returned by `classify` (a class name or
+// a function of the request) while the rest of the chain runs. Limits bite on
+// handlers that await (bcrypt, replicated writes, bulk bodies); synchronous
+// ones like full-collection serialization are held back by the lag shedding.
+function admit(classify) {
+  const classOf = typeof classify === 'function' ? classify : () => classify
+  return async (request, context, next) => {
+    if (!admission) return next()
+    const ticket = await admission.admit(classOf(request), clientKey(request))
+    if (!ticket.release) {
+      return NextResponse.json(
+        { error: ticket.status === 429 ? "Too many requests, please retry" : "Server busy, please retry" },
+        { status: ticket.status, headers: { 'Retry-After': String(ticket.retryAfter) } }
+      )
     }
+    try {
+      return await next()
+    } finally {
+      ticket.release()
+    }
+  }
+}
 
-    if (route === '/auth/login' && method === 'POST') {
-      const { email, password } = await request.json()
-      
-      if (!email || !password) {
-        return handleCORS(NextResponse.json(
-          { error: "Email and password are required" }, 
-          { status: 400 }
-        ))
-      }
-
-      const user = inMemoryDB.users.find(user => user.email === email)
-      if (!user || !await bcrypt.compare(password, user.password)) {
-        return handleCORS(NextResponse.json(
-          { error: "Invalid credentials" }, 
-          { status: 401 }
-        ))
-      }
+// Unpaged JSON lists serialize the whole collection; pages, streams and
+// revalidations answered 304 are cheap. Only a tag matching the current
+// version counts, so an arbitrary If-None-Match doesn't dodge the heavy gate.
+function listClass(request, collection) {
+  const { searchParams } = new URL(request.url)
+  const cheap = searchParams.has('limit') || etagMatches(request, listEtag(request, collection)) ||
+    (request.headers.get('Accept') || '').includes('application/x-ndjson')
+  return cheap ? 'read' : 'heavy'
+}
 
-      const token = jwt.sign({ 
-        userId: user.id, 
-        email: user.email, 
-        role: user.role 
-      }, JWT_SECRET, { expiresIn: '24h' })
-      
-      const { password: _, ...userWithoutPassword } = user
-      return handleCORS(NextResponse.json({ user: userWithoutPassword, token }))
-    }
+const PUBLIC = [cors, admit('read')]
+const HEAVY = [cors, admit('heavy')]
+const AUTH = [cors, admit('auth')]
+// Callers are authorized before admission, so rejected writes take no slots
+// and their quick 401/403s don't skew a gate's wait estimate
+const ADMIN = [cors, requireAuth, requireAdmin, admit('write')]
+const BULK = [cors, requireAuth, requireAdmin, admit('bulk')]
 
-    if (route === '/auth/verify' && method === 'GET') {
-      const decoded = verifyToken(request)
-      if (!decoded) {
-        return handleCORS(NextResponse.json({ valid: false }, { status: 401 }))
-      }
+// HANDLERS: (request, context) => response, context.params holds :params
 
-      const user = inMemoryDB.users.find(user => user.id === decoded.userId)
-      if (!user) {
-        return handleCORS(NextResponse.json({ valid: false }, { status: 401 }))
-      }
+function root() {
+  return NextResponse.json({ message: "AstroLaunch API" })
+}
 
-      const { password: _, ...userWithoutPassword } = user
-      return handleCORS(NextResponse.json({ valid: true, user: userWithoutPassword }))
-    }
+async function register(request) {
+  const { email, password, name } = await request.json()
+  
+  if (!email || !password || !name) {
+    return NextResponse.json(
+      { error: "Email, password, and name are required" }, 
+      { status: 400 }
+    )
+  }
 
-    // ROCKETS ROUTES
-    if (route === '/rockets' && method === 'GET') {
-      const rockets = inMemoryDB.rockets.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt))
-      return handleCORS(NextResponse.json(rockets))
-    }
+  const existingUser = inMemoryDB.users.findByEmail(email)
+  if (existingUser) {
+    return NextResponse.json(
+      { error: "User already exists" }, 
+      { status: 400 }
+    )
+  }
 
-    if (route === '/rockets' && method === 'POST') {
-      const decoded = verifyToken(request)
-      if (!decoded) {
-        return handleCORS(NextResponse.json({ error: "Unauthorized" }, { status: 401 }))
-      }
+  const hashedPassword = await passwordHasher.hash(password)
+  const user = {
+    id: uuidv4(),
+    email,
+    name,
+    password: hashedPassword,
+    role: 'user',
+    createdAt: new Date()
+  }
 
-      // Check if user has admin role
-      const user = inMemoryDB.users.find(user => user.id === decoded.userId)
-      if (!user || user.role !== 'admin') {
-        return handleCORS(NextResponse.json({ error: "Admin privileges required" }, { status: 403 }))
-      }
+  try {
+    await store.insert(inMemoryDB.users, [user])
+  } catch (error) {
+    // A concurrent registration (on any worker) took the email while this one was hashing
+    if (!(error instanceof StoreConflictError)) throw error
+    return NextResponse.json(
+      { error: "User already exists" }, 
+      { status: 400 }
+    )
+  }
+  const token = jwt.sign({ 
+    userId: user.id, 
+    email: user.email, 
+    role: user.role 
+  }, JWT_SECRET, { expiresIn: '24h' })
+  
+  const { password: _, ...userWithoutPassword } = user
+  return NextResponse.json({ user: userWithoutPassword, token })
+}
 
-      const rocketData = await request.json()
-      const rocket = {
-        id: uuidv4(),
-        ...rocketData,
-        createdAt: new Date()
-      }
+async function login(request) {
+  const { email, password } = await request.json()
+  
+  if (!email || !password) {
+    return NextResponse.json(
+      { error: "Email and password are required" }, 
+      { status: 400 }
+    )
+  }
 
-      inMemoryDB.rockets.push(rocket)
-      return handleCORS(NextResponse.json(rocket, { status: 201 }))
-    }
+  const user = inMemoryDB.users.findByEmail(email)
+  if (!user || !await passwordHasher.compare(password, user.password)) {
+    return NextResponse.json(
+      { error: "Invalid credentials" }, 
+      { status: 401 }
+    )
+  }
 
-    // MISSIONS ROUTES
-    if (route === '/missions' && method === 'GET') {
-      const missions = inMemoryDB.missions.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt))
-      return handleCORS(NextResponse.json(missions))
-    }
+  const token = jwt.sign({ 
+    userId: user.id, 
+    email: user.email, 
+    role: user.role 
+  }, JWT_SECRET, { expiresIn: '24h' })
+  
+  const { password: _, ...userWithoutPassword } = user
+  return NextResponse.json({ user: userWithoutPassword, token })
+}
 
-    if (route === '/missions' && method === 'POST') {
-      const decoded = verifyToken(request)
-      if (!decoded) {
-        return handleCORS(NextResponse.json({ error: "Unauthorized" }, { status: 401 }))
-      }
+function verify(request) {
+  const auth = authenticate(request)
+  if (!auth || !auth.user) {
+    return NextResponse.json({ valid: false }, { status: 401 })
+  }
 
-      // Check if user has admin role
-      const user = inMemoryDB.users.find(user => user.id === decoded.userId)
-      if (!user || user.role !== 'admin') {
-        return handleCORS(NextResponse.json({ error: "Admin privileges required" }, { status: 403 }))
-      }
+  const { password: _, ...userWithoutPassword } = auth.user
+  return NextResponse.json({ valid: true, user: userWithoutPassword })
+}
 
-      const missionData = await request.json()
-      const mission = {
-        id: uuidv4(),
-        ...missionData,
-        createdAt: new Date()
-      }
+// Server-Sent Events: insert events for ?collections= (default: all), resumed
+// after the Last-Event-ID header (or ?lastEventId=) when the ring still has them
+function events(request) {
+  const { searchParams } = new URL(request.url)
+  const only = searchParams.get('collections')
+  const collections = only ? only.split(',').map(name => name.trim()) : null
+  const unknown = (collections || []).filter(name => !COLLECTIONS.includes(name))
+  if (unknown.length > 0) {
+    return NextResponse.json({ error: `Unknown collections: ${unknown.join(', ')}` }, { status: 400 })
+  }
 
-      inMemoryDB.missions.push(mission)
-      return handleCORS(NextResponse.json(mission, { status: 201 }))
+  const lastEventId = request.headers.get('Last-Event-ID') || searchParams.get('lastEventId')
+  return new NextResponse(eventFeed.stream({ lastEventId, collections }), {
+    status: 200,
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      'X-Accel-Buffering': 'no'
     }
+  })
+}
 
-    // TEAMS ROUTES
-    if (route === '/teams' && method === 'GET') {
-      const teams = inMemoryDB.teams.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt))
-      return handleCORS(NextResponse.json(teams))
-    }
+// Prometheus text exposition by default; JSON with ?format=json or Accept: application/json
+function scrapeMetrics(request) {
+  const { searchParams } = new URL(request.url)
+  const accept = request.headers.get('Accept') || ''
+  if (searchParams.get('format') === 'json' || accept.includes('application/json')) {
+    return NextResponse.json(metrics, { headers: { 'Cache-Control': 'no-store' } })
+  }
+  return new NextResponse(metrics.toPrometheus(), {
+    status: 200,
+    headers: { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8', 'Cache-Control': 'no-store' }
+  })
+}
 
-    if (route === '/teams' && method === 'POST') {
-      const decoded = verifyToken(request)
-      if (!decoded) {
-        return handleCORS(NextResponse.json({ error: "Unauthorized" }, { status: 401 }))
-      }
+function getRecord(collection) {
+  return (request, { params }) => {
+    const record = collection.get(params.id)
+    if (!record) {
+      return NextResponse.json({ error: `No record ${params.id} in ${collection.name}` }, { status: 404 })
+    }
+    return NextResponse.json(record)
+  }
+}
 
-      // Check if user has admin role
-      const user = inMemoryDB.users.find(user => user.id === decoded.userId)
-      if (!user || user.role !== 'admin') {
-        return handleCORS(NextResponse.json({ error: "Admin privileges required" }, { status: 403 }))
-      }
+function createRecord(collection) {
+  return async request => {
+    const data = await request.json()
+    const record = {
+      id: uuidv4(),
+      ...data,
+      createdAt: new Date()
+    }
 
-      const teamData = await request.json()
-      const teamMember = {
-        id: uuidv4(),
-        ...teamData,
-        createdAt: new Date()
-      }
+    await store.insert(collection, [record])
+    return NextResponse.json(record, { status: 201 })
+  }
+}
 
-      inMemoryDB.teams.push(teamMember)
-      return handleCORS(NextResponse.json(teamMember, { status: 201 }))
-    }
+// ROUTE TABLE
+const router = new Router()
+  .add('GET', '/', root, PUBLIC)
+  .add('POST', '/auth/register', register, AUTH)
+  .add('POST', '/auth/login', login, AUTH)
+  .add('GET', '/auth/verify', verify, PUBLIC)
+  .add('GET', '/dashboard', dashboard, HEAVY)
+  .add('GET', '/events', events, PUBLIC)
+  // Unadmitted, so metrics can be scraped while the API is shedding load
+  .add('GET', '/metrics', scrapeMetrics, [cors])
 
-    // SCHEDULES ROUTES
-    if (route === '/schedules' && method === 'GET') {
-      const schedules = inMemoryDB.schedules.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt))
-      return handleCORS(NextResponse.json(schedules))
-    }
+// Rockets, missions, teams and schedules share one set of routes
+for (const name of COLLECTIONS) {
+  const collection = inMemoryDB[name]
+  router
+    .add('GET', `/${name}`, request => listCollection(request, collection), [cors, admit(request => listClass(request, collection))])
+    .add('POST', `/${name}`, createRecord(collection), ADMIN)
+    .add('POST', `/${name}/bulk`, request => bulkInsert(request, collection), BULK)
+    .add('GET', `/${name}/:id`, getRecord(collection), PUBLIC)
+}
 
-    if (route === '/schedules' && method === 'POST') {
-      const decoded = verifyToken(request)
-      if (!decoded) {
-        return handleCORS(NextResponse.json({ error: "Unauthorized" }, { status: 401 }))
-      }
+// Missions and schedules are also searchable (static segments win over /:id)
+for (const name of SEARCHABLE_COLLECTIONS) {
+  const collection = inMemoryDB[name]
+  router.add('GET', `/${name}/search`, request => searchCollection(request, collection), PUBLIC)
+}
 
-      // Check if user has admin role
-      const user = inMemoryDB.users.find(user => user.id === decoded.userId)
-      if (!user || user.role !== 'admin') {
-        return handleCORS(NextResponse.json({ error: "Admin privileges required" }, { status: 403 }))
-      }
+// Route handler function
+async function dispatch(request, route, match) {
+  try {
+    // Wait for the one-time bootstrap if it is still running
+    if (!bootstrapped) await bootstrap()
 
-      const scheduleData = await request.json()
-      const schedule = {
-        id: uuidv4(),
-        ...scheduleData,
-        createdAt: new Date()
-      }
+    if (!match) {
+      return handleCORS(NextResponse.json(
+        { error: `Route ${route} not found` }, 
+        { status: 404 }
+      ))
+    }
+    if (!match.route) {
+      return handleCORS(NextResponse.json(
+        { error: `Method ${request.method} not allowed on ${route}` },
+        { status: 405, headers: { 'Allow': match.allowed.join(', ') } }
+      ))
+    }
 
-      inMemoryDB.schedules.push(schedule)
-      return handleCORS(NextResponse.json(schedule, { status: 201 }))
+    return await match.route.run(request, { params: match.params })
+  } catch (error) {
+    if (error instanceof StoreConflictError) {
+      return handleCORS(NextResponse.json({ error: error.message }, { status: 409 }))
     }
 
-    // Route not found
-    return handleCORS(NextResponse.json(
-      { error: `Route ${route} not found` }, 
-      { status: 404 }
-    ))
+    if (error instanceof PasswordQueueFullError) {
+      return handleCORS(NextResponse.json(
+        { error: "Server busy, please retry" },
+        { status: 503, headers: { 'Retry-After': '1' } }
+      ))
+    }
 
-  } catch (error) {
+    metrics.observeError(error)
     console.error('API Error:', error)
     return handleCORS(NextResponse.json(
       { error: "Internal server error" }, 
@@ -444,6 +1018,29 @@ async function handleRoute(request, { params }) {
   }
 }
 
+// Every request is timed here and recorded under its route pattern (and
+// captured, with CAPTURE_FILE set)
+async function handleRoute(request, { params }) {
+  const { path = [] } = params
+  const route = `/${path.join('/')}`
+  const captured = capture ? await capture.begin(request, route + new URL(request.url).search) : null
+  const started = performance.now()
+  const match = router.match(request.method, route)
+
+  const response = await dispatch(request, route, match)
+  const seconds = (performance.now() - started) / 1000
+  metrics.observeRequest(request.method, match?.route, response.status, seconds)
+  if (captured) {
+    capture.finish(captured, {
+      route: match?.route ? match.route.pattern : UNMATCHED_ROUTE,
+      role: callerRole(request),
+      status: response.status,
+      ms: seconds * 1000
+    })
+  }
+  return response
+}
+
 // Export all HTTP methods
 export const GET = handleRoute
 export const POST = handleRoute
@@ -118,24 +118,18 @@ export default function App() {
   const fetchData = async () => {
     try {
       setIsLoading(true)
-      const [rocketsRes, missionsRes, teamsRes, schedulesRes] = await Promise.all([
-        fetch('/api/rockets'),
-        fetch('/api/missions'),
-        fetch('/api/teams'),
-        fetch('/api/schedules')
-      ])
-      
-      // Check if requests were successful
-      if (!rocketsRes.ok || !missionsRes.ok || !teamsRes.ok || !schedulesRes.ok) {
-        throw new Error('Failed to fetch data from one or more endpoints')
+      // One request for the whole page instead of one per collection
+      const response = await fetch('/api/dashboard')
+      if (!response.ok) {
+        throw new Error('Failed to fetch dashboard data')
       }
       
-      const [rocketsData, missionsData, teamsData, schedulesData] = await Promise.all([
-        rocketsRes.json(),
-        missionsRes.json(),
-        teamsRes.json(),
-        schedulesRes.json()
-      ])
+      const {
+        rockets: rocketsData,
+        missions: missionsData,
+        teams: teamsData,
+        schedules: schedulesData
+      } = await response.json()
       
       // Ensure data is arrays, fallback to empty arrays if not
       setRockets(Array.isArray(rocketsData) ? rocketsData : [])
@@ -338,6 +332,40 @@ export default function App() {
     return () => clearInterval(timer)
   }, [nextLaunch])
 
+  // Live updates: merge records inserted elsewhere as they happen, and refetch
+  // everything when the feed can't replay what was missed
+  useEffect(() => {
+    const source = new EventSource('/api/events')
+    const setters = { rockets: setRockets, missions: setMissions, teams: setTeams, schedules: setSchedules }
+    
+    source.addEventListener('insert', (event) => {
+      const { collection, records } = JSON.parse(event.data)
+      // Bulk imports only announce their ids
+      if (!records) {
+        fetchData()
+        return
+      }
+      
+      setters[collection]?.(prev => {
+        const known = new Set(prev.map(item => item.id))
+        const added = records.filter(record => !known.has(record.id)).reverse()
+        return added.length > 0 ? [...added, ...prev] : prev
+      })
+      
+      if (collection === 'schedules') {
+        const now = new Date()
+        setNextLaunch(prev => {
+          const upcomingLaunches = [prev, ...records].filter(schedule => schedule && new Date(schedule.launchDate) > now)
+          if (upcomingLaunches.length === 0) return prev
+          return upcomingLaunches.sort((a, b) => new Date(a.launchDate) - new Date(b.launchDate))[0]
+        })
+      }
+    })
+    source.addEventListener('reset', () => fetchData())
+    
+    return () => source.close()
+  }, [])
+
   // Check for existing token
   useEffect(() => {
     const token = localStorage.getItem('token')
@@ -5,21 +5,479 @@ Tests all API endpoints including authentication, CRUD operations, and data inte
 """
 
 import requests
+import argparse
+import asyncio
+import csv
+import glob
 import json
+import math
+import os
+import random
+import re
+import shlex
+import socket
+import subprocess
+import threading
 import time
 import sys
-from datetime import datetime, timedelta
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for --load mode
+    aiohttp = None
 
 # Configuration
-BASE_URL = "https://bf10fccb-49db-454b-973f-28aec153f6cb.preview.emergentagent.com/api"
+BASE_URL = os.environ.get(
+    "ASTROLAUNCH_BASE_URL",
+    "https://bf10fccb-49db-454b-973f-28aec153f6cb.preview.emergentagent.com/api"
+)
 HEADERS = {"Content-Type": "application/json"}
+# Servers started by the benchmarks run from the repository root, wherever the harness is run from
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+ADMIN_EMAIL = "admin@astrolaunch.com"
+ADMIN_PASSWORD = "admin123"
+
+# Collections the home page loads, in /dashboard payload order
+DASHBOARD_COLLECTIONS = ("rockets", "missions", "teams", "schedules")
+
+# Collections with /<name>/:id record routes, and the static segments that take precedence over :id
+COLLECTIONS = ("rockets", "missions", "teams", "schedules")
+COLLECTION_ACTIONS = ("bulk", "search")
+
+# Launch sites and mission name words of the generated schedules searched by bench_search
+SEARCH_SITES = ("Kennedy Space Center", "Vandenberg", "Starbase", "Cape Canaveral", "Baikonur", "Mahia")
+SEARCH_WORDS = ("lunar", "orbital", "cargo", "crew", "relay", "survey", "deep", "polar", "resupply", "demo")
+
+# Payloads shared by the functional tests and the load scenarios
+SAMPLE_PAYLOADS = {
+    "/rockets": {
+        "name": "Titan X",
+        "type": "Medium-lift launch vehicle",
+        "specifications": {
+            "height": "85 m",
+            "diameter": "10 m",
+            "mass": "800,000 kg",
+            "payloadToLEO": "45,000 kg"
+        },
+        "status": "development"
+    },
+    "/missions": {
+        "name": "Europa Explorer",
+        "description": "Scientific mission to explore Jupiter's moon Europa",
+        "status": "planned",
+        "launchDate": "2025-06-15T10:30:00Z",
+        "payload": "Europa Lander",
+        "orbit": "Jupiter system",
+        "customer": "ESA"
+    },
+    "/teams": {
+        "name": "Dr. Alex Chen",
+        "position": "Propulsion Engineer",
+        "department": "Engineering",
+        "bio": "Specialist in advanced rocket propulsion systems and fuel efficiency optimization.",
+        "experience": "7 years"
+    },
+    "/schedules": {
+        "missionName": "Asteroid Mining Test",
+        "description": "Test mission for asteroid mining technology",
+        "launchDate": "2025-04-20T08:00:00Z",
+        "launchTime": "08:00 UTC",
+        "rocket": "Falcon Heavy",
+        "launchSite": "Kennedy Space Center",
+        "customer": "Mining Corp",
+        "payload": "Mining Probe",
+        "status": "scheduled"
+    }
+}
+
+def parse_date(value):
+    """Timezone-aware datetime for an ISO date as serialized by the API (naive dates are UTC)"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds (~1% relative precision)"""
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _bucket(self, value):
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        return shift, value >> shift
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def buckets(self):
+        """(lowest, highest equivalent value in us, count) for each populated bucket, in order"""
+        result = []
+        for shift, sub in sorted(self.counts, key=lambda bucket: bucket[1] << bucket[0]):
+            low = sub << shift
+            result.append((low, low + (1 << shift) - 1, self.counts[(shift, sub)]))
+        return result
+
+    def percentile(self, pct):
+        """Latency in seconds at or below which pct percent of the recorded values fall"""
+        if not self.count:
+            return 0.0
+        # Nearest rank; the epsilon keeps float error in pct from skipping to the next rank
+        target = max(1, math.ceil(pct / 100.0 * self.count - 1e-9))
+        seen = 0
+        for _, high, count in self.buckets():
+            seen += count
+            if seen >= target:
+                return min(high, self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def mean(self):
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+
+def route_pattern(path):
+    """Route pattern of an API path, as lib/metrics.js labels it: /rockets/<id>?x=1 -> /rockets/:id"""
+    segments = [segment for segment in path.split("?")[0].split("/") if segment]
+    if len(segments) == 2 and segments[0] in COLLECTIONS and segments[1] not in COLLECTION_ACTIONS:
+        segments[1] = ":id"
+    return "/" + "/".join(segments)
+
+
+class TimingRecorder:
+    """Aggregates per-request timings into histograms keyed by (method, route)"""
+
+    PERCENTILES = (50, 90, 95, 99)
 
-class BackendTester:
     def __init__(self):
-        self.base_url = BASE_URL
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, timing):
+        with self.lock:
+            self._record(timing)
+
+    def _record(self, timing):
+        route = route_pattern(timing["endpoint"])
+        entry = self.routes.get((timing["method"], route))
+        if entry is None:
+            entry = self.routes[(timing["method"], route)] = {
+                "total": LatencyHistogram(),
+                "ttfb": LatencyHistogram(),
+                "connect_seconds": 0.0,
+                "server_seconds": 0.0,
+                "new_connections": 0,
+                "bytes": 0
+            }
+        entry["total"].record(timing["total"])
+        entry["ttfb"].record(timing["ttfb"])
+        entry["connect_seconds"] += timing["connect"]
+        entry["server_seconds"] += timing["server"]
+        entry["new_connections"] += timing["new_connections"]
+        entry["bytes"] += timing["bytes"]
+
+    def totals(self):
+        """Request count, new connections, connect and server seconds across all routes"""
+        entries = self.routes.values()
+        return (
+            sum(entry["total"].count for entry in entries),
+            sum(entry["new_connections"] for entry in entries),
+            sum(entry["connect_seconds"] for entry in entries),
+            sum(entry["server_seconds"] for entry in entries)
+        )
+
+    def rows(self):
+        """One summary row per (method, route), latencies in milliseconds"""
+        rows = []
+        for (method, route), entry in sorted(self.routes.items(), key=lambda item: (item[0][1], item[0][0])):
+            total = entry["total"]
+            row = {
+                "method": method,
+                "route": route,
+                "count": total.count,
+                "min_ms": round((total.min or 0) / 1000, 3),
+                "mean_ms": round(total.mean() * 1000, 3),
+                "max_ms": round(total.max / 1000, 3)
+            }
+            for pct in self.PERCENTILES:
+                row[f"p{pct}_ms"] = round(total.percentile(pct) * 1000, 3)
+            row["mean_ttfb_ms"] = round(entry["ttfb"].mean() * 1000, 3)
+            row["mean_connect_ms"] = round(entry["connect_seconds"] / total.count * 1000, 3)
+            row["new_connections"] = entry["new_connections"]
+            row["bytes"] = entry["bytes"]
+            rows.append(row)
+        return rows
+
+    def export_csv(self, path):
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["method", "route", "count"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def export_json(self, path, extra=None):
+        routes = []
+        for row in self.rows():
+            histogram = self.routes[(row["method"], row["route"])]["total"]
+            routes.append({**row, "histogram_us": [list(bucket) for bucket in histogram.buckets()]})
+        with open(path, "w") as f:
+            json.dump({**(extra or {}), "routes": routes}, f, indent=2)
+
+
+class MetricsWindow:
+    """Server-side view of a run: the difference between two GET /metrics?format=json scrapes"""
+
+    def __init__(self, before, after, worker_id=None):
+        self.before = before
+        self.after = after
+        self.worker_id = worker_id
+        previous = {(entry["method"], entry["route"]): entry for entry in before["requests"]}
+        self.routes = {}
+        for entry in after["requests"]:
+            key = (entry["method"], entry["route"])
+            earlier = previous.get(key)
+            window = self.histogram_delta(earlier["duration"] if earlier else None, entry["duration"])
+            if window["count"]:
+                self.routes[key] = window
+        self.event_loop_lag = self.histogram_delta(before["eventLoopLag"], after["eventLoopLag"])
+        self.password_queue_time = self.histogram_delta(before["passwordQueueTime"], after["passwordQueueTime"])
+        self.errors = {
+            kind: count - before["errors"].get(kind, 0)
+            for kind, count in after["errors"].items() if count > before["errors"].get(kind, 0)
+        }
+
+    @staticmethod
+    def histogram_delta(before, after):
+        """{count, sum, buckets: [(upper bound, count in bucket)]} observed between two scrapes of a histogram"""
+        earlier = [count for _, count in before["buckets"]] if before else [0] * len(after["buckets"])
+        buckets = []
+        previous = 0
+        for (bound, cumulative), old in zip(after["buckets"], earlier):
+            count = cumulative - old
+            buckets.append((float("inf") if bound == "+Inf" else bound, count - previous))
+            previous = count
+        return {
+            "count": after["count"] - (before["count"] if before else 0),
+            "sum": after["sum"] - (before["sum"] if before else 0.0),
+            "buckets": buckets
+        }
+
+    @staticmethod
+    def quantile(window, q):
+        """Seconds at quantile q, interpolated within the bucket like Prometheus' histogram_quantile()"""
+        if not window["count"]:
+            return 0.0
+        rank = q * window["count"]
+        seen = 0
+        lower = 0.0
+        for bound, count in window["buckets"]:
+            if count and seen + count >= rank:
+                return lower if bound == float("inf") else lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+    def pattern_for(self, method, path):
+        """Server route pattern that served `method path` in this window, preferring static segments"""
+        segments = [segment for segment in path.split("/") if segment]
+        best, best_static = None, -1
+        for route_method, pattern in self.routes:
+            parts = [part for part in pattern.split("/") if part]
+            if route_method != method or len(parts) != len(segments):
+                continue
+            if all(part.startswith(":") or part == segment for part, segment in zip(parts, segments)):
+                static = sum(1 for part in parts if not part.startswith(":"))
+                if static > best_static:
+                    best, best_static = pattern, static
+        return best or "(unmatched)"
+
+    def rows(self, timings):
+        """Client vs. server timing per route pattern, in milliseconds"""
+        client = {}
+        for (method, path), entry in timings.routes.items():
+            key = (method, self.pattern_for(method, path))
+            merged = client.setdefault(key, {"count": 0, "server_seconds": 0.0, "total": LatencyHistogram()})
+            merged["count"] += entry["total"].count
+            merged["server_seconds"] += entry["server_seconds"]
+            merged["total"].merge(entry["total"])
+
+        rows = []
+        for key in sorted(set(client) | set(self.routes), key=lambda key: (key[1], key[0])):
+            ours = client.get(key)
+            theirs = self.routes.get(key)
+            client_ms = ours["server_seconds"] / ours["count"] * 1000 if ours else None
+            server_ms = theirs["sum"] / theirs["count"] * 1000 if theirs else None
+            rows.append({
+                "method": key[0],
+                "route": key[1],
+                "client_count": ours["count"] if ours else 0,
+                "server_count": theirs["count"] if theirs else 0,
+                "client_ttfb_ms": round(client_ms, 3) if ours else None,
+                "server_mean_ms": round(server_ms, 3) if theirs else None,
+                "gap_ms": round(client_ms - server_ms, 3) if ours and theirs else None,
+                "client_p95_ms": round(ours["total"].percentile(95) * 1000, 3) if ours else None,
+                "server_p95_ms": round(self.quantile(theirs, 0.95) * 1000, 3) if theirs else None
+            })
+        return rows
+
+    def summary(self):
+        lag = self.event_loop_lag
+        queue = self.password_queue_time
+        return {
+            "worker_id": self.worker_id,
+            "event_loop_lag_ms": {f"p{int(q * 100)}": round(self.quantile(lag, q) * 1000, 3) for q in (0.5, 0.9, 0.99)},
+            "password_queue_waits": queue["count"],
+            "password_queue_p95_ms": round(self.quantile(queue, 0.95) * 1000, 3),
+            "errors": self.errors,
+            "rss_bytes": [self.before["memory"]["rss"], self.after["memory"]["rss"]],
+            "heap_used_bytes": [self.before["memory"]["heapUsed"], self.after["memory"]["heapUsed"]]
+        }
+
+
+# Time spent opening connections (DNS + TCP + TLS) during the current request, per thread
+_connect_timer = threading.local()
+
+
+class _ConnectTimingMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = getattr(_connect_timer, "elapsed", 0.0) + time.perf_counter() - start
+            _connect_timer.count = getattr(_connect_timer, "count", 0) + 1
+
+
+class TimedHTTPConnection(_ConnectTimingMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_ConnectTimingMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report how long each new connection took to open"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool
+        }
+
+
+class RequestThrottle:
+    """Thread-safe pacing of request starts to at most `rps` per second"""
+
+    def __init__(self, rps):
+        self.interval = 1.0 / rps
+        self.next_slot = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.perf_counter()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def create_session(pool_size=10, retries=3, backoff=0.5, keep_alive=True):
+    """Build a long-lived pooled session shared by every request of a test run"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "PUT", "DELETE", "OPTIONS"]),
+        raise_on_status=False
+    )
+    adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+class BackendTester:
+    # Tests that must finish before the keyed test starts. Everything else only
+    # needs the token produced by registration, or nothing at all.
+    TEST_DEPENDENCIES = {
+        "test_token_verification": ("test_user_registration",),
+        "test_rockets_crud": ("test_user_registration",),
+        "test_missions_crud": ("test_user_registration",),
+        "test_teams_crud": ("test_user_registration",),
+        "test_schedules_crud": ("test_user_registration",),
+        # Checks that the rocket created by the CRUD test invalidated the cached list
+        "test_response_caching": ("test_rockets_crud",),
+        # Runs after the schedules pagination walk so that walk stays short
+        "test_bulk_import": ("test_schedules_crud",),
+        # Compares against the list routes, so every collection write must be done
+        "test_dashboard": ("test_missions_crud", "test_teams_crud", "test_response_caching", "test_bulk_import"),
+        # Searches the schedules the bulk import generated
+        "test_search": ("test_missions_crud", "test_bulk_import"),
+        # Its rocket write would race the dashboard's comparison with the lists
+        "test_events": ("test_dashboard",)
+    }
+
+    def __init__(self, base_url=BASE_URL, pool_size=10, retries=3, backoff=0.5, keep_alive=True, rate_limit=None,
+                 bulk_items=50_000, page_loads=10):
+        self.base_url = base_url
+        self.bulk_items = bulk_items
+        self.page_loads = page_loads
         self.headers = HEADERS.copy()
         self.auth_token = None
+        self.admin_token = None
+        self.admin_lock = threading.Lock()
+        self.rockets_etag = None
+        self.created_rocket_id = None
         self.test_results = []
+        self.timings = TimingRecorder()
+        self.server_metrics = None
+        self.throttle = RequestThrottle(rate_limit) if rate_limit else None
+        self.session = create_session(pool_size, retries, backoff, keep_alive)
+        self._thread_state = threading.local()
         
     def log_result(self, test_name, success, message, details=None):
         """Log test results"""
@@ -28,38 +486,87 @@ class BackendTester:
             "success": success,
             "message": message,
             "details": details,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "last_request": getattr(self._thread_state, "last_timing", None)
         }
         self.test_results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
+        line = f"{status}: {test_name} - {message}\n"
         if details and not success:
-            print(f"   Details: {details}")
+            line += f"   Details: {details}\n"
+        print(line, end="")  # One write per result so parallel tests don't interleave lines
     
-    def make_request(self, method, endpoint, data=None, auth_required=False):
-        """Make HTTP request with proper error handling"""
+    def make_request(self, method, endpoint, data=None, auth_required=False, token=None, extra_headers=None, raw_body=None):
+        """Make HTTP request with proper error handling; raw_body (bytes) is sent as-is instead of JSON"""
         url = f"{self.base_url}{endpoint}"
         headers = self.headers.copy()
+        headers.update(extra_headers or {})
+        
+        token = token or self.auth_token
+        if auth_required and token:
+            headers["Authorization"] = f"Bearer {token}"
+        
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
         
-        if auth_required and self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
+        if self.throttle:
+            self.throttle.wait()
         
+        _connect_timer.elapsed = 0.0
+        _connect_timer.count = 0
+        start = time.perf_counter()
         try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            return response
+            response = self.session.request(
+                method, url, headers=headers,
+                json=data if method in ("POST", "PUT") and raw_body is None else None,
+                data=raw_body,
+                timeout=30
+            )
         except requests.exceptions.RequestException as e:
             print(f"Request error for {method} {url}: {str(e)}")
             return None
+        
+        # response.elapsed runs from send to response headers (TTFB) and includes
+        # any connection setup, so subtract that to isolate time spent in the server
+        total_time = time.perf_counter() - start
+        connect_time = _connect_timer.elapsed
+        ttfb = response.elapsed.total_seconds()
+        response.timing = {
+            "method": method,
+            "endpoint": endpoint,
+            "status": response.status_code,
+            "new_connections": _connect_timer.count,
+            "connect": connect_time,
+            "ttfb": ttfb,
+            "server": max(0.0, ttfb - connect_time),
+            "total": total_time,
+            "bytes": len(response.content)
+        }
+        self.timings.record(response.timing)
+        self._thread_state.last_timing = {
+            key: round(value * 1000, 3) if key in ("connect", "ttfb", "server", "total") else value
+            for key, value in response.timing.items()
+        }
+        return response
+    
+    def get_admin_token(self):
+        """Log in as the seeded admin once; collection writes require the admin role"""
+        with self.admin_lock:
+            if self.admin_token is None:
+                response = self.make_request("POST", "/auth/login", {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+                if response is not None and response.status_code == 200:
+                    self.admin_token = response.json().get("token")
+            return self.admin_token
+    
+    def print_connection_summary(self):
+        """Report connection reuse and split network setup from server time"""
+        count, opened, connect_total, server_total = self.timings.totals()
+        if not count:
+            return
+        print(f"🔌 Connections opened: {opened} for {count} requests")
+        if opened:
+            print(f"   Avg connect time: {connect_total / opened * 1000:.1f} ms per new connection")
+        print(f"   Avg server time:  {server_total / count * 1000:.1f} ms per request")
     
     def test_basic_api(self):
         """Test GET /api/ endpoint"""
@@ -220,11 +727,8 @@ class BackendTester:
                     if "password" not in user:
                         self.log_result("Token Verification", True, "Token verification successful")
                         
-                        # Test invalid token
-                        old_token = self.auth_token
-                        self.auth_token = "invalid_token"
-                        invalid_response = self.make_request("GET", "/auth/verify", auth_required=True)
-                        self.auth_token = old_token  # Restore valid token
+                        # Test invalid token (passed explicitly so concurrent tests keep the valid one)
+                        invalid_response = self.make_request("GET", "/auth/verify", auth_required=True, token="invalid_token")
                         
                         if invalid_response.status_code == 401:
                             self.log_result("Invalid Token Rejection", True, "Invalid token properly rejected")
@@ -245,6 +749,64 @@ class BackendTester:
             self.log_result("Token Verification", False, f"HTTP {response.status_code}", response.text)
             return False
     
+    def check_pagination(self, endpoint, label, status=None):
+        """Walk a collection with ?limit=&after= and compare against the unpaginated list"""
+        full = self.make_request("GET", endpoint)
+        if full is None or full.status_code != 200:
+            self.log_result(f"Paginate {label}", False, "Failed to fetch full collection")
+            return False
+        expected = [item["id"] for item in full.json()]
+        
+        seen = []
+        cursor = None
+        while True:
+            query = "?limit=2&fields=name" + (f"&after={cursor}" if cursor else "")
+            response = self.make_request("GET", f"{endpoint}{query}")
+            if response is None or response.status_code != 200:
+                self.log_result(f"Paginate {label}", False, "Page request failed", response.text if response is not None else None)
+                return False
+            page = response.json()
+            if not isinstance(page, dict) or "items" not in page or "nextCursor" not in page:
+                self.log_result(f"Paginate {label}", False, "Invalid page format", page)
+                return False
+            if any(set(item) - {"id", "name"} for item in page["items"]):
+                self.log_result(f"Paginate {label}", False, "fields projection returned extra fields", page["items"])
+                return False
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["nextCursor"]
+            if not cursor or len(seen) > len(expected):
+                break
+        
+        if seen != expected:
+            self.log_result(f"Paginate {label}", False, f"Pages returned {len(seen)} items, expected the {len(expected)} in the full list")
+            return False
+        
+        if status:
+            filtered = self.make_request("GET", f"{endpoint}?status={status}")
+            expected_filtered = [item["id"] for item in full.json() if item.get("status") == status]
+            if filtered is None or filtered.status_code != 200 or [item["id"] for item in filtered.json()] != expected_filtered:
+                self.log_result(f"Paginate {label}", False, f"status={status} filter did not match the full list")
+                return False
+        
+        self.log_result(f"Paginate {label}", True, f"Walked {len(seen)} items page by page in order")
+        return True
+    
+    def check_get_by_id(self, endpoint, record):
+        """GET <endpoint>/:id returns the record, and unknown ids or methods fail cleanly"""
+        response = self.make_request("GET", f"{endpoint}/{record['id']}")
+        if response is None or response.status_code != 200 or response.json() != record:
+            self.log_result("Get By Id", False, f"GET {endpoint}/:id did not return the created record",
+                            response.text if response is not None else None)
+            return False
+        missing = self.make_request("GET", f"{endpoint}/{uuid.uuid4()}")
+        wrong_method = self.make_request("DELETE", f"{endpoint}/{record['id']}")
+        if missing is None or missing.status_code != 404 or wrong_method is None or wrong_method.status_code != 405:
+            self.log_result("Get By Id", False, "Expected 404 for an unknown id and 405 for an unsupported method",
+                            {"missing": getattr(missing, "status_code", None), "method": getattr(wrong_method, "status_code", None)})
+            return False
+        self.log_result("Get By Id", True, f"GET {endpoint}/:id returned the record; 404 and 405 otherwise")
+        return True
+    
     def test_rockets_crud(self):
         """Test GET /api/rockets and POST /api/rockets"""
         print("\n=== Testing Rockets CRUD Operations ===")
@@ -254,6 +816,7 @@ class BackendTester:
         if response is None:
             self.log_result("Get Rockets", False, "Failed to connect to rockets endpoint")
             return False
+        self.rockets_etag = response.headers.get("ETag")
         
         if response.status_code == 200:
             try:
@@ -287,24 +850,18 @@ class BackendTester:
             self.log_result("Get Rockets", False, f"HTTP {response.status_code}", response.text)
             return False
         
+        # Test keyset pagination, projection and filtering
+        if not self.check_pagination("/rockets", "Rockets", status="active"):
+            return False
+        
         # Test POST rockets (requires authentication)
         if not self.auth_token:
             self.log_result("Create Rocket", False, "No auth token available for testing")
             return False
         
-        new_rocket = {
-            "name": "Titan X",
-            "type": "Medium-lift launch vehicle",
-            "specifications": {
-                "height": "85 m",
-                "diameter": "10 m",
-                "mass": "800,000 kg",
-                "payloadToLEO": "45,000 kg"
-            },
-            "status": "development"
-        }
+        new_rocket = SAMPLE_PAYLOADS["/rockets"]
         
-        response = self.make_request("POST", "/rockets", new_rocket, auth_required=True)
+        response = self.make_request("POST", "/rockets", new_rocket, auth_required=True, token=self.get_admin_token())
         if response is None:
             self.log_result("Create Rocket", False, "Failed to connect to create rocket endpoint")
             return False
@@ -314,8 +871,9 @@ class BackendTester:
                 created_rocket = response.json()
                 if "id" in created_rocket and created_rocket["name"] == new_rocket["name"]:
                     if "_id" not in created_rocket:
+                        self.created_rocket_id = created_rocket["id"]
                         self.log_result("Create Rocket", True, "Rocket created successfully with proper structure")
-                        return True
+                        return self.check_get_by_id("/rockets", created_rocket)
                     else:
                         self.log_result("Create Rocket", False, "MongoDB _id field exposed in create response")
                         return False
@@ -363,22 +921,18 @@ class BackendTester:
             self.log_result("Get Missions", False, f"HTTP {response.status_code}", response.text)
             return False
         
+        # Test keyset pagination, projection and filtering
+        if not self.check_pagination("/missions", "Missions", status="planned"):
+            return False
+        
         # Test POST missions (requires authentication)
         if not self.auth_token:
             self.log_result("Create Mission", False, "No auth token available for testing")
             return False
         
-        new_mission = {
-            "name": "Europa Explorer",
-            "description": "Scientific mission to explore Jupiter's moon Europa",
-            "status": "planned",
-            "launchDate": "2025-06-15T10:30:00Z",
-            "payload": "Europa Lander",
-            "orbit": "Jupiter system",
-            "customer": "ESA"
-        }
+        new_mission = SAMPLE_PAYLOADS["/missions"]
         
-        response = self.make_request("POST", "/missions", new_mission, auth_required=True)
+        response = self.make_request("POST", "/missions", new_mission, auth_required=True, token=self.get_admin_token())
         if response is None:
             self.log_result("Create Mission", False, "Failed to connect to create mission endpoint")
             return False
@@ -430,20 +984,18 @@ class BackendTester:
             self.log_result("Get Teams", False, f"HTTP {response.status_code}", response.text)
             return False
         
+        # Test keyset pagination, projection and filtering
+        if not self.check_pagination("/teams", "Teams"):
+            return False
+        
         # Test POST teams (requires authentication)
         if not self.auth_token:
             self.log_result("Create Team Member", False, "No auth token available for testing")
             return False
         
-        new_team_member = {
-            "name": "Dr. Alex Chen",
-            "position": "Propulsion Engineer",
-            "department": "Engineering",
-            "bio": "Specialist in advanced rocket propulsion systems and fuel efficiency optimization.",
-            "experience": "7 years"
-        }
+        new_team_member = SAMPLE_PAYLOADS["/teams"]
         
-        response = self.make_request("POST", "/teams", new_team_member, auth_required=True)
+        response = self.make_request("POST", "/teams", new_team_member, auth_required=True, token=self.get_admin_token())
         if response is None:
             self.log_result("Create Team Member", False, "Failed to connect to create team member endpoint")
             return False
@@ -495,24 +1047,18 @@ class BackendTester:
             self.log_result("Get Schedules", False, f"HTTP {response.status_code}", response.text)
             return False
         
+        # Test keyset pagination, projection and filtering
+        if not self.check_pagination("/schedules", "Schedules", status="scheduled"):
+            return False
+        
         # Test POST schedules (requires authentication)
         if not self.auth_token:
             self.log_result("Create Schedule", False, "No auth token available for testing")
             return False
         
-        new_schedule = {
-            "missionName": "Asteroid Mining Test",
-            "description": "Test mission for asteroid mining technology",
-            "launchDate": "2025-04-20T08:00:00Z",
-            "launchTime": "08:00 UTC",
-            "rocket": "Falcon Heavy",
-            "launchSite": "Kennedy Space Center",
-            "customer": "Mining Corp",
-            "payload": "Mining Probe",
-            "status": "scheduled"
-        }
+        new_schedule = SAMPLE_PAYLOADS["/schedules"]
         
-        response = self.make_request("POST", "/schedules", new_schedule, auth_required=True)
+        response = self.make_request("POST", "/schedules", new_schedule, auth_required=True, token=self.get_admin_token())
         if response is None:
             self.log_result("Create Schedule", False, "Failed to connect to create schedule endpoint")
             return False
@@ -533,6 +1079,301 @@ class BackendTester:
             self.log_result("Create Schedule", False, f"HTTP {response.status_code}", response.text)
             return False
     
+    def test_response_caching(self):
+        """Test ETag / If-None-Match on GET /api/rockets and invalidation after a write"""
+        print("\n=== Testing Response Caching ===")
+        
+        response = self.make_request("GET", "/rockets")
+        if response is None or response.status_code != 200:
+            self.log_result("Response Caching", False, "Failed to fetch rockets")
+            return False
+        etag = response.headers.get("ETag")
+        if not etag:
+            self.log_result("Response Caching", False, "No ETag on collection response", dict(response.headers))
+            return False
+        
+        conditional = self.make_request("GET", "/rockets", extra_headers={"If-None-Match": etag})
+        if conditional is None or conditional.status_code != 304 or conditional.content:
+            self.log_result("Conditional GET", False, f"Expected empty 304 for a matching ETag, got HTTP {getattr(conditional, 'status_code', None)}")
+            return False
+        self.log_result("Conditional GET", True, "Matching If-None-Match answered with 304")
+        
+        if not self.rockets_etag or not self.created_rocket_id:
+            self.log_result("Cache Invalidation", False, "Rockets CRUD test did not create a rocket to invalidate the cache")
+            return False
+        stale = self.make_request("GET", "/rockets", extra_headers={"If-None-Match": self.rockets_etag})
+        if stale is None or stale.status_code != 200:
+            self.log_result("Cache Invalidation", False, f"ETag from before the write still answered HTTP {getattr(stale, 'status_code', None)}")
+            return False
+        if stale.headers.get("ETag") == self.rockets_etag or self.created_rocket_id not in [r["id"] for r in stale.json()]:
+            self.log_result("Cache Invalidation", False, "Cached rockets list not refreshed after creating a rocket")
+            return False
+        
+        self.log_result("Cache Invalidation", True, "Creating a rocket changed the ETag and refreshed the cached list")
+        return True
+    
+    def test_bulk_import(self):
+        """Test POST /api/schedules/bulk with a generated NDJSON manifest against single-item POSTs"""
+        print("\n=== Testing Bulk Import ===")
+        admin_token = self.get_admin_token()
+        if not admin_token:
+            self.log_result("Bulk Import", False, "Admin login failed")
+            return False
+        
+        # A rejected batch must leave the collection untouched (same ETag before and after)
+        before = self.make_request("GET", "/schedules?limit=1")
+        invalid = [SAMPLE_PAYLOADS["/schedules"], 42]
+        response = self.make_request("POST", "/schedules/bulk", invalid, auth_required=True, token=admin_token)
+        after = self.make_request("GET", "/schedules?limit=1")
+        if response is None or response.status_code != 400 or response.json().get("index") != 1:
+            self.log_result("Bulk Validation", False, f"Expected 400 for item 1, got HTTP {getattr(response, 'status_code', None)}",
+                            response.text if response is not None else None)
+            return False
+        if before is None or after is None or before.headers.get("ETag") != after.headers.get("ETag"):
+            self.log_result("Bulk Validation", False, "Rejected batch changed the collection")
+            return False
+        self.log_result("Bulk Validation", True, "Invalid item rejected the whole batch with nothing inserted")
+        
+        with tempfile.NamedTemporaryFile("w+b", suffix=".ndjson") as manifest:
+            launch = datetime(2026, 1, 1)
+            for i in range(self.bulk_items):
+                schedule = {
+                    **SAMPLE_PAYLOADS["/schedules"],
+                    "missionName": f"Manifest Mission {i}",
+                    "launchDate": (launch + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+                }
+                manifest.write(json.dumps(schedule).encode() + b"\n")
+            manifest.seek(0)
+            body = manifest.read()
+        
+        response = self.make_request("POST", "/schedules/bulk", auth_required=True, token=admin_token,
+                                     extra_headers={"Content-Type": "application/x-ndjson"}, raw_body=body)
+        if response is None or response.status_code != 201:
+            self.log_result("Bulk Import", False, f"HTTP {getattr(response, 'status_code', None)}",
+                            response.text[:500] if response is not None else None)
+            return False
+        result = response.json()
+        if result.get("count") != self.bulk_items or len(set(result.get("ids", []))) != self.bulk_items:
+            self.log_result("Bulk Import", False, f"Expected {self.bulk_items} created ids", {"count": result.get("count")})
+            return False
+        bulk_rate = self.bulk_items / response.timing["total"]
+        
+        singles = min(200, self.bulk_items)
+        start = time.perf_counter()
+        for _ in range(singles):
+            single = self.make_request("POST", "/schedules", SAMPLE_PAYLOADS["/schedules"], auth_required=True, token=admin_token)
+            if single is None or single.status_code != 201:
+                self.log_result("Bulk Import", False, "Single-item POST for comparison failed")
+                return False
+        single_rate = singles / (time.perf_counter() - start)
+        
+        self.log_result("Bulk Import", True,
+                        f"{self.bulk_items} schedules at {bulk_rate:,.0f} items/s vs {single_rate:,.0f} items/s "
+                        f"with single POSTs (x{bulk_rate / single_rate:.1f})")
+        return True
+    
+    def load_home_page(self, dashboard):
+        """Fetch what the home page needs, via /dashboard or the four list routes in parallel as the browser did"""
+        endpoints = ["/dashboard"] if dashboard else [f"/{name}" for name in DASHBOARD_COLLECTIONS]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            responses = list(executor.map(lambda endpoint: self.make_request("GET", endpoint), endpoints))
+        elapsed = time.perf_counter() - start
+        if any(response is None or response.status_code != 200 for response in responses):
+            return None
+        return elapsed, len(responses), sum(response.timing["bytes"] for response in responses)
+    
+    def test_dashboard(self):
+        """Test GET /api/dashboard against the list routes, its version tag, and page-load cost"""
+        print("\n=== Testing Dashboard ===")
+        
+        response = self.make_request("GET", "/dashboard")
+        if response is None or response.status_code != 200:
+            self.log_result("Dashboard", False, f"HTTP {getattr(response, 'status_code', None)}")
+            return False
+        dashboard = response.json()
+        etag = response.headers.get("ETag")
+        lists = {name: self.make_request("GET", f"/{name}") for name in DASHBOARD_COLLECTIONS}
+        # A 304 afterwards proves nothing was written while the lists were fetched
+        unchanged = self.make_request("GET", "/dashboard", extra_headers={"If-None-Match": etag or ""})
+        if not etag or not dashboard.get("version") or unchanged is None or unchanged.status_code != 304:
+            self.log_result("Dashboard", False, "Missing version tag or no 304 for the dashboard ETag",
+                            {"etag": etag, "status": getattr(unchanged, "status_code", None)})
+            return False
+        mismatched = [name for name, listed in lists.items()
+                      if listed is None or listed.status_code != 200 or listed.json() != dashboard.get(name)]
+        if mismatched:
+            self.log_result("Dashboard", False, f"Collections differ from their list routes: {mismatched}")
+            return False
+        self.log_result("Dashboard", True, f"All {len(DASHBOARD_COLLECTIONS)} collections match their list routes")
+        
+        paged = self.make_request("GET", "/dashboard?limit=5")
+        first_page = self.make_request("GET", "/schedules?limit=5")
+        if paged is None or first_page is None or paged.status_code != 200 or paged.json().get("schedules") != first_page.json():
+            self.log_result("Dashboard Pagination", False, "?limit=5 schedules differ from GET /schedules?limit=5")
+            return False
+        cursor = self.make_request("GET", f"/dashboard?after={first_page.json()['nextCursor']}")
+        if cursor is None or cursor.status_code != 400:
+            self.log_result("Dashboard Pagination", False, f"Expected 400 for ?after, got HTTP {getattr(cursor, 'status_code', None)}")
+            return False
+        self.log_result("Dashboard Pagination", True, "?limit pages every collection like its list route")
+        
+        admin_token = self.get_admin_token()
+        rocket = self.make_request("POST", "/rockets", {**SAMPLE_PAYLOADS["/rockets"], "name": "Dashboard Rocket"},
+                                   auth_required=True, token=admin_token)
+        refreshed = self.make_request("GET", "/dashboard", extra_headers={"If-None-Match": etag})
+        if rocket is None or rocket.status_code != 201 or refreshed is None or refreshed.status_code != 200:
+            self.log_result("Dashboard Version", False, "Write did not invalidate the dashboard ETag")
+            return False
+        body = refreshed.json()
+        if body.get("version") == dashboard["version"] or rocket.json()["id"] not in [r["id"] for r in body["rockets"]]:
+            self.log_result("Dashboard Version", False, "Version tag or rockets unchanged after creating a rocket")
+            return False
+        self.log_result("Dashboard Version", True, "Creating a rocket changed the version tag and payload")
+        
+        costs = {}
+        for dashboard_mode in (False, True):
+            self.load_home_page(dashboard_mode)  # Warm the cached bodies
+            loads = [self.load_home_page(dashboard_mode) for _ in range(self.page_loads)]
+            if None in loads:
+                self.log_result("Dashboard Page Load", False, "A page-load request failed")
+                return False
+            times = sorted(elapsed for elapsed, _, _ in loads)
+            costs[dashboard_mode] = (times[len(times) // 2], loads[0][1], loads[0][2])
+        before, after = costs[False], costs[True]
+        self.log_result("Dashboard Page Load", True,
+                        f"{before[1]} requests / {before[2]:,} B / {before[0] * 1000:.1f} ms median -> "
+                        f"{after[1]} request / {after[2]:,} B / {after[0] * 1000:.1f} ms median over {self.page_loads} loads")
+        return True
+    
+    def check_search(self, label, endpoint, params, expected):
+        """Walk every page of a search and compare it with the records a client-side filter selected"""
+        found = []
+        after = None
+        while True:
+            query = {**params, "limit": 50, **({"after": after} if after else {})}
+            response = self.make_request("GET", f"{endpoint}/search?{urlencode(query)}")
+            if response is None or response.status_code != 200:
+                self.log_result(label, False, f"HTTP {getattr(response, 'status_code', None)}",
+                                response.text if response is not None else None)
+                return False
+            page = response.json()
+            found.extend(page["items"])
+            after = page["nextCursor"]
+            if not after:
+                break
+        
+        dates = [parse_date(record["launchDate"]) for record in found]
+        if dates != sorted(dates):
+            self.log_result(label, False, "Results are not in launchDate order")
+            return False
+        if sorted(record["id"] for record in found) != sorted(record["id"] for record in expected):
+            self.log_result(label, False, f"Found {len(found)} records, a client-side filter found {len(expected)}", params)
+            return False
+        self.log_result(label, True, f"{len(found)} records match the client-side filter for {params}")
+        return True
+    
+    def test_search(self):
+        """Test /api/schedules/search and /api/missions/search against filtering the full lists"""
+        print("\n=== Testing Search ===")
+        
+        schedules = self.make_request("GET", "/schedules")
+        missions = self.make_request("GET", "/missions")
+        if schedules is None or missions is None or schedules.status_code != 200 or missions.status_code != 200:
+            self.log_result("Search", False, "Failed to fetch the full lists to compare against")
+            return False
+        
+        # A week of the hourly launches generated by the bulk import test
+        start, end = datetime(2026, 1, 3, tzinfo=timezone.utc), datetime(2026, 1, 9, 23, 59, 59, tzinfo=timezone.utc)
+        expected = [record for record in schedules.json()
+                    if record.get("launchSite") == "Kennedy Space Center" and start <= parse_date(record["launchDate"]) <= end]
+        params = {"launchSite": "kennedy space center", "from": start.isoformat(), "to": end.isoformat()}
+        if not self.check_search("Search Range", "/schedules", params, expected):
+            return False
+        
+        expected = [record for record in missions.json()
+                    if record.get("status") == "planned" and "europa" in re.findall(r"\w+", f"{record.get('name', '')} {record.get('description', '')}".lower())]
+        if not self.check_search("Search Text", "/missions", {"q": "Europa", "status": "planned"}, expected):
+            return False
+        
+        invalid = self.make_request("GET", "/schedules/search?from=not-a-date")
+        if invalid is None or invalid.status_code != 400:
+            self.log_result("Search Validation", False, f"Expected 400 for an invalid date, got HTTP {getattr(invalid, 'status_code', None)}")
+            return False
+        self.log_result("Search Validation", True, "Invalid date rejected with 400")
+        return True
+    
+    @staticmethod
+    def read_event(lines):
+        """Next Server-Sent Event from an iterator of decoded lines, as {"id", "event", "data"}; comments are skipped"""
+        event = {}
+        for line in lines:
+            if not line:
+                if "event" in event or "data" in event:
+                    return event
+                event = {}
+            elif not line.startswith(":") and ":" in line:
+                field, _, value = line.partition(":")
+                event[field] = value[1:] if value.startswith(" ") else value
+        return None
+    
+    def open_events(self, query="", last_event_id=None):
+        """Open GET /api/events; returns (response, line iterator)"""
+        headers = {"Accept": "text/event-stream"}
+        if last_event_id:
+            headers["Last-Event-ID"] = last_event_id
+        response = self.session.get(f"{self.base_url}/events{query}", headers=headers, stream=True, timeout=10)
+        return response, response.iter_lines(decode_unicode=True)
+    
+    def test_events(self):
+        """Test the GET /api/events change feed: live inserts, Last-Event-ID replay and reset"""
+        print("\n=== Testing Change Feed ===")
+        admin_token = self.get_admin_token()
+        
+        response, lines = self.open_events("?collections=rockets")
+        try:
+            if response.status_code != 200 or "text/event-stream" not in response.headers.get("Content-Type", ""):
+                self.log_result("Change Feed", False, f"HTTP {response.status_code}, {response.headers.get('Content-Type')}")
+                return False
+            start = time.perf_counter()
+            created = self.make_request("POST", "/rockets", {**SAMPLE_PAYLOADS["/rockets"], "name": "Feed Rocket"},
+                                        auth_required=True, token=admin_token)
+            if created is None or created.status_code != 201:
+                self.log_result("Change Feed", False, "Failed to create a rocket to observe")
+                return False
+            rocket_id = created.json()["id"]
+            event = self.read_event(lines)
+            delay = time.perf_counter() - start
+        finally:
+            response.close()
+        
+        data = json.loads(event["data"]) if event and event.get("event") == "insert" else {}
+        if data.get("collection") != "rockets" or [r["id"] for r in data.get("records", [])] != [rocket_id]:
+            self.log_result("Change Feed", False, "Insert event for the new rocket not delivered", event)
+            return False
+        self.log_result("Change Feed", True, f"Insert event delivered {delay * 1000:.1f} ms after the POST was sent")
+        
+        # Resuming from the event before ours replays ours first
+        epoch, _, seq = event["id"].rpartition("-")
+        response, lines = self.open_events("?collections=rockets", last_event_id=f"{epoch}-{int(seq) - 1}")
+        try:
+            replayed = self.read_event(lines)
+        finally:
+            response.close()
+        response, lines = self.open_events(last_event_id="unknown-1")
+        try:
+            reset = self.read_event(lines)
+        finally:
+            response.close()
+        if not replayed or replayed.get("id") != event["id"]:
+            self.log_result("Change Feed Resume", False, "Last-Event-ID did not replay the missed event", replayed)
+            return False
+        if not reset or reset.get("event") != "reset":
+            self.log_result("Change Feed Resume", False, "Unknown Last-Event-ID did not get a reset event", reset)
+            return False
+        self.log_result("Change Feed Resume", True, "Last-Event-ID replayed the missed insert; an unknown id got reset")
+        return True
+    
     def test_cors_headers(self):
         """Test CORS headers are properly set"""
         print("\n=== Testing CORS Headers ===")
@@ -560,7 +1401,103 @@ class BackendTester:
             self.log_result("CORS Headers", False, f"Missing CORS headers: {missing_headers}")
             return False
     
-    def run_all_tests(self):
+    def print_timing_summary(self):
+        """Print per-route latency percentiles from the request histograms"""
+        rows = self.timings.rows()
+        if not rows:
+            return
+        print(f"\n⏱️  {'Route':<26}{'Count':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'TTFB ms':>9}{'Bytes':>9}")
+        for row in rows:
+            key = f"{row['method']} {row['route']}"
+            print(f"   {key:<26}{row['count']:>6}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                  f"{row['mean_ttfb_ms']:>9.1f}{row['bytes']:>9}")
+    
+    def scrape_metrics(self):
+        """GET /metrics as JSON, bypassing the client timings; (metrics, worker id) or None if unavailable"""
+        try:
+            response = self.session.get(f"{self.base_url}/metrics", params={"format": "json"},
+                                        headers={"Accept": "application/json"}, timeout=10)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        return response.json(), response.headers.get("X-Worker-Id")
+    
+    def print_server_comparison(self):
+        """Line up client-side timings with the server's own per-route timings for this run"""
+        if self.server_metrics is None:
+            print("\nℹ️  GET /metrics unavailable; no server-side timings to compare")
+            return
+        rows = self.server_metrics.rows(self.timings)
+        summary = self.server_metrics.summary()
+        worker = f" (worker {summary['worker_id']} only)" if summary["worker_id"] else ""
+        print(f"\n🖥️  Client vs. server{worker}: client TTFB excludes connection setup; gap is network + framework time")
+        print(f"   {'Route':<30}{'Client':>7}{'Server':>7}{'TTFB ms':>9}{'Srv ms':>9}{'Gap ms':>9}{'p95 ms':>9}{'Srv p95':>9}")
+        fmt = lambda value: f"{value:>9.2f}" if value is not None else f"{'-':>9}"
+        for row in rows:
+            key = f"{row['method']} {row['route']}"
+            print(f"   {key:<30}{row['client_count']:>7}{row['server_count']:>7}{fmt(row['client_ttfb_ms'])}"
+                  f"{fmt(row['server_mean_ms'])}{fmt(row['gap_ms'])}{fmt(row['client_p95_ms'])}{fmt(row['server_p95_ms'])}")
+        lag = summary["event_loop_lag_ms"]
+        rss_before, rss_after = summary["rss_bytes"]
+        print(f"   Event-loop lag p50/p90/p99: {lag['p50']:.2f}/{lag['p90']:.2f}/{lag['p99']:.2f} ms, "
+              f"password queue p95 {summary['password_queue_p95_ms']:.2f} ms over {summary['password_queue_waits']} tasks, "
+              f"RSS {rss_before / 2**20:.0f} -> {rss_after / 2**20:.0f} MiB")
+        if summary["errors"]:
+            print(f"   ❌ Unhandled server errors during the run: {summary['errors']}")
+    
+    def export_results(self, prefix):
+        """Write PASS/FAIL results and per-route timings to <prefix>.json and <prefix>.csv"""
+        passed = sum(1 for result in self.test_results if result["success"])
+        self.timings.export_json(f"{prefix}.json", {
+            "base_url": self.base_url,
+            "generated_at": datetime.now().isoformat(),
+            "passed": passed,
+            "failed": len(self.test_results) - passed,
+            "results": self.test_results,
+            "server": {
+                **self.server_metrics.summary(),
+                "routes": self.server_metrics.rows(self.timings)
+            } if self.server_metrics else None
+        })
+        self.timings.export_csv(f"{prefix}.csv")
+        print(f"📁 Results exported to {prefix}.json and {prefix}.csv")
+    
+    def run_test(self, test_method):
+        """Run one test method, turning unexpected exceptions into a failed result"""
+        try:
+            return bool(test_method())
+        except Exception as e:
+            self.log_result(test_method.__name__, False, f"Test execution error: {str(e)}")
+            return False
+    
+    def run_scheduled(self, test_methods, workers):
+        """Run tests on a thread pool, starting each one as soon as its dependencies finish"""
+        pending = list(test_methods)
+        done = set()
+        outcomes = {}
+        running = {}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                for test_method in list(pending):
+                    dependencies = self.TEST_DEPENDENCIES.get(test_method.__name__, ())
+                    if all(name in done for name in dependencies if name in {m.__name__ for m in test_methods}):
+                        pending.remove(test_method)
+                        running[executor.submit(self.run_test, test_method)] = test_method
+                
+                if not running:
+                    raise RuntimeError(f"Unsatisfiable test dependencies: {[m.__name__ for m in pending]}")
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    test_method = running.pop(future)
+                    outcomes[test_method.__name__] = future.result()
+                    done.add(test_method.__name__)
+        
+        return outcomes
+    
+    def run_all_tests(self, workers=4):
         """Run all backend tests"""
         print("🚀 Starting Comprehensive Backend API Testing for Rocket Company Website")
         print(f"Testing against: {self.base_url}")
@@ -575,29 +1512,33 @@ class BackendTester:
             self.test_missions_crud,
             self.test_teams_crud,
             self.test_schedules_crud,
+            self.test_response_caching,
+            self.test_bulk_import,
+            self.test_dashboard,
+            self.test_search,
+            self.test_events,
             self.test_cors_headers
         ]
         
-        passed = 0
-        failed = 0
-        
-        for test_method in test_methods:
-            try:
-                if test_method():
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.log_result(test_method.__name__, False, f"Test execution error: {str(e)}")
-                failed += 1
-            
-            time.sleep(1)  # Brief pause between tests
+        before = self.scrape_metrics()
+        start = time.perf_counter()
+        outcomes = self.run_scheduled(test_methods, max(1, workers))
+        elapsed = time.perf_counter() - start
+        after = self.scrape_metrics() if before else None
+        if before and after:
+            self.server_metrics = MetricsWindow(before[0], after[0], after[1])
+        passed = sum(1 for ok in outcomes.values() if ok)
+        failed = len(outcomes) - passed
         
         print("\n" + "=" * 80)
         print("🏁 BACKEND TESTING COMPLETE")
         print(f"✅ Passed: {passed}")
         print(f"❌ Failed: {failed}")
         print(f"📊 Success Rate: {(passed/(passed+failed)*100):.1f}%")
+        print(f"⏲️  Wall-clock time: {elapsed:.2f}s with {max(1, workers)} worker(s)")
+        self.print_connection_summary()
+        self.print_timing_summary()
+        self.print_server_comparison()
         
         if failed == 0:
             print("\n🎉 ALL BACKEND TESTS PASSED! The API is working correctly.")
@@ -606,13 +1547,1693 @@ class BackendTester:
         
         return failed == 0
 
+class RateLimiter:
+    """Spaces request starts evenly so the whole run stays at a target RPS"""
+
+    def __init__(self, rps):
+        self.interval = 1.0 / rps
+        self.next_slot = time.perf_counter()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            now = time.perf_counter()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class LoadTester:
+    """Drives the API with concurrent virtual users built from the functional test scenarios"""
+
+    # Scenario name -> default weight in the virtual-user mix
+    DEFAULT_MIX = {
+        "browse": 70,
+        "login": 10,
+        "register": 5,
+        "verify": 10,
+        "admin_write": 5
+    }
+
+    # Statuses of requests the server turned away under load rather than failed
+    SHED_STATUSES = (429, 503)
+
+    def __init__(self, base_url=BASE_URL, concurrency=50, duration=30, rps=None, mix=None, pool_users=20, slo=1.0,
+                 max_in_flight=2000):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rps = rps
+        self.mix = mix or dict(self.DEFAULT_MIX)
+        self.pool_users = pool_users
+        self.limiter = RateLimiter(rps) if rps else None
+        # Responses slower than slo seconds don't count towards goodput
+        self.slo = slo
+        self.max_in_flight = max_in_flight
+        self.latencies = {}
+        self.errors = {}
+        # good (expected status within the SLO), late, shed (429/503), failed; dropped
+        # counts open-loop arrivals skipped because max_in_flight scenarios were running
+        self.outcomes = {"good": 0, "late": 0, "shed": 0, "failed": 0, "dropped": 0}
+        self.good = {}
+        self.completed = 0
+        self.users = []
+        self.admin_token = None
+        self.elapsed = 0.0
+        self.scenarios = {
+            "browse": self.scenario_browse,
+            "login": self.scenario_login,
+            "register": self.scenario_register,
+            "verify": self.scenario_verify,
+            "admin_write": self.scenario_admin_write
+        }
+
+    def record(self, method, endpoint, elapsed, ok):
+        key = f"{method} {endpoint}"
+        if key not in self.latencies:
+            self.latencies[key] = LatencyHistogram()
+        self.latencies[key].record(elapsed)
+        if not ok:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def tally(self, key, status, elapsed, expected):
+        if status in expected and elapsed <= self.slo:
+            outcome = "good"
+            self.good[key] = self.good.get(key, 0) + 1
+        elif status in expected:
+            outcome = "late"
+        elif status in self.SHED_STATUSES:
+            outcome = "shed"
+        else:
+            outcome = "failed"
+        self.outcomes[outcome] += 1
+
+    def reset(self):
+        self.latencies.clear()
+        self.errors.clear()
+        self.outcomes = dict.fromkeys(self.outcomes, 0)
+        self.good.clear()
+        self.completed = 0
+
+    async def request(self, session, method, endpoint, data=None, token=None, expected=(200, 201)):
+        """Issue one request and record its latency; returns (status, parsed JSON or None)"""
+        if self.limiter:
+            await self.limiter.acquire()
+
+        headers = HEADERS.copy()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        start = time.perf_counter()
+        try:
+            async with session.request(method, f"{self.base_url}{endpoint}", json=data, headers=headers) as response:
+                body = await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.record(method, endpoint, time.perf_counter() - start, False)
+            self.tally(f"{method} {endpoint}", None, 0.0, expected)
+            return None, None
+
+        elapsed = time.perf_counter() - start
+        self.record(method, endpoint, elapsed, status in expected)
+        self.tally(f"{method} {endpoint}", status, elapsed, expected)
+        try:
+            return status, json.loads(body) if body else None
+        except json.JSONDecodeError:
+            return status, None
+
+    # Virtual-user workflows, mirroring the BackendTester test_* methods
+
+    async def scenario_browse(self, session, rng):
+        # The home page loads all four collections from one dashboard request
+        await self.request(session, "GET", "/")
+        await self.request(session, "GET", "/dashboard")
+
+    async def scenario_register(self, session, rng):
+        user_data = {
+            "name": "Load Test User",
+            "email": f"load.{time.time_ns()}.{rng.randrange(1_000_000)}@astrolaunch.com",
+            "password": "LoadTest789!"
+        }
+        status, data = await self.request(session, "POST", "/auth/register", user_data)
+        if status == 200 and data:
+            await self.request(session, "GET", "/auth/verify", token=data.get("token"))
+
+    async def scenario_login(self, session, rng):
+        if not self.users:
+            return
+        user = rng.choice(self.users)
+        await self.request(session, "POST", "/auth/login", {"email": user["email"], "password": user["password"]})
+
+    async def scenario_verify(self, session, rng):
+        if not self.users:
+            return
+        await self.request(session, "GET", "/auth/verify", token=rng.choice(self.users)["token"])
+
+    async def scenario_admin_write(self, session, rng):
+        if not self.admin_token:
+            return
+        endpoint = rng.choice(list(SAMPLE_PAYLOADS))
+        await self.request(session, "POST", endpoint, SAMPLE_PAYLOADS[endpoint], token=self.admin_token)
+
+    async def setup(self, session):
+        """Register a pool of users and log in as admin before the timed run"""
+        for i in range(self.pool_users):
+            user_data = {
+                "name": f"Load Pool User {i}",
+                "email": f"load.pool.{i}.{int(time.time())}@astrolaunch.com",
+                "password": "LoadPool123!"
+            }
+            status, data = await self.request(session, "POST", "/auth/register", user_data)
+            if status == 200 and data:
+                self.users.append({**user_data, "token": data["token"]})
+
+        status, data = await self.request(session, "POST", "/auth/login", {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        if status == 200 and data:
+            self.admin_token = data["token"]
+
+        # Setup traffic is not part of the measurement
+        self.reset()
+
+    def weighted_scenarios(self):
+        names = [name for name, weight in self.mix.items() if weight > 0]
+        return names, [self.mix[name] for name in names]
+
+    async def virtual_user(self, session, deadline, seed):
+        rng = random.Random(seed)
+        names, weights = self.weighted_scenarios()
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, weights)[0]
+            await self.scenarios[scenario](session, rng)
+            self.completed += 1
+
+    async def open_loop(self, session, rate, duration, seed=0):
+        """Start scenarios as a Poisson process at `rate` per second for `duration`, whether or not
+        earlier ones have finished (unlike virtual users, arrivals don't slow down with the server),
+        then wait for the ones in flight"""
+        rng = random.Random(seed)
+        names, weights = self.weighted_scenarios()
+        in_flight = set()
+
+        async def scenario(name):
+            await self.scenarios[name](session, rng)
+            self.completed += 1
+
+        start = time.perf_counter()
+        deadline = start + duration
+        arrival = start
+        while arrival < deadline:
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) < self.max_in_flight:
+                task = asyncio.create_task(scenario(rng.choices(names, weights)[0]))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            else:
+                self.outcomes["dropped"] += 1
+            arrival += rng.expovariate(rate)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await self.setup(session)
+            start = time.perf_counter()
+            deadline = start + self.duration
+            await asyncio.gather(*(self.virtual_user(session, deadline, seed) for seed in range(self.concurrency)))
+            self.elapsed = time.perf_counter() - start
+
+    async def run_overload(self, multipliers, capacity=None):
+        """Measure goodput with scenarios arriving at each multiple of capacity (scenarios/s).
+        Without a capacity it is calibrated first: the rate of closed-loop virtual users, scaled
+        by the share of their requests that were good. Returns one dict per phase."""
+        self.limiter = None
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=30)
+        phases = []
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await self.setup(session)
+            if capacity is None:
+                start = time.perf_counter()
+                deadline = start + self.duration
+                await asyncio.gather(*(self.virtual_user(session, deadline, seed) for seed in range(self.concurrency)))
+                elapsed = time.perf_counter() - start
+                requests = sum(self.outcomes.values()) - self.outcomes["dropped"]
+                capacity = self.completed / elapsed * (self.outcomes["good"] / requests if requests else 0.0)
+                print(f"Calibrated capacity: {capacity:.1f} scenarios/s with {self.concurrency} virtual users")
+                if capacity <= 0:
+                    return phases
+
+            for multiplier in multipliers:
+                self.reset()
+                start = time.perf_counter()
+                await self.open_loop(session, capacity * multiplier, self.duration, seed=len(phases))
+                drained = time.perf_counter() - start
+                latency = LatencyHistogram()
+                for histogram in self.latencies.values():
+                    latency.merge(histogram)
+                phases.append({
+                    "multiplier": multiplier,
+                    "offered": capacity * multiplier,
+                    "goodput": self.outcomes["good"] / self.duration,
+                    "endpoints": {key: count / self.duration for key, count in self.good.items()},
+                    "outcomes": dict(self.outcomes),
+                    "requests": latency.count,
+                    "p50": latency.percentile(50),
+                    "p99": latency.percentile(99),
+                    "drain": drained - self.duration
+                })
+        return phases
+
+    def report(self):
+        """Print per-endpoint throughput and latency percentiles; returns overall error rate"""
+        total = sum(histogram.count for histogram in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        elapsed = self.elapsed or 1e-9
+
+        print("\n" + "=" * 80)
+        print("📈 LOAD TEST RESULTS")
+        print(f"Duration: {self.elapsed:.1f}s  Concurrency: {self.concurrency}  Target RPS: {self.rps or 'unbounded'}")
+        print(f"{'Endpoint':<26}{'Count':>8}{'Errors':>8}{'RPS':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for key in sorted(self.latencies):
+            histogram = self.latencies[key]
+            print(f"{key:<26}{histogram.count:>8}{self.errors.get(key, 0):>8}{histogram.count / elapsed:>9.1f}"
+                  f"{histogram.percentile(50) * 1000:>9.1f}{histogram.percentile(95) * 1000:>9.1f}{histogram.percentile(99) * 1000:>9.1f}")
+        print(f"{'TOTAL':<26}{total:>8}{total_errors:>8}{total / elapsed:>9.1f}")
+
+        return total_errors / total if total else 1.0
+
+    def report_overload(self, phases, min_goodput):
+        """Print goodput per offered load; passes when every phase at 2x capacity or more keeps
+        min_goodput of the goodput at 1x (or the lowest multiplier measured), in total and for
+        each endpoint, so expensive routes can't collapse behind a steady stream of cheap reads"""
+        print("\n" + "=" * 80)
+        print(f"📉 OVERLOAD RESULTS (goodput = expected responses within {self.slo * 1000:.0f} ms per second)")
+        print(f"{'Load':>6}{'Offered/s':>11}{'Requests':>10}{'Goodput/s':>11}{'Shed %':>8}{'Late %':>8}{'Failed %':>10}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'Drain s':>9}")
+        for phase in phases:
+            outcomes = phase["outcomes"]
+            share = lambda name: outcomes[name] / phase["requests"] * 100 if phase["requests"] else 0.0
+            print(f"{phase['multiplier']:>5g}x{phase['offered']:>11.1f}{phase['requests']:>10}{phase['goodput']:>11.1f}"
+                  f"{share('shed'):>8.1f}{share('late'):>8.1f}{share('failed'):>10.1f}"
+                  f"{phase['p50'] * 1000:>9.1f}{phase['p99'] * 1000:>9.1f}{phase['drain']:>9.1f}")
+
+        if not phases:
+            print("\n❌ No capacity to measure against")
+            return False
+        reference = min(phases, key=lambda phase: phase["multiplier"])
+        collapsed = []
+        for phase in phases:
+            if phase["multiplier"] < 2:
+                continue
+            checks = [("all requests", phase["goodput"], reference["goodput"])]
+            # Endpoints with too few good responses at the reference load are too noisy to judge
+            checks += [(key, phase["endpoints"].get(key, 0.0), goodput)
+                       for key, goodput in sorted(reference["endpoints"].items()) if goodput * self.duration >= 20]
+            for name, goodput, expected in checks:
+                if goodput < min_goodput * expected:
+                    collapsed.append(name)
+                    print(f"\n⚠️  Goodput of {name} collapsed at {phase['multiplier']:g}x capacity: {goodput:.1f}/s, "
+                          f"{goodput / expected * 100:.0f}% of {expected:.1f}/s at {reference['multiplier']:g}x "
+                          f"(minimum {min_goodput * 100:.0f}%)")
+        if not collapsed:
+            print(f"\n🎉 Goodput held at {min_goodput * 100:.0f}% or more of {reference['goodput']:.1f}/s "
+                  f"({reference['multiplier']:g}x), and on every endpoint, up to "
+                  f"{max(phase['multiplier'] for phase in phases):g}x capacity")
+        return not collapsed
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants (Linux /proc), or None"""
+    try:
+        parents = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        # The command name may contain spaces; fields resume after its closing parenthesis
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except (OSError, IndexError, ValueError):
+                    continue
+    except OSError:
+        return None
+
+    tree = [pid]
+    for candidate in tree:
+        tree.extend(child for child, parent in parents.items() if parent == candidate)
+    total = 0
+    for member in tree:
+        try:
+            with open(f"/proc/{member}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total or None
+
+
+class BackendBenchmarks:
+    """Server-side performance benchmarks selected with --bench; each bench_* method prints its own table"""
+
+    def __init__(self, base_url=BASE_URL, concurrency=50, samples=200, users=100_000, records=20_000,
+                 server_cmd=None, startup_runs=5, seed_snapshot=None, max_slowdown=3.0, wal_records=1_000_000,
+                 search_records=100_000, subscribers=500):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.samples = samples
+        self.users = users
+        self.records = records
+        self.server_cmd = server_cmd
+        self.startup_runs = startup_runs
+        self.seed_snapshot = seed_snapshot
+        self.max_slowdown = max_slowdown
+        self.wal_records = wal_records
+        self.search_records = search_records
+        self.subscribers = subscribers
+        self.run_id = int(time.time())
+        self._admin_tokens = {}
+
+    @classmethod
+    def available(cls):
+        return [name[len("bench_"):] for name in dir(cls) if name.startswith("bench_")]
+
+    async def request(self, session, method, endpoint, data=None, token=None, headers=None, base_url=None):
+        """Issue one request; returns (status, response headers, body bytes, elapsed seconds)"""
+        request_headers = HEADERS.copy()
+        request_headers.update(headers or {})
+        if token:
+            request_headers["Authorization"] = f"Bearer {token}"
+        start = time.perf_counter()
+        url = f"{base_url or self.base_url}{endpoint}"
+        async with session.request(method, url, json=data, headers=request_headers) as response:
+            body = await response.read()
+        return response.status, response.headers, body, time.perf_counter() - start
+
+    async def setup_request(self, session, method, endpoint, data=None, token=None, base_url=None, attempts=10):
+        """request() for filling the server before a measurement: 429/503 from admission control are retried
+        after their Retry-After, so a concurrent fill waits its turn instead of failing the bench"""
+        for attempt in range(attempts):
+            status, headers, body, elapsed = await self.request(session, method, endpoint, data, token=token, base_url=base_url)
+            if status not in (429, 503) or attempt == attempts - 1:
+                return status, headers, body, elapsed
+            try:
+                delay = float(headers.get("Retry-After", 1))
+            except ValueError:
+                delay = 1.0
+            # Jittered so the retries of a concurrent fill don't arrive together again
+            await asyncio.sleep(delay * random.uniform(1.0, 1.5))
+
+    async def measure(self, samples, make_request, expected=None):
+        """Run make_request(i) sequentially and collect its latencies; any 4xx/5xx fails unless it is the expected status"""
+        histogram = LatencyHistogram()
+        for i in range(samples):
+            status, _, body, elapsed = await make_request(i)
+            if status != expected if expected is not None else status >= 400:
+                raise RuntimeError(f"Benchmark request failed with HTTP {status}: {body[:200]!r}")
+            histogram.record(elapsed)
+        return histogram
+
+    async def run_concurrently(self, count, make_request):
+        """Run make_request(i) for i in range(count) with at most self.concurrency in flight"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(i):
+            async with semaphore:
+                return await make_request(i)
+
+        return await asyncio.gather(*(bounded(i) for i in range(count)))
+
+    async def register_user(self, session, label, base_url=None):
+        user_data = {
+            "name": "Benchmark User",
+            "email": f"bench.{self.run_id}.{label}@astrolaunch.com",
+            "password": "BenchPass123!"
+        }
+        status, headers, body, _ = await self.setup_request(session, "POST", "/auth/register", user_data, base_url=base_url)
+        if status != 200:
+            raise RuntimeError(f"Benchmark registration failed with HTTP {status}")
+        # worker: the cluster worker that stored the user (None outside the cluster launcher)
+        return {**user_data, "token": json.loads(body)["token"], "worker": headers.get("X-Worker-Id")}
+
+    async def admin_token(self, session, base_url=None):
+        base_url = base_url or self.base_url
+        if base_url not in self._admin_tokens:
+            credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+            status, _, body, _ = await self.setup_request(session, "POST", "/auth/login", credentials, base_url=base_url)
+            if status != 200:
+                raise RuntimeError(f"Admin login failed with HTTP {status}")
+            self._admin_tokens[base_url] = json.loads(body)["token"]
+        return self._admin_tokens[base_url]
+
+    async def count_records(self, session, endpoint, base_url=None):
+        status, _, body, _ = await self.request(session, "GET", endpoint, base_url=base_url)
+        if status != 200:
+            raise RuntimeError(f"GET {endpoint} failed with HTTP {status}")
+        return len(json.loads(body))
+
+    async def fill_collection(self, session, endpoint, count, base_url=None):
+        """Create count records in a collection through the admin bulk endpoint, 10k per request"""
+        token = await self.admin_token(session, base_url)
+        payload = SAMPLE_PAYLOADS[endpoint]
+        for start in range(0, count, 10_000):
+            batch = [payload] * min(10_000, count - start)
+            status, _, body, _ = await self.setup_request(session, "POST", f"{endpoint}/bulk", batch, token=token, base_url=base_url)
+            if status != 201:
+                raise RuntimeError(f"Bulk insert into {endpoint} failed with HTTP {status}: {body[:200]!r}")
+
+    @staticmethod
+    def print_table(title, columns, rows):
+        print(f"\n=== {title} ===")
+        print("".join(f"{column:>14}" for column in columns))
+        for row in rows:
+            print("".join(f"{value:>14.2f}" if isinstance(value, float) else f"{value:>14}" for value in row))
+
+    async def bench_user_lookup(self, session):
+        """Login/verify latency as the user table grows to self.users"""
+        checkpoints = sorted({c for c in (100, 1_000, 10_000, 100_000, self.users) if c <= self.users})
+        registered = 0
+        rows = []
+        for checkpoint in checkpoints:
+            await self.run_concurrently(checkpoint - registered, lambda i, base=registered: self.register_user(session, f"fill.{base + i}"))
+            registered = checkpoint
+
+            # Probe with the newest user, the worst case for a linear scan
+            probe = await self.register_user(session, f"probe.{checkpoint}")
+            credentials = {"email": probe["email"], "password": probe["password"]}
+            login = await self.measure(self.samples, lambda i: self.request(session, "POST", "/auth/login", credentials))
+            verify = await self.measure(self.samples, lambda i: self.request(session, "GET", "/auth/verify", token=probe["token"]))
+            rows.append((checkpoint, login.percentile(50) * 1000, login.percentile(95) * 1000,
+                         verify.percentile(50) * 1000, verify.percentile(95) * 1000))
+
+        self.print_table("User Lookup Latency vs. User Count (ms)",
+                         ["users", "login p50", "login p95", "verify p50", "verify p95"], rows)
+        if len(rows) > 1:
+            print(f"📐 verify p50 changed x{rows[-1][3] / rows[0][3]:.2f} from {rows[0][0]} to {rows[-1][0]} users")
+
+    async def bench_collection_read(self, session):
+        """GET latency per collection as each grows to self.records; flat us/record means O(n) reads"""
+        checkpoints = sorted({c for c in (1_000, 5_000, 10_000, 20_000, 50_000, self.records) if c <= self.records})
+        rows = []
+        for endpoint in SAMPLE_PAYLOADS:
+            existing = await self.count_records(session, endpoint)
+            for checkpoint in checkpoints:
+                if checkpoint > existing:
+                    await self.fill_collection(session, endpoint, checkpoint - existing)
+                    existing = checkpoint
+                reads = await self.measure(self.samples, lambda i: self.request(session, "GET", endpoint))
+                p50 = reads.percentile(50)
+                rows.append((endpoint, existing, p50 * 1000, reads.percentile(95) * 1000, p50 * 1_000_000 / existing))
+
+        self.print_table("Collection Read Latency vs. Size",
+                         ["collection", "records", "p50 ms", "p95 ms", "us/record"], rows)
+
+    async def bench_response_cache(self, session):
+        """GET /schedules throughput: rebuilt after a write vs. cached body vs. 304 revalidation"""
+        endpoint = "/schedules"
+        existing = await self.count_records(session, endpoint)
+        if existing < self.records:
+            await self.fill_collection(session, endpoint, self.records - existing)
+        token = await self.admin_token(session)
+
+        async def after_write(i):
+            await self.setup_request(session, "POST", endpoint, SAMPLE_PAYLOADS[endpoint], token=token)
+            return await self.request(session, "GET", endpoint)
+
+        _, headers, _, _ = await self.request(session, "GET", endpoint)
+        etag = headers.get("ETag")
+        modes = [
+            ("miss", after_write),
+            ("hit", lambda i: self.request(session, "GET", endpoint)),
+            ("304", lambda i: self.request(session, "GET", endpoint, headers={"If-None-Match": etag or ""}))
+        ]
+
+        rows = []
+        for mode, make_request in modes:
+            latencies = await self.measure(self.samples, make_request)
+            rows.append((mode, latencies.percentile(50) * 1000, latencies.percentile(95) * 1000, 1 / latencies.mean()))
+
+        self.print_table(f"GET {endpoint} Caching ({max(existing, self.records)}+ records)",
+                         ["mode", "p50 ms", "p95 ms", "req/s"], rows)
+        if not etag:
+            print("⚠️  No ETag returned; the 304 row measured full responses")
+
+    async def bench_token_cache(self, session):
+        """Authenticated GET /auth/verify latency on a token's first use (cold cache) vs. repeat uses (warm)"""
+        users = await self.run_concurrently(self.samples, lambda i: self.register_user(session, f"token.{i}"))
+        tokens = [user["token"] for user in users]
+
+        # Fresh tokens are only verified on first use, so one pass over them is all cold
+        cold = await self.measure(len(tokens), lambda i: self.request(session, "GET", "/auth/verify", token=tokens[i]))
+        warm = await self.measure(len(tokens), lambda i: self.request(session, "GET", "/auth/verify", token=tokens[i]))
+
+        rows = [
+            (mode, latencies.percentile(50) * 1000, latencies.percentile(95) * 1000, 1 / latencies.mean())
+            for mode, latencies in (("cold", cold), ("warm", warm))
+        ]
+        self.print_table(f"Authenticated Request Latency ({len(tokens)} tokens)", ["cache", "p50 ms", "p95 ms", "req/s"], rows)
+        print(f"🔑 warm p50 is x{cold.percentile(50) / max(warm.percentile(50), 1e-9):.2f} faster than cold")
+
+    async def bench_routing(self, session):
+        """Dispatch cost across the route table: cheapest responses of early, late, parameterized and unknown routes"""
+        missing_id = uuid.uuid4()
+        probes = [
+            ("root", "GET", "/", 200),
+            ("verify", "GET", "/auth/verify", 401),
+            ("list", "GET", "/rockets?limit=1", 200),
+            ("rocket :id", "GET", f"/rockets/{missing_id}", 404),
+            ("create", "POST", "/schedules", 401),
+            ("bulk", "POST", "/schedules/bulk", 401),
+            ("schedule :id", "GET", f"/schedules/{missing_id}", 404),
+            ("bad method", "PUT", "/schedules", 405),
+            ("unknown", "GET", "/unknown", 404),
+            ("unknown deep", "GET", "/schedules/a/b/c", 404),
+        ]
+
+        rows = []
+        baseline = None
+        for label, method, endpoint, expected in probes:
+            # Unauthenticated writes stop in the auth middleware, so only routing and middleware are timed
+            make_request = lambda i, m=method, e=endpoint: self.request(session, m, e, data={} if m != "GET" else None)
+            await self.measure(min(20, self.samples), make_request, expected)
+            latencies = await self.measure(self.samples, make_request, expected)
+            p50 = latencies.percentile(50)
+            baseline = baseline or p50
+            rows.append((label, expected, p50 * 1000, latencies.percentile(95) * 1000, (p50 - baseline) * 1_000_000))
+
+        self.print_table("Route Dispatch Latency", ["route", "status", "p50 ms", "p95 ms", "vs root us"], rows)
+        spread = max(row[2] for row in rows) / max(min(row[2] for row in rows), 1e-9)
+        print(f"🧭 slowest/fastest p50 across {len(rows)} routes: x{spread:.2f}")
+
+    async def fill_schedules(self, session, start, count):
+        """Bulk-insert count varied schedules (numbered from start) for the search benchmark"""
+        token = await self.admin_token(session)
+        rng = random.Random(start)
+        launch = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for offset in range(0, count, 10_000):
+            batch = [{
+                **SAMPLE_PAYLOADS["/schedules"],
+                "missionName": f"{rng.choice(SEARCH_WORDS)} {rng.choice(SEARCH_WORDS)} {start + offset + i}",
+                "launchDate": (launch + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "launchSite": rng.choice(SEARCH_SITES),
+                "status": rng.choice(("scheduled", "planned", "success", "delayed")),
+                "rocket": rng.choice(("Falcon 9", "Falcon Heavy", "Starship", "Electron", "Atlas V"))
+            } for i in range(min(10_000, count - offset))]
+            status, _, body, _ = await self.setup_request(session, "POST", "/schedules/bulk", batch, token=token)
+            if status != 201:
+                raise RuntimeError(f"Bulk insert into /schedules failed with HTTP {status}: {body[:200]!r}")
+
+    async def bench_search(self, session):
+        """Search query latency as schedules grow to self.search_records, against downloading and filtering the list"""
+        queries = [
+            ("range 1 day", {"from": "2026-06-01T00:00:00Z", "to": "2026-06-01T23:59:59Z"}),
+            ("range 30 days", {"from": "2026-06-01T00:00:00Z", "to": "2026-06-30T23:59:59Z"}),
+            ("site+status", {"launchSite": SEARCH_SITES[0], "status": "planned"}),
+            ("site+range", {"launchSite": SEARCH_SITES[1], "from": "2026-06-01T00:00:00Z", "to": "2026-07-31T23:59:59Z"}),
+            ("text", {"q": SEARCH_WORDS[0]}),
+            ("text+rocket", {"q": f"{SEARCH_WORDS[1]} {SEARCH_WORDS[2]}", "rocket": "starship"}),
+        ]
+        existing = await self.count_records(session, "/schedules")
+        checkpoints = sorted({existing} | {c for c in (1_000, 10_000, 100_000, self.search_records)
+                                           if existing < c <= self.search_records})
+
+        rows = []
+        for checkpoint in checkpoints:
+            if checkpoint > existing:
+                await self.fill_schedules(session, existing, checkpoint - existing)
+                existing = checkpoint
+            for label, params in queries:
+                endpoint = f"/schedules/search?{urlencode({**params, 'limit': 100})}"
+                _, _, body, _ = await self.request(session, "GET", endpoint)
+                latencies = await self.measure(self.samples, lambda i: self.request(session, "GET", endpoint))
+                rows.append((existing, label, len(json.loads(body)["items"]), latencies.percentile(50) * 1000,
+                             latencies.percentile(95) * 1000))
+
+        # Without the endpoint a client downloads the whole list and filters it itself
+        site = SEARCH_SITES[1]
+        start, end = parse_date("2026-06-01T00:00:00Z"), parse_date("2026-07-31T23:59:59Z")
+
+        async def client_filter(i):
+            status, headers, body, elapsed = await self.request(session, "GET", "/schedules")
+            begin = time.perf_counter()
+            matched = [record for record in json.loads(body)
+                       if record.get("launchSite") == site and start <= parse_date(record["launchDate"]) <= end]
+            return status, headers, matched, elapsed + time.perf_counter() - begin
+
+        baseline = await self.measure(min(10, self.samples), client_filter)
+        rows.append((existing, "client filter", "-", baseline.percentile(50) * 1000, baseline.percentile(95) * 1000))
+
+        self.print_table("Search Latency vs. Schedule Count", ["schedules", "query", "page", "p50 ms", "p95 ms"], rows)
+        indexed = next(row for row in reversed(rows) if row[1] == "site+range")
+        print(f"🔎 site+range at {existing} schedules: x{baseline.percentile(50) * 1000 / max(indexed[3], 1e-9):.0f} "
+              f"faster than downloading and filtering the list")
+
+    async def bench_events(self, session):
+        """Change feed fan-out: POST-to-delivery latency across self.subscribers SSE clients, and server memory per subscriber"""
+        process = None
+        base_url = self.base_url
+        if self.server_cmd:
+            process, base_url, _ = await self.start_server(session)
+        token = await self.admin_token(session, base_url)
+        baseline = process_tree_rss(process.pid) if process else None
+
+        # One insert is in flight per round, so every data line read belongs to the current round
+        round_state = {"arrivals": [], "done": asyncio.Event()}
+        connected = 0
+        all_connected = asyncio.Event()
+        # Subscribers get their own unlimited pool and no read timeout: the streams stay open
+        connector = aiohttp.TCPConnector(limit=0)
+        subscriber_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None))
+
+        async def subscribe():
+            nonlocal connected
+            async with subscriber_session.get(f"{base_url}/events?collections=rockets") as response:
+                if response.status != 200:
+                    raise RuntimeError(f"GET /events failed with HTTP {response.status}")
+                connected += 1
+                if connected == self.subscribers:
+                    all_connected.set()
+                async for line in response.content:
+                    if line.startswith(b"data: "):
+                        arrivals = round_state["arrivals"]
+                        arrivals.append(time.perf_counter())
+                        if len(arrivals) == self.subscribers:
+                            round_state["done"].set()
+
+        readers = [asyncio.create_task(subscribe()) for _ in range(self.subscribers)]
+        try:
+            await asyncio.wait_for(all_connected.wait(), timeout=120)
+            await asyncio.sleep(1)
+            subscribed = process_tree_rss(process.pid) if process else None
+
+            delivery = LatencyHistogram()
+            fan_out = LatencyHistogram()
+            missed = 0
+            rounds = max(5, self.samples // 10)
+            for _ in range(rounds):
+                round_state = {"arrivals": [], "done": asyncio.Event()}
+                sent = time.perf_counter()
+                status, _, _, _ = await self.request(session, "POST", "/rockets", SAMPLE_PAYLOADS["/rockets"],
+                                                     token=token, base_url=base_url)
+                if status != 201:
+                    raise RuntimeError(f"POST /rockets failed with HTTP {status}")
+                try:
+                    await asyncio.wait_for(round_state["done"].wait(), timeout=10)
+                except asyncio.TimeoutError:
+                    pass
+                arrivals = round_state["arrivals"]
+                missed += self.subscribers - len(arrivals)
+                for arrival in arrivals:
+                    delivery.record(arrival - sent)
+                if arrivals:
+                    fan_out.record(max(arrivals) - sent)
+                # Let the event loop settle between rounds so each one starts from idle
+                await asyncio.sleep(0.05)
+        finally:
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await subscriber_session.close()
+            if process:
+                self.stop_server(process)
+
+        rows = [
+            ("delivery", delivery.percentile(50) * 1000, delivery.percentile(95) * 1000, delivery.percentile(99) * 1000),
+            ("all delivered", fan_out.percentile(50) * 1000, fan_out.percentile(95) * 1000, fan_out.percentile(99) * 1000),
+        ]
+        self.print_table(f"Change Feed Fan-out ({self.subscribers} subscribers, {rounds} inserts)",
+                         ["latency", "p50 ms", "p95 ms", "p99 ms"], rows)
+        if baseline and subscribed:
+            print(f"🧠 server RSS {baseline / 2**20:.0f} -> {subscribed / 2**20:.0f} MiB: "
+                  f"{(subscribed - baseline) / self.subscribers / 1024:.1f} KiB per subscriber")
+        else:
+            print("ℹ️  Pass --server-cmd to start the server locally and measure memory per subscriber")
+        if missed:
+            print(f"❌ {missed} deliveries missing after 10s")
+            return False
+
+    async def start_server(self, session, snapshot=None, timeout=120, env=None):
+        """Start a fresh server process (extra environment in env); returns (process, base URL, seconds to first response)"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server_env = os.environ.copy()
+        for name in ("SEED_SNAPSHOT", "DATA_DIR", "WAL_FSYNC", "WEB_CONCURRENCY"):
+            server_env.pop(name, None)
+        server_env.update(env or {})
+        if snapshot:
+            server_env["SEED_SNAPSHOT"] = snapshot
+        command = [part.replace("{port}", str(port)) for part in shlex.split(self.server_cmd)]
+
+        start = time.perf_counter()
+        process = subprocess.Popen(command, env=server_env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base_url = f"http://127.0.0.1:{port}/api"
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode} before responding")
+            try:
+                status, _, _, _ = await self.request(session, "GET", "/", base_url=base_url)
+                if status == 200:
+                    return process, base_url, time.perf_counter() - start
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            await asyncio.sleep(0.01)
+        process.kill()
+        raise RuntimeError(f"Server did not respond within {timeout}s")
+
+    @staticmethod
+    def stop_server(process):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    async def bench_cold_start(self, session):
+        """Time to first response, first list read and first admin login after a server start"""
+        if not self.server_cmd:
+            print("\n⚠️  cold_start needs --server-cmd, e.g. --server-cmd 'npx next start -p {port}'")
+            return
+
+        modes = [("seeded", None)]
+        if self.seed_snapshot:
+            modes.append(("snapshot", self.seed_snapshot))
+
+        rows = []
+        for mode, snapshot in modes:
+            if snapshot and not os.path.exists(snapshot):
+                # The first boot with SEED_SNAPSHOT writes the snapshot for later ones
+                process, _, _ = await self.start_server(session, snapshot)
+                self.stop_server(process)
+
+            first_response = LatencyHistogram()
+            first_read = LatencyHistogram()
+            first_login = LatencyHistogram()
+            credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+            for _ in range(self.startup_runs):
+                process, base_url, elapsed = await self.start_server(session, snapshot)
+                try:
+                    first_response.record(elapsed)
+                    first_read.record((await self.request(session, "GET", "/rockets", base_url=base_url))[3])
+                    first_login.record((await self.request(session, "POST", "/auth/login", credentials, base_url=base_url))[3])
+                finally:
+                    self.stop_server(process)
+            rows.append((mode, first_response.percentile(50) * 1000, first_response.max / 1000,
+                         first_read.percentile(50) * 1000, first_login.percentile(50) * 1000))
+
+        self.print_table(f"Cold Start over {self.startup_runs} Server Starts (ms)",
+                         ["mode", "ready p50", "ready max", "1st GET p50", "1st login p50"], rows)
+
+    async def bench_persistence(self, session):
+        """WAL write throughput per fsync policy, then boot time recovering self.wal_records from the log and from a snapshot"""
+        if not self.server_cmd:
+            print("\n⚠️  persistence needs --server-cmd, e.g. --server-cmd 'npx next start -p {port}'")
+            return
+
+        rows = []
+        for policy in ("always", "batch", "interval", "off"):
+            with tempfile.TemporaryDirectory() as data_dir:
+                process, base_url, _ = await self.start_server(session, env={"DATA_DIR": data_dir, "WAL_FSYNC": policy})
+                try:
+                    status, _, body, _ = await self.setup_request(session, "POST", "/auth/login",
+                                                                  {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}, base_url=base_url)
+                    if status != 200:
+                        raise RuntimeError(f"Admin login failed with HTTP {status}")
+                    token = json.loads(body)["token"]
+                    latencies = LatencyHistogram()
+
+                    async def write(i):
+                        result = await self.request(session, "POST", "/schedules", SAMPLE_PAYLOADS["/schedules"],
+                                                    token=token, base_url=base_url)
+                        latencies.record(result[3])
+                        return result
+
+                    start = time.perf_counter()
+                    results = await self.run_concurrently(self.records, write)
+                    elapsed = time.perf_counter() - start
+                finally:
+                    self.stop_server(process)
+            failed = sum(1 for status, _, _, _ in results if status != 201)
+            rows.append((policy, self.records / elapsed, latencies.percentile(50) * 1000, latencies.percentile(99) * 1000, failed))
+
+        self.print_table(f"WAL Write Throughput ({self.records} POSTs, concurrency {self.concurrency})",
+                         ["fsync", "writes/s", "p50 ms", "p99 ms", "errors"], rows)
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            # First boot seeds the store and snapshots it at lsn 0; the generated log continues from there
+            process, _, _ = await self.start_server(session, env={"DATA_DIR": data_dir})
+            self.stop_server(process)
+            created = datetime(2030, 1, 1)
+            with open(os.path.join(data_dir, f"wal-{1:016d}.log"), "w") as log:
+                for lsn in range(1, self.wal_records + 1):
+                    record = {
+                        "id": f"wal-{lsn}",
+                        **SAMPLE_PAYLOADS["/schedules"],
+                        "createdAt": (created + timedelta(milliseconds=lsn)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+                    }
+                    log.write(json.dumps({"lsn": lsn, "collection": "schedules", "items": [record]}) + "\n")
+
+            rows = []
+            timeout = max(120, self.wal_records / 5_000)
+            process, _, elapsed = await self.start_server(session, env={"DATA_DIR": data_dir}, timeout=timeout)
+            # The long replayed tail is compacted into a snapshot in the background; wait for the old segment to go
+            compacted = time.perf_counter()
+            while os.path.exists(os.path.join(data_dir, f"wal-{1:016d}.log")) and time.perf_counter() - compacted < timeout:
+                await asyncio.sleep(0.1)
+            self.stop_server(process)
+            rows.append(("log replay", self.wal_records, elapsed))
+
+            process, base_url, elapsed = await self.start_server(session, env={"DATA_DIR": data_dir}, timeout=timeout)
+            try:
+                status, _, body, _ = await self.request(session, "GET", "/schedules?limit=1", base_url=base_url)
+                newest = json.loads(body)["items"][0]["id"] if status == 200 else None
+            finally:
+                self.stop_server(process)
+            rows.append(("snapshot", self.wal_records, elapsed))
+
+        self.print_table("Recovery Time (s to first response)", ["source", "records", "seconds"], rows)
+        if newest != f"wal-{self.wal_records}":
+            print(f"❌ Recovered store is missing the last logged record (newest is {newest})")
+            return False
+        print(f"✅ All {self.wal_records} logged records recovered")
+        return True
+
+    async def bench_scaling(self, session):
+        """Throughput at 1, 2, 4 and one-per-core workers, and that users registered on one worker log in on all of them"""
+        if not self.server_cmd:
+            print("\n⚠️  scaling needs a cluster --server-cmd, e.g. --server-cmd 'node server.js -p {port}'")
+            return
+
+        cores = os.cpu_count() or 1
+        rows = []
+        ok = True
+        # Whether some run had logins served by a worker other than the one that registered the user
+        cross_checked = False
+        for workers in sorted({1, 2, 4, cores}):
+            process, base_url, _ = await self.start_server(session, env={"WEB_CONCURRENCY": str(workers)})
+            try:
+                user = await self.register_user(session, f"scaling.{workers}", base_url)
+                # Let every worker load the API and sync before measuring
+                await self.run_concurrently(workers * 4, lambda i: self.request(session, "GET", "/rockets", base_url=base_url))
+
+                served = set()
+                latencies = LatencyHistogram()
+                requests_total = self.samples * 20
+
+                async def read(i):
+                    if i % 2:
+                        result = await self.request(session, "GET", "/auth/verify", token=user["token"], base_url=base_url)
+                    else:
+                        result = await self.request(session, "GET", "/rockets", base_url=base_url)
+                    served.add(result[1].get("X-Worker-Id"))
+                    latencies.record(result[3])
+                    return result
+
+                start = time.perf_counter()
+                results = await self.run_concurrently(requests_total, read)
+                elapsed = time.perf_counter() - start
+                errors = sum(1 for status, _, _, _ in results if status != 200)
+
+                # Fresh connections are spread over the workers by the cluster primary
+                probe = await self.register_user(session, f"scaling.probe.{workers}", base_url)
+                credentials = {"email": probe["email"], "password": probe["password"]}
+                login_workers = set()
+                failed_logins = 0
+                cross_logins = 0
+                async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True)) as fresh:
+                    for _ in range(workers * 4):
+                        status, headers, _, _ = await self.request(fresh, "POST", "/auth/login", credentials, base_url=base_url)
+                        worker = headers.get("X-Worker-Id")
+                        login_workers.add(worker)
+                        if status != 200:
+                            failed_logins += 1
+                        elif worker is not None and probe["worker"] is not None and worker != probe["worker"]:
+                            cross_logins += 1
+            finally:
+                self.stop_server(process)
+
+            served.discard(None)
+            login_workers.discard(None)
+            rows.append((workers, requests_total / elapsed, latencies.percentile(50) * 1000, latencies.percentile(99) * 1000,
+                         errors, len(served), f"{len(login_workers)}/{cross_logins}/{failed_logins}"))
+            if errors or failed_logins:
+                ok = False
+            if len(login_workers) > 1 and cross_logins > 0:
+                cross_checked = True
+
+        self.print_table(f"Throughput by Worker Count ({self.samples * 20} requests, concurrency {self.concurrency})",
+                         ["workers", "req/s", "p50 ms", "p99 ms", "errors", "served by", "login w/x/f"], rows)
+        if rows and rows[0][1]:
+            print(f"📈 x{rows[-1][1] / rows[0][1]:.2f} throughput from 1 to {rows[-1][0]} workers ({cores} cores)")
+        print("   login w/x/f: workers that served the probe logins / logins on another worker than the registration / failures")
+        if not ok:
+            print("❌ Requests failed or a user registered on one worker could not log in on another")
+        elif not cross_checked:
+            print("⚠️  Cross-worker login check skipped: no login was served by a worker other than the one that "
+                  "registered the user (single process, or X-Worker-Id missing)")
+        else:
+            print("✅ Users registered on one worker logged in through other workers")
+        return ok
+
+    async def bench_streaming(self, session):
+        """GET /schedules buffered JSON vs. streamed NDJSON: TTFB, total time and peak server RSS"""
+        endpoint = "/schedules"
+        process = None
+        base_url = self.base_url
+        if self.server_cmd:
+            process, base_url, _ = await self.start_server(session)
+        try:
+            existing = await self.count_records(session, endpoint, base_url)
+            if existing < self.records:
+                await self.fill_collection(session, endpoint, self.records - existing, base_url)
+            expected = max(existing, self.records)
+
+            async def read(accept):
+                ttfb = None
+                records = 0
+                start = time.perf_counter()
+                async with session.get(f"{base_url}{endpoint}", headers={"Accept": accept}) as response:
+                    if response.status != 200:
+                        raise RuntimeError(f"GET {endpoint} failed with HTTP {response.status}")
+                    if accept == "application/x-ndjson":
+                        # Consume chunks as they arrive; every complete line is one record
+                        async for chunk in response.content.iter_any():
+                            if ttfb is None:
+                                ttfb = time.perf_counter() - start
+                            records += chunk.count(b"\n")
+                    else:
+                        first = await response.content.readany()
+                        ttfb = time.perf_counter() - start
+                        records = len(json.loads(first + await response.read()))
+                return ttfb, time.perf_counter() - start, records
+
+            rows = []
+            # Sequential reads: concurrent ones would mostly measure the client's own parsing
+            reads = max(4, self.samples // 10)
+            for mode, accept in (("buffered", "application/json"), ("ndjson", "application/x-ndjson")):
+                baseline = process_tree_rss(process.pid) if process else None
+                peak = baseline
+                done = asyncio.Event()
+
+                async def sample_rss():
+                    nonlocal peak
+                    while not done.is_set():
+                        peak = max(peak, process_tree_rss(process.pid) or 0)
+                        await asyncio.sleep(0.005)
+
+                sampler = asyncio.create_task(sample_rss()) if baseline else None
+                results = [await read(accept) for _ in range(reads)]
+                done.set()
+                if sampler:
+                    await sampler
+
+                if any(records != expected for _, _, records in results):
+                    raise RuntimeError(f"{mode} read returned {results[0][2]} records, expected {expected}")
+                ttfb, total = LatencyHistogram(), LatencyHistogram()
+                for first_byte, elapsed, _ in results:
+                    ttfb.record(first_byte)
+                    total.record(elapsed)
+                rss = f"{peak / 2**20:.0f} (+{(peak - baseline) / 2**20:.0f})" if baseline else "n/a"
+                rows.append((mode, ttfb.percentile(50) * 1000, ttfb.percentile(95) * 1000, total.percentile(50) * 1000, rss))
+        finally:
+            if process:
+                self.stop_server(process)
+
+        self.print_table(f"GET {endpoint} with {expected} Records ({reads} reads each)",
+                         ["mode", "TTFB p50 ms", "TTFB p95 ms", "total p50 ms", "peak RSS MiB"], rows)
+        if not process:
+            print("ℹ️  Pass --server-cmd to start the server locally and sample its RSS")
+
+    async def bench_login_contention(self, session):
+        """GET /rockets p99 alone vs. while a flood of concurrent logins is in flight"""
+        credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+        baseline = await self.measure(self.samples, lambda i: self.request(session, "GET", "/rockets"))
+
+        stop = asyncio.Event()
+        logins = LatencyHistogram()
+        rejected = 0
+
+        async def login_loop():
+            nonlocal rejected
+            while not stop.is_set():
+                status, _, _, elapsed = await self.request(session, "POST", "/auth/login", credentials)
+                if status == 200:
+                    logins.record(elapsed)
+                else:
+                    rejected += 1
+
+        flood = [asyncio.create_task(login_loop()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.sleep(0.5)  # let the login backlog build up
+            # Reads get their own connection pool so they don't queue behind logins client-side
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120)) as read_session:
+                contended = await self.measure(self.samples, lambda i: self.request(read_session, "GET", "/rockets"))
+        finally:
+            stop.set()
+            await asyncio.gather(*flood, return_exceptions=True)
+
+        rows = [
+            ("idle", baseline.percentile(50) * 1000, baseline.percentile(99) * 1000, "-"),
+            (f"{self.concurrency} logins", contended.percentile(50) * 1000, contended.percentile(99) * 1000,
+             f"{logins.percentile(50) * 1000:.0f}")
+        ]
+        self.print_table("GET /rockets Latency During a Login Burst (ms)", ["reads", "p50", "p99", "login p50"], rows)
+        print(f"🔐 {logins.count} logins completed, {rejected} rejected (503 when the hashing queue is full)")
+
+        slowdown = contended.percentile(99) / max(baseline.percentile(99), 1e-6)
+        if slowdown > self.max_slowdown:
+            print(f"❌ Read p99 grew x{slowdown:.1f} under login load (limit x{self.max_slowdown:.1f})")
+            return False
+        print(f"✅ Read p99 stayed within x{self.max_slowdown:.1f} of idle (x{slowdown:.1f})")
+        return True
+
+    async def run(self, names):
+        """Run the named benchmarks; False if any of them reported a failed check"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=120)
+        ok = True
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            for name in names:
+                if await getattr(self, f"bench_{name}")(session) is False:
+                    ok = False
+        return ok
+
+
+# Routes timed by the regression gate, keyed by a stable label in the baseline;
+# {rocket_id} is an existing rocket and auth routes use the admin token
+GATE_ROUTES = (
+    ("GET /", "/", False),
+    ("GET /rockets", "/rockets", False),
+    ("GET /rockets?limit=50", "/rockets?limit=50", False),
+    ("GET /rockets/:id", "/rockets/{rocket_id}", False),
+    ("GET /missions", "/missions", False),
+    ("GET /schedules?limit=100", "/schedules?limit=100", False),
+    ("GET /schedules/search", "/schedules/search?from=2026-01-01&to=2026-12-31&limit=50", False),
+    ("GET /dashboard?limit=50", "/dashboard?limit=50", False),
+    ("GET /auth/verify", "/auth/verify", True),
+)
+
+
+def quantile_interval(histogram, q, z=1.96):
+    """(estimate, low, high) seconds for quantile q, with a distribution-free ~95% confidence
+    interval from the order statistics around rank n*q (normal approximation to the binomial)"""
+    n = histogram.count
+    half = z * math.sqrt(n * q * (1 - q))
+    low_rank = max(1, math.floor(n * q - half))
+    high_rank = min(n, math.ceil(n * q + half))
+    return histogram.percentile(q * 100), histogram.percentile(low_rank / n * 100), histogram.percentile(high_rank / n * 100)
+
+
+class RegressionGate:
+    """Benchmark suite mode: warm up, time GATE_ROUTES over repeated iterations and fail on
+    routes whose median or p95 regressed past max_regression against a stored baseline"""
+
+    def __init__(self, benchmarks, baseline_path, history_path=None, iterations=5, warmup=20, max_regression=0.10,
+                 update_baseline=False, release=None):
+        self.benchmarks = benchmarks
+        self.baseline_path = baseline_path
+        self.history_path = history_path
+        self.iterations = iterations
+        self.warmup = warmup
+        self.max_regression = max_regression
+        self.update_baseline = update_baseline
+        self.release = release
+
+    async def measure_routes(self, session):
+        """Per label, the merged histogram of all iterations and each iteration's median"""
+        bench = self.benchmarks
+        token = await bench.admin_token(session)
+        status, _, body, _ = await bench.request(session, "GET", "/rockets?limit=1")
+        if status != 200 or not json.loads(body)["items"]:
+            raise RuntimeError("The gate needs at least one rocket to time GET /rockets/:id")
+        rocket_id = json.loads(body)["items"][0]["id"]
+        routes = [(label, endpoint.format(rocket_id=rocket_id), token if auth else None) for label, endpoint, auth in GATE_ROUTES]
+
+        for label, endpoint, auth_token in routes:
+            await bench.measure(self.warmup, lambda i, e=endpoint, t=auth_token: bench.request(session, "GET", e, token=t))
+
+        # Iterations visit every route in turn, so slow drift on the host spreads across all routes
+        results = {label: (LatencyHistogram(), []) for label, _, _ in routes}
+        for _ in range(self.iterations):
+            for label, endpoint, auth_token in routes:
+                histogram = await bench.measure(bench.samples, lambda i, e=endpoint, t=auth_token: bench.request(session, "GET", e, token=t))
+                results[label][0].merge(histogram)
+                results[label][1].append(histogram.percentile(50))
+        return results
+
+    @staticmethod
+    def summarize(histogram, iteration_medians):
+        median, median_low, median_high = quantile_interval(histogram, 0.5)
+        p95, p95_low, p95_high = quantile_interval(histogram, 0.95)
+        ms = lambda seconds: round(seconds * 1000, 3)
+        return {
+            "count": histogram.count,
+            "median_ms": ms(median),
+            "median_ci_ms": [ms(median_low), ms(median_high)],
+            "p95_ms": ms(p95),
+            "p95_ci_ms": [ms(p95_low), ms(p95_high)],
+            "iteration_medians_ms": [ms(value) for value in iteration_medians]
+        }
+
+    def compare(self, current, baseline):
+        """Verdict per label: a regression needs non-overlapping confidence intervals and a change past max_regression"""
+        verdicts = {}
+        for label, stats in current.items():
+            base = baseline["routes"].get(label) if baseline else None
+            if base is None:
+                verdicts[label] = "new"
+                continue
+            verdict = "ok"
+            for metric in ("median", "p95"):
+                change = stats[f"{metric}_ms"] / max(base[f"{metric}_ms"], 1e-9) - 1
+                if stats[f"{metric}_ci_ms"][0] > base[f"{metric}_ci_ms"][1] and change > self.max_regression:
+                    verdict = f"{metric} regressed"
+                    break
+                if stats[f"{metric}_ci_ms"][1] < base[f"{metric}_ci_ms"][0] and change < -self.max_regression and verdict == "ok":
+                    verdict = "faster"
+            verdicts[label] = verdict
+        return verdicts
+
+    def print_report(self, current, baseline, verdicts):
+        print(f"\n=== Regression Gate ({self.iterations} x {self.benchmarks.samples} samples per route, "
+              f"threshold +{self.max_regression * 100:.0f}%) ===")
+        print(f"{'Route':<26}{'base p50':>10}{'p50 [95% CI]':>22}{'change':>9}{'base p95':>10}{'p95':>9}{'change':>9}  verdict")
+        for label, stats in current.items():
+            base = baseline["routes"].get(label) if baseline else None
+            low, high = stats["median_ci_ms"]
+            interval = f"{stats['median_ms']:.2f} [{low:.2f}-{high:.2f}]"
+            if base:
+                median_change = f"{(stats['median_ms'] / max(base['median_ms'], 1e-9) - 1) * 100:+.1f}%"
+                p95_change = f"{(stats['p95_ms'] / max(base['p95_ms'], 1e-9) - 1) * 100:+.1f}%"
+                print(f"{label:<26}{base['median_ms']:>10.2f}{interval:>22}{median_change:>9}"
+                      f"{base['p95_ms']:>10.2f}{stats['p95_ms']:>9.2f}{p95_change:>9}  {verdicts[label]}")
+            else:
+                print(f"{label:<26}{'-':>10}{interval:>22}{'-':>9}{'-':>10}{stats['p95_ms']:>9.2f}{'-':>9}  {verdicts[label]}")
+
+    async def run(self):
+        bench = self.benchmarks
+        connector = aiohttp.TCPConnector(limit=bench.concurrency, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=120)) as session:
+            measured = await self.measure_routes(session)
+        current = {label: self.summarize(histogram, medians) for label, (histogram, medians) in measured.items()}
+
+        baseline = None
+        if os.path.exists(self.baseline_path) and not self.update_baseline:
+            with open(self.baseline_path) as f:
+                baseline = json.load(f)
+        verdicts = self.compare(current, baseline)
+        self.print_report(current, baseline, verdicts)
+        regressions = [label for label, verdict in verdicts.items() if verdict.endswith("regressed")]
+
+        if self.history_path:
+            with open(self.history_path, "a") as f:
+                f.write(json.dumps({
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "release": self.release,
+                    "base_url": bench.base_url,
+                    "iterations": self.iterations,
+                    "samples": bench.samples,
+                    "max_regression": self.max_regression,
+                    "compared_to": baseline.get("created_at") if baseline else None,
+                    "passed": not regressions,
+                    "regressions": regressions,
+                    "routes": current
+                }) + "\n")
+            print(f"📈 Appended this run to {self.history_path}")
+
+        if baseline is None:
+            with open(self.baseline_path, "w") as f:
+                json.dump({
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "release": self.release,
+                    "base_url": bench.base_url,
+                    "iterations": self.iterations,
+                    "samples": bench.samples,
+                    "routes": current
+                }, f, indent=2)
+            print(f"📌 Saved this run as the baseline in {self.baseline_path}")
+            return True
+        if regressions:
+            print(f"❌ {len(regressions)} route(s) regressed past +{self.max_regression * 100:.0f}%: {', '.join(regressions)}")
+            return False
+        print(f"✅ No route regressed against the baseline from {baseline.get('created_at')}")
+        return True
+
+
+class TrafficReplay:
+    """Re-issues a traffic capture (CAPTURE_FILE, see lib/capture.js) against base_url at the captured pace,
+    `speed` times faster, or flat-out with speed 0, and reports how latencies diverge from the capture"""
+
+    REPLAY_PASSWORD = "ReplayPass123!"
+
+    def __init__(self, base_url, paths, speed=1.0, workers=50):
+        self.base_url = base_url
+        self.speed = speed
+        self.workers = workers
+        self.entries, self.skipped = self.load(paths)
+        self.run_id = int(time.time())
+        self.registrations = 0
+        self.tokens = {}
+        self.token_lock = asyncio.Lock()
+        self.user = None
+        self.ids = {}
+        self.id_cursor = 0
+        self.results = []
+        self.errors = 0
+        self.slip = LatencyHistogram()
+
+    @staticmethod
+    def load(paths):
+        """Entries from every capture file (globs allowed), merged by wall-clock time with `at` seconds from the first"""
+        files = sorted({path for pattern in paths for path in glob.glob(pattern)})
+        if not files:
+            raise RuntimeError(f"No capture files match {', '.join(paths)}")
+        entries, skipped = [], 0
+        for path in files:
+            start = None
+            with open(path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "format" in entry:
+                        start = parse_date(entry["startedAt"]).timestamp()
+                    elif start is None:
+                        raise RuntimeError(f"{path} does not start with a capture header")
+                    elif "bodyBytes" in entry:
+                        # The body was too large or streamed to capture, so the request can't be rebuilt
+                        skipped += 1
+                    else:
+                        entries.append({**entry, "at": start + entry["t"] / 1000})
+        entries.sort(key=lambda entry: entry["at"])
+        first = entries[0]["at"] if entries else 0
+        for entry in entries:
+            entry["at"] -= first
+        return entries, skipped
+
+    async def request(self, session, method, path, body=None, token=None, content_type=None, extra_headers=None):
+        headers = HEADERS.copy()
+        headers.update(extra_headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        kwargs = {"json": body}
+        if isinstance(body, str):
+            headers["Content-Type"] = content_type or "application/json"
+            kwargs = {"data": body.encode()}
+        start = time.perf_counter()
+        async with session.request(method, f"{self.base_url}{path}", headers=headers, **kwargs) as response:
+            # A change feed subscription never ends; its headers mark the request as served
+            payload = b"" if response.content_type == "text/event-stream" else await response.read()
+        return response.status, payload, time.perf_counter() - start
+
+    async def mint(self, session, role):
+        """Fresh token for a captured role; replayed users share one registered account"""
+        if role == "admin":
+            credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+        elif role == "user":
+            if self.user is None:
+                self.user = {"name": "Replay User", "email": f"replay.{self.run_id}@astrolaunch.com", "password": self.REPLAY_PASSWORD}
+                status, _, _ = await self.request(session, "POST", "/auth/register", self.user)
+                if status != 200:
+                    raise RuntimeError(f"Replay user registration failed with HTTP {status}")
+            credentials = {"email": self.user["email"], "password": self.user["password"]}
+        else:
+            return "invalid.replay.token"
+        status, payload, _ = await self.request(session, "POST", "/auth/login", credentials)
+        if status != 200:
+            raise RuntimeError(f"Logging in as the replay {role} failed with HTTP {status}")
+        return json.loads(payload)["token"]
+
+    async def prepare(self, session):
+        for role in sorted({entry["role"] for entry in self.entries if entry.get("role")}):
+            self.tokens[role] = await self.mint(session, role)
+        # Captured ids don't exist on the target, so found records are swapped for ids that do
+        for name in sorted({entry["route"].split("/")[1] for entry in self.entries if entry.get("route", "").endswith("/:id")}):
+            status, payload, _ = await self.request(session, "GET", f"/{name}?limit=100")
+            self.ids[name] = [item["id"] for item in json.loads(payload)["items"]] if status == 200 else []
+
+    def rewrite(self, entry):
+        """(path, body) to send for a captured request"""
+        path, body = entry["path"], entry.get("body")
+        route = entry.get("route", "")
+        if route.endswith("/:id") and entry["status"] == 200:
+            ids = self.ids.get(route.split("/")[1])
+            if ids:
+                self.id_cursor += 1
+                path = "/".join(path.split("/")[:-1] + [ids[self.id_cursor % len(ids)]])
+        if route == "/auth/register" and isinstance(body, dict):
+            body = {**body, "password": self.REPLAY_PASSWORD}
+            if entry["status"] == 200:
+                # A successful registration needs an unused email; failed ones keep theirs to fail the same way
+                self.registrations += 1
+                body["email"] = f"replay.{self.run_id}.{self.registrations}@astrolaunch.com"
+        elif route == "/auth/login" and isinstance(body, dict):
+            if entry["status"] != 200:
+                body = {**body, "password": f"wrong-{self.REPLAY_PASSWORD}"}
+            elif body.get("email") == ADMIN_EMAIL:
+                body = {**body, "password": ADMIN_PASSWORD}
+            else:
+                body = {**body, "email": self.user["email"] if self.user else ADMIN_EMAIL,
+                        "password": self.user["password"] if self.user else ADMIN_PASSWORD}
+        return path, body
+
+    async def issue(self, session, entry, semaphore):
+        try:
+            path, body = self.rewrite(entry)
+            role = entry.get("role")
+            send = lambda token: self.request(session, entry["method"], path, body, token, entry.get("contentType"), entry.get("headers"))
+            status, _, elapsed = await send(self.tokens.get(role))
+            if status == 401 and role in ("admin", "user") and entry["status"] != 401:
+                # Tokens minted before the replay may have been invalidated (e.g. a server restart): re-mint once
+                async with self.token_lock:
+                    self.tokens[role] = await self.mint(session, role)
+                status, _, elapsed = await send(self.tokens[role])
+            self.results.append((entry, status, elapsed))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.errors += 1
+        finally:
+            semaphore.release()
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.workers, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=120)) as session:
+            await self.prepare(session)
+            before = await self.scrape_metrics(session)
+            semaphore = asyncio.Semaphore(self.workers)
+            tasks = []
+            start = time.perf_counter()
+            for entry in self.entries:
+                due = start + entry["at"] / self.speed if self.speed > 0 else None
+                if due is not None and due > time.perf_counter():
+                    await asyncio.sleep(due - time.perf_counter())
+                await semaphore.acquire()
+                if due is not None:
+                    # How far behind the captured schedule this request went out
+                    self.slip.record(max(0.0, time.perf_counter() - due))
+                tasks.append(asyncio.create_task(self.issue(session, entry, semaphore)))
+            await asyncio.gather(*tasks)
+            self.elapsed = time.perf_counter() - start
+            after = await self.scrape_metrics(session) if before else None
+        self.server = MetricsWindow(before[0], after[0], after[1]) if before and after else None
+
+    async def scrape_metrics(self, session):
+        try:
+            async with session.get(f"{self.base_url}/metrics?format=json", headers={"Accept": "application/json"}) as response:
+                if response.status != 200:
+                    return None
+                return await response.json(), response.headers.get("X-Worker-Id")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    def report(self):
+        """Per captured route: captured vs. replayed latency and status mismatches; returns False on transport errors"""
+        span = self.entries[-1]["at"] if self.entries else 0.0
+        pace = f"{self.speed:g}x" if self.speed > 0 else "flat-out"
+        print("\n" + "=" * 80)
+        print(f"🔁 REPLAY: {len(self.results)} requests from a {span:.1f}s capture in {self.elapsed:.1f}s ({pace}, {self.workers} workers)")
+        if self.skipped:
+            print(f"   Skipped {self.skipped} request(s) whose bodies were not captured (too large or streamed)")
+        if self.slip.count:
+            print(f"   Schedule slip p50/p99/max: {self.slip.percentile(50) * 1000:.1f}/{self.slip.percentile(99) * 1000:.1f}"
+                  f"/{self.slip.max / 1000:.1f} ms")
+
+        routes = {}
+        for entry, status, elapsed in self.results:
+            key = (entry["method"], entry.get("route") or entry["path"].split("?")[0])
+            route = routes.setdefault(key, {"captured": LatencyHistogram(), "replayed": LatencyHistogram(), "mismatched": 0})
+            route["captured"].record(entry["ms"] / 1000)
+            route["replayed"].record(elapsed)
+            route["mismatched"] += status != entry["status"]
+
+        print("   Captured times are server-side; replayed p50/p95 are client-side, and 'srv change' compares server means")
+        print(f"   {'Route':<30}{'Count':>6}{'cap p50':>9}{'cap p95':>9}{'rep p50':>9}{'rep p95':>9}{'srv change':>11}{'status!=':>9}")
+        for (method, pattern), route in sorted(routes.items(), key=lambda item: (item[0][1], item[0][0])):
+            captured, replayed = route["captured"], route["replayed"]
+            window = self.server.routes.get((method, pattern)) if self.server else None
+            change = f"{(window['sum'] / window['count'] / max(captured.mean(), 1e-9) - 1) * 100:+.0f}%" if window else "-"
+            print(f"   {f'{method} {pattern}':<30}{captured.count:>6}{captured.percentile(50) * 1000:>9.2f}"
+                  f"{captured.percentile(95) * 1000:>9.2f}{replayed.percentile(50) * 1000:>9.2f}"
+                  f"{replayed.percentile(95) * 1000:>9.2f}{change:>11}{route['mismatched']:>9}")
+        if not self.server:
+            print("   ℹ️  GET /metrics unavailable on the target; no server-side comparison")
+        if self.errors:
+            print(f"❌ {self.errors} request(s) failed to complete")
+        return self.errors == 0
+
+
+def parse_benchmarks(value):
+    """Parse a comma-separated benchmark list, or 'all'"""
+    available = BackendBenchmarks.available()
+    if value == "all":
+        return available
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    for name in names:
+        if name not in available:
+            raise argparse.ArgumentTypeError(f"Unknown benchmark: {name} (choose from {', '.join(available)})")
+    return names
+
+
+def run_benchmarks(args, base_url=BASE_URL):
+    """Run the selected server-side benchmarks"""
+    if aiohttp is None:
+        print("❌ --bench mode requires aiohttp (pip install aiohttp)")
+        return False
+
+    print("🚀 Starting Backend Benchmarks for Rocket Company Website")
+    print(f"Testing against: {base_url}")
+    benchmarks = BackendBenchmarks(
+        base_url=base_url,
+        concurrency=args.concurrency,
+        samples=args.samples,
+        users=args.bench_users,
+        records=args.bench_records,
+        server_cmd=args.server_cmd,
+        startup_runs=args.startup_runs,
+        seed_snapshot=args.seed_snapshot,
+        max_slowdown=args.max_slowdown,
+        wal_records=args.wal_records,
+        search_records=args.search_records,
+        subscribers=args.subscribers
+    )
+    try:
+        return asyncio.run(benchmarks.run(args.bench))
+    except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"\n❌ Benchmark aborted: {e}")
+        return False
+
+
+def run_gate(args, base_url=BASE_URL):
+    """Run the benchmark regression gate against base_url"""
+    if aiohttp is None:
+        print("❌ --gate mode requires aiohttp (pip install aiohttp)")
+        return False
+
+    print("🚀 Starting Benchmark Regression Gate for Rocket Company Website")
+    print(f"Testing against: {base_url}")
+    benchmarks = BackendBenchmarks(base_url=base_url, concurrency=args.concurrency, samples=args.samples)
+    gate = RegressionGate(
+        benchmarks,
+        baseline_path=args.baseline,
+        history_path=args.history,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        max_regression=args.max_regression,
+        update_baseline=args.update_baseline,
+        release=args.release
+    )
+    try:
+        return asyncio.run(gate.run())
+    except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"\n❌ Regression gate aborted: {e}")
+        return False
+
+
+def run_replay(args, base_url=BASE_URL):
+    """Replay captured traffic against base_url"""
+    if aiohttp is None:
+        print("❌ --replay mode requires aiohttp (pip install aiohttp)")
+        return False
+
+    print("🚀 Replaying captured traffic for Rocket Company Website")
+    print(f"Testing against: {base_url}")
+    try:
+        replay = TrafficReplay(base_url, args.replay, speed=args.speed, workers=args.concurrency)
+        asyncio.run(replay.run())
+    except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"\n❌ Replay aborted: {e}")
+        return False
+    return replay.report()
+
+
+def parse_mix(value):
+    """Parse a scenario mix such as 'browse=8,login=1'"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in LoadTester.DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {name}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for {name}: {weight}")
+    return mix
+
+
+def parse_multipliers(value):
+    """Parse load multipliers such as '1,2,3,5'"""
+    try:
+        multipliers = [float(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid multipliers: {value}")
+    if not multipliers or any(multiplier <= 0 for multiplier in multipliers):
+        raise argparse.ArgumentTypeError(f"Invalid multipliers: {value}")
+    return sorted(multipliers)
+
+
+def run_load_test(args, base_url=BASE_URL):
+    """Run the asyncio load generator and report whether the error rate stayed acceptable"""
+    if aiohttp is None:
+        print("❌ --load mode requires aiohttp (pip install aiohttp)")
+        return False
+
+    print("🚀 Starting Load Test for Rocket Company Website")
+    print(f"Testing against: {base_url}")
+    load_tester = LoadTester(
+        base_url=base_url,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        rps=args.rps,
+        mix=args.mix,
+        pool_users=args.pool_users,
+        slo=args.slo_ms / 1000
+    )
+    if args.overload:
+        phases = asyncio.run(load_tester.run_overload(args.overload, capacity=args.capacity))
+        return load_tester.report_overload(phases, args.min_goodput)
+
+    asyncio.run(load_tester.run())
+    error_rate = load_tester.report()
+
+    if error_rate <= args.max_error_rate:
+        print(f"\n🎉 Error rate {error_rate * 100:.2f}% within limit of {args.max_error_rate * 100:.2f}%")
+        return True
+    print(f"\n⚠️  Error rate {error_rate * 100:.2f}% exceeds limit of {args.max_error_rate * 100:.2f}%")
+    return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AstroLaunch backend API tests")
+    parser.add_argument("--base-url", default=BASE_URL, help="API base URL (default: $ASTROLAUNCH_BASE_URL or the preview host)")
+    parser.add_argument("--local", action="store_true", help="start the stand-in API (tests/fake_api.py) in a child process and test against it")
+    parser.add_argument("--pool-size", type=int, default=10, help="HTTP connection pool size for the functional suite (default: 10)")
+    parser.add_argument("--retries", type=int, default=3, help="retries for connection errors and 502/503/504 responses (default: 3)")
+    parser.add_argument("--backoff", type=float, default=0.5, help="exponential backoff factor between retries in seconds (default: 0.5)")
+    parser.add_argument("--no-keep-alive", dest="keep_alive", action="store_false", help="close the connection after every request")
+    parser.add_argument("--workers", type=int, default=4, help="tests run in parallel where dependencies allow (default: 4, 1 = sequential)")
+    parser.add_argument("--rate-limit", type=float, default=None, metavar="RPS", help="cap functional-suite requests per second")
+    parser.add_argument("--bulk-items", type=int, default=50_000, help="schedules in the generated bulk-import manifest (default: 50000)")
+    parser.add_argument("--page-loads", type=int, default=10, help="home page loads timed per mode by the dashboard test (default: 10)")
+    parser.add_argument("--export", default="backend_test_results", metavar="PREFIX",
+                        help="write results and per-route timings to PREFIX.json and PREFIX.csv (default: backend_test_results)")
+    parser.add_argument("--no-export", dest="export", action="store_const", const=None, help="skip writing the JSON/CSV report")
+    parser.add_argument("--load", action="store_true", help="run the concurrent load generator instead of the functional suite")
+    parser.add_argument("--bench", type=parse_benchmarks, default=None, metavar="NAMES",
+                        help=f"run benchmarks instead of the functional suite: all or a comma list of {', '.join(BackendBenchmarks.available())}")
+    parser.add_argument("--samples", type=int, default=200, help="timed requests per benchmark measurement or gate iteration (default: 200)")
+    parser.add_argument("--replay", type=lambda value: [path.strip() for path in value.split(",") if path.strip()], default=None,
+                        metavar="FILES", help="replay traffic captured with CAPTURE_FILE (comma list, globs allowed) instead of the functional suite")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay pace: 1 = as captured, N = N times faster, 0 = flat-out (default: 1)")
+    parser.add_argument("--gate", action="store_true",
+                        help="run the benchmark regression gate: fail when a route's median or p95 regressed against --baseline")
+    parser.add_argument("--baseline", default="bench_baseline.json", metavar="PATH",
+                        help="gate baseline, written by the first run or with --update-baseline (default: bench_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="save this gate run as the new baseline instead of comparing")
+    parser.add_argument("--history", default="bench_history.jsonl", metavar="PATH",
+                        help="file every gate run is appended to as one JSON line, '' to skip (default: bench_history.jsonl)")
+    parser.add_argument("--iterations", type=int, default=5, help="timed iterations per route in the gate (default: 5)")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests per route before the gate's iterations (default: 20)")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="relative median/p95 growth that fails the gate when also statistically significant (default: 0.10)")
+    parser.add_argument("--release", default=None, metavar="LABEL", help="label stored with the gate run in the history and baseline")
+    parser.add_argument("--bench-users", type=int, default=100_000, help="users registered by the user_lookup benchmark (default: 100000)")
+    parser.add_argument("--bench-records", type=int, default=20_000, help="records per collection for the collection_read benchmark (default: 20000)")
+    parser.add_argument("--server-cmd", default=None, metavar="CMD",
+                        help="command run from the repository root that starts a server on {port}, used by cold_start and other "
+                             "benchmarks (default with --local: the stand-in API)")
+    parser.add_argument("--startup-runs", type=int, default=5, help="server starts measured by the cold_start benchmark (default: 5)")
+    parser.add_argument("--seed-snapshot", default=None, metavar="PATH",
+                        help="also measure cold starts with SEED_SNAPSHOT=PATH (written by the first start if missing)")
+    parser.add_argument("--wal-records", type=int, default=1_000_000,
+                        help="records in the generated write-ahead log for the persistence recovery benchmark (default: 1000000)")
+    parser.add_argument("--search-records", type=int, default=100_000,
+                        help="schedules the search benchmark grows the collection to (default: 100000)")
+    parser.add_argument("--subscribers", type=int, default=500,
+                        help="concurrent change feed subscribers opened by the events benchmark (default: 500)")
+    parser.add_argument("--max-slowdown", type=float, default=3.0,
+                        help="largest allowed read p99 growth under login load in login_contention (default: 3.0)")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent virtual users, or benchmark setup requests (default: 50)")
+    parser.add_argument("--duration", type=float, default=30, help="length of the timed load run in seconds (default: 30)")
+    parser.add_argument("--rps", type=float, default=None, help="target requests per second across all virtual users")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="scenario weights, e.g. browse=8,login=1,register=1")
+    parser.add_argument("--pool-users", type=int, default=20, help="users registered up front for login/verify scenarios")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="error rate above which the load run fails (default: 0.01)")
+    parser.add_argument("--overload", type=parse_multipliers, default=None, metavar="MULTIPLIERS",
+                        help="load mode: offer open-loop load at these multiples of capacity, e.g. 1,2,3,5, and check goodput holds")
+    parser.add_argument("--capacity", type=float, default=None,
+                        help="capacity in scenarios/s for --overload (default: calibrated with --concurrency virtual users)")
+    parser.add_argument("--slo-ms", type=float, default=1000, help="responses slower than this don't count as goodput (default: 1000)")
+    parser.add_argument("--min-goodput", type=float, default=0.8,
+                        help="share of the 1x goodput every overloaded phase must keep (default: 0.8)")
+    return parser.parse_args(argv)
+
+def run(args, base_url):
+    """Run the functional suite, the load test, the benchmarks, the regression gate or a replay against base_url"""
+    if args.load or args.overload:
+        return run_load_test(args, base_url)
+    if args.bench:
+        return run_benchmarks(args, base_url)
+    if args.gate:
+        return run_gate(args, base_url)
+    if args.replay:
+        return run_replay(args, base_url)
+    
+    tester = BackendTester(
+        base_url=base_url,
+        pool_size=args.pool_size,
+        retries=args.retries,
+        backoff=args.backoff,
+        keep_alive=args.keep_alive,
+        rate_limit=args.rate_limit,
+        bulk_items=args.bulk_items,
+        page_loads=args.page_loads
+    )
+    success = tester.run_all_tests(workers=args.workers)
+    if args.export:
+        tester.export_results(args.export)
+    return success
+
 def main():
     """Main test execution"""
-    tester = BackendTester()
-    success = tester.run_all_tests()
+    args = parse_args()
+    if args.local:
+        from tests.fake_api import local_api_server
+        if args.server_cmd is None:
+            args.server_cmd = f"{shlex.quote(sys.executable)} -m tests.fake_api --port {{port}}"
+        with local_api_server() as base_url:
+            success = run(args, base_url)
+    else:
+        success = run(args, args.base_url)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
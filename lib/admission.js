@@ -0,0 +1,154 @@
+import { performance } from 'perf_hooks'
+
+// Admission control for the API. Every route belongs to a priority class
+// with its own concurrency limit and queue, so a burst of bcrypt logins or
+// full-collection reads waits (or is turned away) in its own line while cheap
+// reads keep flowing. A request that can't start right away is queued only
+// if the expected wait, estimated from the class's recent service times,
+// stays under the latency target; otherwise it is answered 503 at once.
+// Logins and full-collection reads, the CPU-bound classes, are also shed
+// while the event loop is lagging; writes are only held to their limits.
+// An optional token bucket per client (verified user, else address) answers
+// 429 past its rate.
+//
+// Rejections carry a retryAfter in whole seconds for the Retry-After header.
+
+// limit: requests of the class running at once; maxQueue: waiting requests;
+// shedOnLag: turned away while the event loop lags; targetMs overrides the
+// controller's latency target for the class
+export const DEFAULT_CLASSES = {
+  read: { limit: 256, maxQueue: 1024, shedOnLag: false },
+  heavy: { limit: 2, maxQueue: 64, shedOnLag: true },
+  auth: { limit: 8, maxQueue: 256, shedOnLag: true },
+  write: { limit: 8, maxQueue: 256, shedOnLag: false },
+  bulk: { limit: 1, maxQueue: 4, shedOnLag: false, targetMs: 30000 }
+}
+
+// Weight of the newest service time in a class's moving average
+const SERVICE_TIME_WEIGHT = 0.2
+
+function retryAfter(ms) {
+  return Math.max(1, Math.ceil(ms / 1000))
+}
+
+// Bounded LRU of token buckets, one per client key
+export class TokenBucketLimiter {
+  constructor({ rate, burst = rate * 2, maxClients = 10000 }) {
+    this.rate = rate
+    this.burst = burst
+    this.maxClients = maxClients
+    // Map iteration order doubles as recency order: least recent client first
+    this.buckets = new Map()
+  }
+
+  // Seconds until the client may send again, or 0 if this request is allowed
+  take(key, now = performance.now()) {
+    let bucket = this.buckets.get(key)
+    if (bucket) {
+      this.buckets.delete(key)
+      bucket.tokens = Math.min(this.burst, bucket.tokens + (now - bucket.updated) / 1000 * this.rate)
+      bucket.updated = now
+    } else {
+      bucket = { tokens: this.burst, updated: now }
+      if (this.buckets.size >= this.maxClients) this.buckets.delete(this.buckets.keys().next().value)
+    }
+    this.buckets.set(key, bucket)
+
+    if (bucket.tokens >= 1) {
+      bucket.tokens -= 1
+      return 0
+    }
+    return (1 - bucket.tokens) / this.rate
+  }
+}
+
+export class ConcurrencyGate {
+  constructor({ name, limit, maxQueue, targetMs }) {
+    this.name = name
+    this.limit = limit
+    this.maxQueue = maxQueue
+    this.targetMs = targetMs
+    this.active = 0
+    this.queue = []
+    // Moving average of how long an admitted request holds its slot
+    this.serviceMs = 0
+  }
+
+  expectedWaitMs() {
+    return (this.queue.length + 1) * this.serviceMs / this.limit
+  }
+
+  // Resolves to null once a slot is held, or to { retryAfter } when turned away
+  acquire() {
+    if (this.active < this.limit) {
+      this.active++
+      return Promise.resolve(null)
+    }
+    const waitMs = this.expectedWaitMs()
+    if (this.queue.length >= this.maxQueue || waitMs > this.targetMs) {
+      return Promise.resolve({ retryAfter: retryAfter(waitMs) })
+    }
+    return new Promise(resolve => this.queue.push({ resolve, queuedAt: performance.now() }))
+  }
+
+  release(heldMs) {
+    this.serviceMs += SERVICE_TIME_WEIGHT * (heldMs - this.serviceMs)
+    const now = performance.now()
+    while (this.queue.length > 0) {
+      const waiter = this.queue.shift()
+      // A request that waited twice the target is answered now rather than served late
+      if (now - waiter.queuedAt > 2 * this.targetMs) {
+        waiter.resolve({ retryAfter: retryAfter(this.expectedWaitMs()) })
+        continue
+      }
+      waiter.resolve(null)
+      return
+    }
+    this.active--
+  }
+}
+
+export class AdmissionController {
+  constructor({ classes = DEFAULT_CLASSES, targetMs = 500, lag = null, lagTargetMs = 250, rate = 0, burst } = {}) {
+    this.gates = new Map()
+    for (const [name, options] of Object.entries(classes)) {
+      this.gates.set(name, new ConcurrencyGate({ name, targetMs, ...options }))
+      this.gates.get(name).shedOnLag = Boolean(options.shedOnLag)
+    }
+    // () => current event-loop lag in seconds
+    this.lag = lag
+    this.lagTargetMs = lagTargetMs
+    this.limiter = rate > 0 ? new TokenBucketLimiter({ rate, burst: burst || rate * 2 }) : null
+  }
+
+  // Resolves to { release() } for an admitted request, or to
+  // { status, retryAfter } for one answered 429/503 instead
+  async admit(className, clientKey) {
+    if (this.limiter) {
+      const wait = this.limiter.take(clientKey)
+      if (wait > 0) return { status: 429, retryAfter: retryAfter(wait * 1000) }
+    }
+
+    const gate = this.gates.get(className)
+    if (!gate) throw new Error(`Unknown admission class ${className}`)
+    if (gate.shedOnLag && this.lag && this.lag() * 1000 > this.lagTargetMs) {
+      return { status: 503, retryAfter: 1 }
+    }
+
+    const rejected = await gate.acquire()
+    if (rejected) return { status: 503, retryAfter: rejected.retryAfter }
+    const admittedAt = performance.now()
+    return { release: () => gate.release(performance.now() - admittedAt) }
+  }
+}
+
+// "auth=16,heavy=4" -> classes with those limits changed
+export function parseLimits(value, classes = DEFAULT_CLASSES) {
+  const result = Object.fromEntries(Object.entries(classes).map(([name, options]) => [name, { ...options }]))
+  for (const pair of (value || '').split(',').filter(Boolean)) {
+    const [name, limit] = pair.split('=').map(part => part.trim())
+    if (!result[name] || !(Number(limit) > 0)) throw new Error(`Invalid admission limit "${pair}"`)
+    result[name].limit = Number(limit)
+  }
+  return result
+}
@@ -0,0 +1,114 @@
+import fs from 'fs'
+import { performance } from 'perf_hooks'
+
+// Traffic capture for replay (backend_test.py --replay). Every request is
+// appended to an NDJSON file once it has been answered:
+//
+//   {"t":1532.4,"method":"POST","path":"/auth/login","body":{"email":"...","password":"[redacted]"},
+//    "route":"/auth/login","role":null,"status":200,"ms":48.2}
+//
+// `t` is milliseconds since the capture started, `route` the matched route
+// pattern, `role` the role of the caller's token (admin, user, invalid or
+// null without one) and `ms` the server-side handling time. The first line is
+// a header with the wall-clock start, so captures from several workers can be
+// merged. Passwords are redacted; bodies over maxBodyBytes are left out and
+// only their size is kept (`bodyTruncated` when the size is a lower bound).
+// Streamed bodies (NDJSON bulk uploads) are never read here, so handlers that
+// parse them as they arrive keep doing so; only their Content-Length is kept.
+// Of the headers, only those that change the response (Accept,
+// If-None-Match, Last-Event-ID) are kept, under `headers`.
+
+export const CAPTURE_FORMAT = 'astrolaunch-capture'
+
+const REDACTED_FIELDS = ['password']
+
+// Request headers that change the response, replayed as captured
+const CAPTURED_HEADERS = ['accept', 'if-none-match', 'last-event-id']
+
+// Request bodies handlers consume as a stream
+const STREAMED_TYPES = ['application/x-ndjson']
+
+// Up to `limit` bytes of the body, read from a clone so the handler still gets
+// all of it; past the limit the clone is cancelled and only the count returned
+async function readBody(request, limit) {
+  const reader = request.clone().body.getReader()
+  const chunks = []
+  let bytes = 0
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    bytes += value.byteLength
+    if (bytes > limit) {
+      // Not awaited: a tee branch's cancel settles only once the handler's side is done too
+      reader.cancel().catch(() => {})
+      return { bytes, truncated: true }
+    }
+    chunks.push(value)
+  }
+  return { text: Buffer.concat(chunks).toString('utf8'), bytes, truncated: false }
+}
+
+function redact(body) {
+  if (!body || typeof body !== 'object' || Array.isArray(body)) return body
+  const copy = { ...body }
+  for (const field of REDACTED_FIELDS) {
+    if (field in copy) copy[field] = '[redacted]'
+  }
+  return copy
+}
+
+export class TrafficCapture {
+  constructor({ file, maxBodyBytes = 64 * 1024, worker = null }) {
+    this.maxBodyBytes = maxBodyBytes
+    this.startedAt = performance.now()
+    this.out = fs.createWriteStream(file, { flags: 'a' })
+    this.out.on('error', error => console.error('Traffic capture failed:', error))
+    this.write({ format: CAPTURE_FORMAT, version: 1, startedAt: new Date().toISOString(), worker })
+  }
+
+  write(entry) {
+    this.out.write(JSON.stringify(entry) + '\n')
+  }
+
+  // Snapshot of a request taken before its handler consumes the body
+  async begin(request, path) {
+    const entry = {
+      t: Math.round((performance.now() - this.startedAt) * 10) / 10,
+      method: request.method,
+      path
+    }
+    for (const name of CAPTURED_HEADERS) {
+      const value = request.headers.get(name)
+      if (value) (entry.headers = entry.headers || {})[name] = value
+    }
+    if (request.body) {
+      const contentType = request.headers.get('Content-Type') || ''
+      const length = request.headers.get('Content-Length')
+      if (STREAMED_TYPES.some(type => contentType.includes(type)) || Number(length) > this.maxBodyBytes) {
+        entry.bodyBytes = length === null ? null : Number(length)
+        entry.contentType = contentType
+        return entry
+      }
+
+      const { text, bytes, truncated } = await readBody(request, this.maxBodyBytes)
+      if (truncated) {
+        entry.bodyBytes = bytes
+        entry.bodyTruncated = true
+      } else if (contentType.includes('application/json')) {
+        try {
+          entry.body = redact(JSON.parse(text))
+        } catch {
+          entry.body = text
+        }
+      } else if (text) {
+        entry.body = text
+        entry.contentType = contentType
+      }
+    }
+    return entry
+  }
+
+  finish(entry, { route, role, status, ms }) {
+    this.write({ ...entry, route, role, status, ms: Math.round(ms * 1000) / 1000 })
+  }
+}
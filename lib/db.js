@@ -0,0 +1,267 @@
+import { SortedIndex, HashIndex, contains, tokenize } from '@/lib/search-index'
+
+// Indexed in-memory storage for the API routes
+
+function timestamp(item) {
+  return new Date(item.createdAt).getTime()
+}
+
+// A collection of records with a hash index on id. Records are kept in
+// ascending (createdAt, insertion sequence) order as they are written, so
+// reads never sort and records sharing a createdAt (a bulk import) still have
+// a total order a cursor can be found in by binary search.
+export class Collection {
+  constructor(name) {
+    this.name = name
+    this.items = []
+    this.byId = new Map()
+    // Record -> insertion sequence, the tiebreaker between equal createdAt values
+    this.seqs = new WeakMap()
+    this.nextSeq = 0
+    // Bumped on every write so readers can tell when cached views are stale
+    this.version = 0
+  }
+
+  get size() {
+    return this.items.length
+  }
+
+  // New records are almost always the newest; anything older is placed
+  // after its last equal-or-older neighbour with a binary search, which keeps
+  // (createdAt, seq) ascending since the new record has the highest seq
+  insertionIndex(item) {
+    let index = this.items.length
+    if (index > 0 && timestamp(this.items[index - 1]) > timestamp(item)) {
+      let low = 0
+      const time = timestamp(item)
+      while (low < index) {
+        const mid = (low + index) >>> 1
+        if (timestamp(this.items[mid]) <= time) low = mid + 1
+        else index = mid
+      }
+    }
+    return index
+  }
+
+  insert(item) {
+    this.items.splice(this.insertionIndex(item), 0, item)
+    this.seqs.set(item, this.nextSeq++)
+    this.byId.set(item.id, item)
+    this.version++
+    return item
+  }
+
+  // Insert a batch of records as a single write (one version bump)
+  insertMany(items) {
+    for (const item of items) {
+      const index = this.insertionIndex(item)
+      if (index === this.items.length) this.items.push(item)
+      else this.items.splice(index, 0, item)
+      this.seqs.set(item, this.nextSeq++)
+      this.byId.set(item.id, item)
+    }
+    if (items.length > 0) this.version++
+    return items
+  }
+
+  get(id) {
+    return this.byId.get(id)
+  }
+
+  all() {
+    return this.items
+  }
+
+  // Copy of the records ordered newest first
+  newestFirst() {
+    return this.items.slice().reverse()
+  }
+
+  // Position of a stored record, found by binary search on (createdAt, seq)
+  indexOf(item) {
+    const time = timestamp(item)
+    const seq = this.seqs.get(item)
+    if (seq === undefined) return -1
+    let low = 0
+    let high = this.items.length
+    while (low < high) {
+      const mid = (low + high) >>> 1
+      const midTime = timestamp(this.items[mid])
+      if (midTime < time || (midTime === time && this.seqs.get(this.items[mid]) < seq)) low = mid + 1
+      else high = mid
+    }
+    return this.items[low] === item ? low : -1
+  }
+
+  // Newest-first iterator over the records matching `filter` that are older
+  // than the record whose id is `after`. It walks a copy of the record list,
+  // so writes made while a caller is still iterating don't shift its position.
+  * iterate({ after = null, filter = null } = {}) {
+    const items = this.items.slice()
+    let index = items.length
+    if (after) {
+      const cursor = this.byId.get(after)
+      index = cursor ? this.indexOf(cursor) : 0
+    }
+    while (index > 0) {
+      const item = items[--index]
+      if (!filter || filter(item)) yield item
+    }
+  }
+
+  // Newest-first keyset page: up to `limit` records matching `filter` that are
+  // older than the record whose id is `after`. Returns null for an unknown cursor.
+  page({ limit = Infinity, after = null, filter = null } = {}) {
+    let index = this.items.length
+    if (after) {
+      const cursor = this.byId.get(after)
+      index = cursor ? this.indexOf(cursor) : -1
+      if (index < 0) return null
+    }
+
+    const items = []
+    while (index > 0 && items.length < limit) {
+      const item = this.items[--index]
+      if (!filter || filter(item)) items.push(item)
+    }
+
+    const hasMore = items.length === limit && index > 0
+    return { items, nextCursor: hasMore ? items[items.length - 1].id : null }
+  }
+}
+
+// Users are additionally indexed by email for register/login lookups
+export class UserCollection extends Collection {
+  constructor() {
+    super('users')
+    this.byEmail = new Map()
+  }
+
+  insert(user) {
+    super.insert(user)
+    this.byEmail.set(user.email, user)
+    return user
+  }
+
+  insertMany(users) {
+    super.insertMany(users)
+    for (const user of users) {
+      this.byEmail.set(user.email, user)
+    }
+    return users
+  }
+
+  findByEmail(email) {
+    return this.byEmail.get(email)
+  }
+}
+
+// Fields of searchable records matched exactly (case-insensitive), and the
+// fields whose words feed the text index
+export const SEARCH_FIELDS = ['status', 'launchSite', 'customer', 'rocket']
+export const TEXT_FIELDS = ['name', 'missionName', 'description']
+
+// Missions and schedules can also be searched by launchDate range, exact
+// field values and words of their text. Only records with a valid launchDate
+// appear in search results.
+export class SearchableCollection extends Collection {
+  constructor(name) {
+    super(name)
+    this.byLaunchDate = new SortedIndex()
+    this.byField = {}
+    for (const field of SEARCH_FIELDS) {
+      this.byField[field] = new HashIndex()
+    }
+    this.byWord = new HashIndex()
+  }
+
+  insert(item) {
+    super.insert(item)
+    this.index(item)
+    return item
+  }
+
+  insertMany(items) {
+    super.insertMany(items)
+    for (const item of items) {
+      this.index(item)
+    }
+    return items
+  }
+
+  index(item) {
+    const launchDate = new Date(item.launchDate).getTime()
+    if (item.launchDate == null || Number.isNaN(launchDate)) return
+
+    const entry = this.byLaunchDate.insert(launchDate, item)
+    for (const field of SEARCH_FIELDS) {
+      if (item[field] != null) this.byField[field].add(item[field], entry)
+    }
+    const words = new Set()
+    for (const field of TEXT_FIELDS) {
+      if (item[field] == null) continue
+      for (const word of tokenize(item[field])) {
+        words.add(word)
+      }
+    }
+    for (const word of words) {
+      this.byWord.add(word, entry)
+    }
+  }
+
+  // Records with from <= launchDate <= to (epoch ms) that match every value in
+  // `where` and contain every word of `text`, in launchDate order, as a keyset
+  // page after the record whose id is `after`. Returns null for an unknown cursor.
+  search({ from = -Infinity, to = Infinity, where = {}, text = '', limit = Infinity, after = null } = {}) {
+    let cursor = null
+    if (after) {
+      cursor = this.byLaunchDate.entryOf(after)
+      if (!cursor) return null
+    }
+
+    const lists = Object.entries(where).map(([field, value]) => this.byField[field].get(value))
+    for (const word of new Set(tokenize(text))) {
+      lists.push(this.byWord.get(word))
+    }
+    const matches = entry => lists.every(list => contains(list, entry))
+
+    // Drive the query from the launchDate range or from the shortest posting
+    // list (sorted afterwards), whichever should touch fewer records. A range
+    // scan stops once the page is full; assuming independent filters that is
+    // after about (limit + 1) / selectivity entries.
+    const shortest = lists.reduce((min, list) => (!min || list.length < min.length ? list : min), null)
+    const rangeSize = this.byLaunchDate.count(from, to)
+    const selectivity = lists.reduce((product, list) => product * list.length / Math.max(1, this.byLaunchDate.size), 1)
+    const scanned = Math.min(rangeSize, (limit + 1) / selectivity)
+    let entries = []
+    if (!shortest || scanned <= shortest.length) {
+      for (const entry of this.byLaunchDate.range(from, to, cursor)) {
+        if (!matches(entry)) continue
+        entries.push(entry)
+        if (entries.length > limit) break
+      }
+    } else {
+      const pastCursor = entry => !cursor || entry.key > cursor.key || (entry.key === cursor.key && entry.seq > cursor.seq)
+      for (const entry of shortest) {
+        if (entry.key >= from && entry.key <= to && pastCursor(entry) && matches(entry)) entries.push(entry)
+      }
+      entries.sort((a, b) => a.key - b.key || a.seq - b.seq)
+      entries = entries.slice(0, limit + 1)
+    }
+
+    const hasMore = entries.length > limit
+    const items = entries.slice(0, limit).map(entry => entry.item)
+    return { items, nextCursor: hasMore ? items[items.length - 1].id : null }
+  }
+}
+
+export const COLLECTIONS = ['rockets', 'missions', 'teams', 'schedules']
+export const SEARCHABLE_COLLECTIONS = ['missions', 'schedules']
+
+export function createDB() {
+  const db = { users: new UserCollection() }
+  for (const name of COLLECTIONS) {
+    db[name] = SEARCHABLE_COLLECTIONS.includes(name) ? new SearchableCollection(name) : new Collection(name)
+  }
+  return db
+}
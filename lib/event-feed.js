@@ -0,0 +1,129 @@
+import { randomUUID } from 'crypto'
+
+// Change feed for the collections, served as Server-Sent Events. Every write
+// becomes an insert event, kept in a bounded ring and pushed to the live
+// subscribers. Each event is serialized to its SSE frame once, and that frame
+// is shared by every subscriber.
+//
+// Event ids are "<epoch>-<seq>", with seq increasing (not necessarily by one)
+// within an epoch. A client reconnecting with Last-Event-ID replays what it
+// missed from the ring, or gets a `reset` event telling it to refetch when
+// those events were already dropped or the id is from another epoch.
+
+// Larger batches (bulk imports) are announced with their count and ids only
+export const MAX_EVENT_RECORDS = 100
+
+const encoder = new TextEncoder()
+
+function frame(id, event, data) {
+  return encoder.encode(`id: ${id}\nevent: ${event}\ndata: ${JSON.stringify(data)}\n\n`)
+}
+
+export class EventFeed {
+  constructor({ capacity = 1000, collections = null, retryMs = 3000, heartbeatMs = 15000, maxQueued = 1000 } = {}) {
+    this.capacity = capacity
+    this.collections = collections ? new Set(collections) : null
+    this.retryMs = retryMs
+    this.heartbeatMs = heartbeatMs
+    // Frames a subscriber may fall behind by before it is disconnected
+    this.maxQueued = maxQueued
+    this.epoch = randomUUID().slice(0, 8)
+    this.seq = 0
+    // Events at or below this seq may be missing from the ring
+    this.droppedSeq = 0
+    this.ring = []
+    this.head = 0
+    this.subscribers = new Set()
+  }
+
+  // Start a new sequence, e.g. the cluster's, where events up to `seq` are unknown here
+  restart(epoch, seq) {
+    this.epoch = epoch
+    this.seq = seq
+    this.droppedSeq = seq
+    this.ring = []
+    this.head = 0
+  }
+
+  publish(collection, records, seq = this.seq + 1) {
+    this.seq = seq
+    if (this.collections && !this.collections.has(collection)) return null
+
+    const id = `${this.epoch}-${seq}`
+    const data = records.length <= MAX_EVENT_RECORDS
+      ? { collection, records }
+      : { collection, count: records.length, ids: records.map(record => record.id) }
+    const event = { seq, collection, bytes: frame(id, 'insert', data) }
+
+    if (this.ring.length < this.capacity) {
+      this.ring.push(event)
+    } else {
+      this.droppedSeq = this.ring[this.head].seq
+      this.ring[this.head] = event
+      this.head = (this.head + 1) % this.capacity
+    }
+
+    for (const subscriber of this.subscribers) {
+      if (!subscriber.collections || subscriber.collections.has(collection)) subscriber.send(event.bytes)
+    }
+    return event
+  }
+
+  // Events after `lastEventId`, oldest first, or null when they can't all be replayed
+  since(lastEventId) {
+    const separator = lastEventId.lastIndexOf('-')
+    const seq = Number(lastEventId.slice(separator + 1))
+    if (lastEventId.slice(0, separator) !== this.epoch || !Number.isInteger(seq) || seq < this.droppedSeq) return null
+
+    const events = []
+    for (let i = 0; i < this.ring.length; i++) {
+      const event = this.ring[(this.head + i) % this.ring.length]
+      if (event.seq > seq) events.push(event)
+    }
+    return events
+  }
+
+  // SSE body for one subscriber: a replay from lastEventId (if given), then live events
+  stream({ lastEventId = null, collections = null } = {}) {
+    const wanted = collections ? new Set(collections) : null
+    let subscriber = null
+    let heartbeat = null
+    const stop = () => {
+      if (subscriber) this.subscribers.delete(subscriber)
+      clearInterval(heartbeat)
+    }
+
+    return new ReadableStream({
+      start: controller => {
+        controller.enqueue(encoder.encode(`retry: ${this.retryMs}\n\n`))
+        if (lastEventId) {
+          const missed = this.since(lastEventId)
+          if (missed === null) {
+            controller.enqueue(frame(`${this.epoch}-${this.seq}`, 'reset', {}))
+          } else {
+            for (const event of missed) {
+              if (!wanted || wanted.has(event.collection)) controller.enqueue(event.bytes)
+            }
+          }
+        }
+
+        subscriber = {
+          collections: wanted,
+          send: bytes => {
+            // A stalled reader is cut off; it reconnects and resumes from the ring
+            if (controller.desiredSize < -this.maxQueued) {
+              stop()
+              controller.close()
+              return
+            }
+            controller.enqueue(bytes)
+          }
+        }
+        this.subscribers.add(subscriber)
+        heartbeat = setInterval(() => controller.enqueue(encoder.encode(': ping\n\n')), this.heartbeatMs)
+        heartbeat.unref?.()
+      },
+      cancel: stop
+    })
+  }
+}
@@ -0,0 +1,243 @@
+import { performance } from 'perf_hooks'
+
+// In-process metrics for GET /api/metrics, rendered as Prometheus text or
+// JSON. Recording a request is two clock reads, a Map lookup and a short
+// bucket scan, so every route is instrumented without a measurable cost.
+//
+// Histograms are cumulative since the process started, like Prometheus
+// histograms: a client diffing two scrapes gets exact counts and sums for the
+// window between them, and percentiles interpolated within the buckets.
+
+// Upper bounds in seconds, shared by every histogram (request latency,
+// password queue wait and event-loop lag)
+export const BUCKETS = [
+  0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+]
+
+// Label for requests that matched no route (404) or no method (405), so
+// unknown paths can't grow the set of series
+export const UNMATCHED_ROUTE = '(unmatched)'
+
+export class Histogram {
+  constructor(buckets = BUCKETS) {
+    this.buckets = buckets
+    // One count per bucket plus the +Inf overflow, not cumulative
+    this.counts = new Array(buckets.length + 1).fill(0)
+    this.count = 0
+    this.sum = 0
+  }
+
+  observe(seconds) {
+    let i = 0
+    while (i < this.buckets.length && seconds > this.buckets[i]) i++
+    this.counts[i]++
+    this.count++
+    this.sum += seconds
+  }
+
+  // [upper bound, cumulative count] pairs, ending with [Infinity, count]
+  cumulative() {
+    let total = 0
+    return this.counts.map((count, i) => {
+      total += count
+      return [i < this.buckets.length ? this.buckets[i] : Infinity, total]
+    })
+  }
+
+  // Estimated like Prometheus' histogram_quantile(): linear within the bucket
+  quantile(q) {
+    if (this.count === 0) return 0
+    const rank = q * this.count
+    let seen = 0
+    for (let i = 0; i < this.counts.length; i++) {
+      if (seen + this.counts[i] >= rank && this.counts[i] > 0) {
+        if (i === this.buckets.length) return this.buckets[i - 1]
+        const lower = i === 0 ? 0 : this.buckets[i - 1]
+        return lower + (this.buckets[i] - lower) * ((rank - seen) / this.counts[i])
+      }
+      seen += this.counts[i]
+    }
+    return this.buckets[this.buckets.length - 1]
+  }
+
+  toJSON() {
+    return {
+      count: this.count,
+      sum: this.sum,
+      p50: this.quantile(0.5),
+      p95: this.quantile(0.95),
+      p99: this.quantile(0.99),
+      buckets: this.cumulative().map(([le, count]) => [le === Infinity ? '+Inf' : le, count])
+    }
+  }
+}
+
+// Measures how late a repeating timer fires; the delay is time the event loop
+// spent busy with something else. `recent` is a moving average of the last
+// few samples in seconds, for decisions that need the current lag rather than
+// the histogram since start.
+class LagSampler {
+  constructor(histogram, intervalMs) {
+    this.histogram = histogram
+    this.intervalMs = intervalMs
+    this.recent = 0
+    this.expected = performance.now() + intervalMs
+    this.timer = setInterval(() => {
+      const now = performance.now()
+      const lag = Math.max(0, now - this.expected) / 1000
+      this.histogram.observe(lag)
+      this.recent += 0.3 * (lag - this.recent)
+      this.expected = now + this.intervalMs
+    }, intervalMs)
+    this.timer.unref?.()
+  }
+}
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')
+}
+
+function labels(pairs) {
+  const entries = Object.entries(pairs)
+  return entries.length === 0 ? '' : `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}`
+}
+
+function formatNumber(value) {
+  return value === Infinity ? '+Inf' : String(value)
+}
+
+export class Metrics {
+  constructor({ prefix = 'astrolaunch', lagIntervalMs = 20 } = {}) {
+    this.prefix = prefix
+    this.startedAt = Date.now()
+    // Route object (from Router.match), or the method of unmatched requests -> its series
+    this.routes = new Map()
+    this.errors = new Map()
+    this.passwordQueueTime = new Histogram()
+    this.eventLoopLag = new Histogram()
+    this.lagSampler = lagIntervalMs > 0 ? new LagSampler(this.eventLoopLag, lagIntervalMs) : null
+    // name -> { help, read, label }, read at scrape time
+    this.gauges = new Map()
+  }
+
+  // `route` is the Router route ({ method, pattern }) or null for an unmatched request
+  observeRequest(method, route, status, seconds) {
+    const key = route || method
+    let series = this.routes.get(key)
+    if (!series) {
+      series = {
+        method: route ? route.method : method,
+        route: route ? route.pattern : UNMATCHED_ROUTE,
+        statuses: new Map(),
+        duration: new Histogram()
+      }
+      this.routes.set(key, series)
+    }
+    series.statuses.set(status, (series.statuses.get(status) || 0) + 1)
+    series.duration.observe(seconds)
+  }
+
+  // Event-loop lag over the last few samples in seconds (0 without a sampler)
+  recentLag() {
+    return this.lagSampler ? this.lagSampler.recent : 0
+  }
+
+  observeError(error) {
+    const type = error?.name || 'Error'
+    this.errors.set(type, (this.errors.get(type) || 0) + 1)
+  }
+
+  // Registers a gauge read on every scrape; `read` returns a number, or an
+  // object of label value -> number for a family labelled by `label`
+  gauge(name, help, read, label = null) {
+    this.gauges.set(name, { help, read, label })
+    return this
+  }
+
+  sortedRoutes() {
+    return [...this.routes.values()].sort((a, b) => a.route.localeCompare(b.route) || a.method.localeCompare(b.method))
+  }
+
+  toJSON() {
+    const memory = process.memoryUsage()
+    const gauges = {}
+    for (const [name, { read }] of this.gauges) {
+      gauges[name] = read()
+    }
+    return {
+      uptimeSeconds: (Date.now() - this.startedAt) / 1000,
+      requests: this.sortedRoutes().map(series => ({
+        method: series.method,
+        route: series.route,
+        statuses: Object.fromEntries(series.statuses),
+        duration: series.duration
+      })),
+      errors: Object.fromEntries(this.errors),
+      passwordQueueTime: this.passwordQueueTime,
+      eventLoopLag: this.eventLoopLag,
+      memory: { rss: memory.rss, heapUsed: memory.heapUsed, heapTotal: memory.heapTotal, external: memory.external },
+      gauges
+    }
+  }
+
+  toPrometheus() {
+    const name = suffix => `${this.prefix}_${suffix}`
+    const lines = []
+    const family = (metric, type, help) => {
+      lines.push(`# HELP ${metric} ${help}`, `# TYPE ${metric} ${type}`)
+    }
+    const histogram = (metric, histogram, pairs = {}) => {
+      for (const [le, count] of histogram.cumulative()) {
+        lines.push(`${metric}_bucket${labels({ ...pairs, le: formatNumber(le) })} ${count}`)
+      }
+      lines.push(`${metric}_sum${labels(pairs)} ${formatNumber(histogram.sum)}`)
+      lines.push(`${metric}_count${labels(pairs)} ${histogram.count}`)
+    }
+
+    const routes = this.sortedRoutes()
+    family(name('http_requests_total'), 'counter', 'Requests answered, by route pattern and status')
+    for (const series of routes) {
+      for (const [status, count] of series.statuses) {
+        lines.push(`${name('http_requests_total')}${labels({ method: series.method, route: series.route, status })} ${count}`)
+      }
+    }
+    family(name('http_request_duration_seconds'), 'histogram',
+      'Time from dispatch until the response is returned (headers only for streamed bodies)')
+    for (const series of routes) {
+      histogram(name('http_request_duration_seconds'), series.duration, { method: series.method, route: series.route })
+    }
+
+    family(name('errors_total'), 'counter', 'Unhandled errors answered with 500, by error type')
+    for (const [type, count] of this.errors) {
+      lines.push(`${name('errors_total')}${labels({ type })} ${count}`)
+    }
+
+    family(name('password_queue_wait_seconds'), 'histogram', 'Time password hashes and checks waited for a bcrypt worker')
+    histogram(name('password_queue_wait_seconds'), this.passwordQueueTime)
+    family(name('event_loop_lag_seconds'), 'histogram', 'How late a periodic timer fired on the event loop')
+    histogram(name('event_loop_lag_seconds'), this.eventLoopLag)
+
+    for (const [gauge, { help, read, label }] of this.gauges) {
+      family(name(gauge), 'gauge', help)
+      const value = read()
+      if (label) {
+        for (const [key, count] of Object.entries(value)) {
+          lines.push(`${name(gauge)}${labels({ [label]: key })} ${formatNumber(count)}`)
+        }
+      } else {
+        lines.push(`${name(gauge)} ${formatNumber(value)}`)
+      }
+    }
+
+    const memory = process.memoryUsage()
+    family('process_resident_memory_bytes', 'gauge', 'Resident set size in bytes')
+    lines.push(`process_resident_memory_bytes ${memory.rss}`)
+    family('nodejs_heap_size_used_bytes', 'gauge', 'V8 heap in use in bytes')
+    lines.push(`nodejs_heap_size_used_bytes ${memory.heapUsed}`)
+    family('nodejs_heap_size_total_bytes', 'gauge', 'V8 heap reserved in bytes')
+    lines.push(`nodejs_heap_size_total_bytes ${memory.heapTotal}`)
+    family('process_start_time_seconds', 'gauge', 'Start time of the process since the epoch in seconds')
+    lines.push(`process_start_time_seconds ${Math.floor(this.startedAt / 1000)}`)
+    return lines.join('\n') + '\n'
+  }
+}
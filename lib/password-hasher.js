@@ -0,0 +1,118 @@
+import os from 'os'
+import { performance } from 'perf_hooks'
+import { Worker } from 'worker_threads'
+import bcrypt from 'bcryptjs'
+
+// bcryptjs is pure JavaScript, so hashing on the event loop stalls every other
+// request. PasswordHasher runs it on a small pool of worker threads with a
+// bounded queue; when the queue is full, callers get a PasswordQueueFullError
+// right away instead of waiting behind the backlog.
+
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads')
+const bcrypt = require('bcryptjs')
+
+parentPort.on('message', ({ id, op, password, hash, cost }) => {
+  try {
+    const result = op === 'hash' ? bcrypt.hashSync(password, cost) : bcrypt.compareSync(password, hash)
+    parentPort.postMessage({ id, result })
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message })
+  }
+})
+`
+
+export class PasswordQueueFullError extends Error {
+  constructor() {
+    super('Password hashing queue is full')
+    this.name = 'PasswordQueueFullError'
+  }
+}
+
+export class PasswordHasher {
+  constructor({ workers = Math.max(1, Math.min(4, os.cpus().length - 1)), maxQueue = 1000, cost = 10, queueTime = null } = {}) {
+    this.size = workers
+    this.maxQueue = maxQueue
+    this.cost = cost
+    // Optional histogram ({ observe(seconds) }) of each task's wait for a worker
+    this.queueTime = queueTime
+    this.queue = []
+    this.idle = []
+    this.busy = new Map()
+    this.nextId = 0
+    for (let i = 0; i < this.size; i++) {
+      this.idle.push(this.spawn())
+    }
+  }
+
+  spawn() {
+    const worker = new Worker(WORKER_SOURCE, { eval: true })
+    worker.unref()
+    worker.on('message', ({ id, result, error }) => {
+      const task = this.busy.get(worker)
+      this.busy.delete(worker)
+      if (task && task.id === id) {
+        if (error) task.reject(new Error(error))
+        else task.resolve(result)
+      }
+      this.release(worker)
+    })
+    worker.on('error', error => this.replace(worker, error))
+    worker.on('exit', code => {
+      if (code !== 0) this.replace(worker, new Error(`Password worker exited with code ${code}`))
+    })
+    return worker
+  }
+
+  // A crashed worker fails its in-flight task and is swapped for a fresh one
+  replace(worker, error) {
+    if (worker.replaced) return
+    worker.replaced = true
+    const task = this.busy.get(worker)
+    this.busy.delete(worker)
+    this.idle = this.idle.filter(candidate => candidate !== worker)
+    if (task) task.reject(error)
+    this.release(this.spawn())
+  }
+
+  release(worker) {
+    const task = this.queue.shift()
+    if (task) this.dispatch(worker, task)
+    else this.idle.push(worker)
+  }
+
+  dispatch(worker, task) {
+    if (this.queueTime) this.queueTime.observe((performance.now() - task.queuedAt) / 1000)
+    this.busy.set(worker, task)
+    worker.postMessage({ id: task.id, ...task.message })
+  }
+
+  run(message) {
+    // Without workers, fall back to bcryptjs on the calling thread
+    if (this.size === 0) {
+      return message.op === 'hash'
+        ? bcrypt.hash(message.password, message.cost)
+        : bcrypt.compare(message.password, message.hash)
+    }
+
+    return new Promise((resolve, reject) => {
+      const task = { id: this.nextId++, message, resolve, reject, queuedAt: performance.now() }
+      const worker = this.idle.pop()
+      if (worker) {
+        this.dispatch(worker, task)
+      } else if (this.queue.length >= this.maxQueue) {
+        reject(new PasswordQueueFullError())
+      } else {
+        this.queue.push(task)
+      }
+    })
+  }
+
+  hash(password) {
+    return this.run({ op: 'hash', password, cost: this.cost })
+  }
+
+  compare(password, hash) {
+    return this.run({ op: 'compare', password, hash })
+  }
+}
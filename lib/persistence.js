@@ -0,0 +1,205 @@
+import fs from 'fs'
+import path from 'path'
+import readline from 'readline'
+import { SNAPSHOT_COLLECTIONS, applySeedSnapshot } from '@/lib/seed'
+
+// Embedded persistence for the in-memory collections: every write is
+// appended to a write-ahead log, the state is periodically compacted into a
+// snapshot, and recovery loads the snapshot then replays the log tail.
+//
+// The log is split into segments named after their first sequence number
+// (wal-<lsn>.log). Taking a snapshot starts a new segment, so once the
+// snapshot is on disk every older segment can be deleted.
+//
+// fsync policies:
+//   always   - each write gets its own write + fsync before it is acknowledged
+//   batch    - group commit: writes arriving while a flush runs share the next write + fsync
+//   interval - acknowledged after write(); fsync runs every intervalMs
+//   off      - flushing is left to the OS
+export const FSYNC_POLICIES = ['always', 'batch', 'interval', 'off']
+
+const SNAPSHOT_FILE = 'snapshot.json'
+const SEGMENT_PATTERN = /^wal-(\d+)\.log$/
+
+function segmentName(lsn) {
+  return `wal-${String(lsn).padStart(16, '0')}.log`
+}
+
+function deferred() {
+  const entry = {}
+  entry.promise = new Promise((resolve, reject) => {
+    entry.resolve = resolve
+    entry.reject = reject
+  })
+  return entry
+}
+
+export class Persistence {
+  constructor({ dir, fsync = 'batch', intervalMs = 1000, snapshotEvery = 100000 } = {}) {
+    if (!FSYNC_POLICIES.includes(fsync)) {
+      throw new Error(`Unknown fsync policy "${fsync}", expected one of ${FSYNC_POLICIES.join(', ')}`)
+    }
+    this.dir = dir
+    this.fsync = fsync
+    this.intervalMs = intervalMs
+    this.snapshotEvery = snapshotEvery
+    this.db = null
+    this.lsn = 0
+    this.handle = null
+    // Batches of log lines waiting to be written, in lsn order; a batch with
+    // `rotate` set switches to a new segment instead
+    this.queue = []
+    this.flushing = false
+    this.sinceSnapshot = 0
+    this.snapshotting = null
+  }
+
+  segments() {
+    return fs.readdirSync(this.dir)
+      .map(name => SEGMENT_PATTERN.exec(name))
+      .filter(Boolean)
+      .map(match => ({ file: path.join(this.dir, match[0]), start: Number(match[1]) }))
+      .sort((a, b) => a.start - b.start)
+  }
+
+  // Load the last snapshot into db and replay newer log entries. Returns how
+  // much was recovered; afterwards new writes go to a fresh segment.
+  async recover(db) {
+    this.db = db
+    fs.mkdirSync(this.dir, { recursive: true })
+
+    let snapshot = null
+    try {
+      snapshot = JSON.parse(await fs.promises.readFile(path.join(this.dir, SNAPSHOT_FILE), 'utf8'))
+    } catch (error) {
+      if (error.code !== 'ENOENT') throw error
+    }
+    if (snapshot) {
+      applySeedSnapshot(db, snapshot)
+      this.lsn = snapshot.lsn || 0
+    }
+
+    let replayed = 0
+    for (const segment of this.segments()) {
+      // Segments are streamed line by line so large logs never sit in memory whole
+      const lines = readline.createInterface({ input: fs.createReadStream(segment.file), crlfDelay: Infinity })
+      let lineNumber = 0
+      let tornLine = null
+      for await (const line of lines) {
+        lineNumber++
+        if (!line) continue
+        if (tornLine !== null) {
+          throw new Error(`Corrupt write-ahead log entry in ${segment.file} at line ${tornLine}`)
+        }
+        let entry
+        try {
+          entry = JSON.parse(line)
+        } catch (error) {
+          // Only the final line may be torn: a write that was never acknowledged
+          tornLine = lineNumber
+          continue
+        }
+        if (entry.lsn <= this.lsn) continue
+        db[entry.collection].insertMany(entry.items.map(item => ({ ...item, createdAt: new Date(item.createdAt) })))
+        this.lsn = entry.lsn
+        replayed++
+      }
+    }
+
+    this.sinceSnapshot = replayed
+    this.handle = await fs.promises.open(path.join(this.dir, segmentName(this.lsn + 1)), 'a')
+    if (this.fsync === 'interval') {
+      setInterval(() => {
+        if (!this.flushing) this.handle.sync().catch(error => console.error('WAL fsync failed:', error))
+      }, this.intervalMs).unref()
+    }
+    // Compact a long replayed tail right away so the next boot is quicker
+    if (this.sinceSnapshot >= this.snapshotEvery) {
+      this.snapshot().catch(error => console.error('Snapshot failed:', error))
+    }
+    return { snapshot: Boolean(snapshot), replayed }
+  }
+
+  // Log records already inserted into a collection. Call it in the same tick
+  // as the insert; the promise resolves once the entry is durable under the
+  // configured fsync policy.
+  append(collection, items) {
+    const line = JSON.stringify({ lsn: ++this.lsn, collection, items }) + '\n'
+    let batch = this.queue[this.queue.length - 1]
+    if (!batch || batch.rotate || this.fsync === 'always') {
+      batch = { ...deferred(), lines: [] }
+      this.queue.push(batch)
+    }
+    batch.lines.push(line)
+    this.flushSoon()
+
+    this.sinceSnapshot += 1
+    if (this.sinceSnapshot >= this.snapshotEvery && !this.snapshotting) {
+      this.snapshot().catch(error => console.error('Snapshot failed:', error))
+    }
+    return batch.promise
+  }
+
+  flushSoon() {
+    if (this.flushing) return
+    this.flushing = true
+    setImmediate(() => this.flush())
+  }
+
+  async flush() {
+    while (this.queue.length > 0) {
+      const batch = this.queue.shift()
+      try {
+        if (batch.rotate) {
+          await this.handle.close()
+          this.handle = await fs.promises.open(path.join(this.dir, segmentName(batch.rotate)), 'a')
+        } else {
+          await this.handle.write(batch.lines.join(''))
+          if (this.fsync === 'always' || this.fsync === 'batch') await this.handle.sync()
+        }
+        batch.resolve()
+      } catch (error) {
+        batch.reject(error)
+      }
+    }
+    this.flushing = false
+  }
+
+  // Write a compact snapshot of the current state and drop the log segments
+  // it covers. The state is serialized synchronously, so it matches this.lsn.
+  snapshot() {
+    if (this.snapshotting) return this.snapshotting
+
+    const lsn = this.lsn
+    const state = { lsn }
+    for (const name of SNAPSHOT_COLLECTIONS) {
+      state[name] = this.db[name].all()
+    }
+    const body = JSON.stringify(state)
+    this.sinceSnapshot = 0
+
+    const rotation = { ...deferred(), rotate: lsn + 1 }
+    this.queue.push(rotation)
+    this.flushSoon()
+
+    this.snapshotting = (async () => {
+      const target = path.join(this.dir, SNAPSHOT_FILE)
+      const temp = `${target}.tmp`
+      const handle = await fs.promises.open(temp, 'w')
+      try {
+        await handle.write(body)
+        await handle.sync()
+      } finally {
+        await handle.close()
+      }
+      await fs.promises.rename(temp, target)
+      await rotation.promise
+      for (const segment of this.segments()) {
+        if (segment.start <= lsn) await fs.promises.unlink(segment.file)
+      }
+    })().finally(() => {
+      this.snapshotting = null
+    })
+    return this.snapshotting
+  }
+}
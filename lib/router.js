@@ -0,0 +1,86 @@
+// Table-driven request dispatch. Routes are compiled into a trie keyed on
+// path segments, with a method map on every node, so a lookup costs one step
+// per segment however many routes are registered, and an unknown path fails
+// at its first unmatched segment. A segment written as `:name` captures that
+// segment into params.name; static segments win over parameters at the same
+// depth.
+//
+// Middleware has the shape (request, context, next) => response and runs in
+// the order given, outermost first. Each route's chain is composed once, when
+// the route is added.
+
+function createNode() {
+  return { children: new Map(), param: null, methods: new Map() }
+}
+
+function splitPath(path) {
+  return path.split('/').filter(Boolean)
+}
+
+function compose(middleware, handler) {
+  return middleware.reduceRight(
+    (next, layer) => (request, context) => layer(request, context, () => next(request, context)),
+    handler
+  )
+}
+
+export class Router {
+  constructor() {
+    this.root = createNode()
+    this.routes = []
+  }
+
+  add(method, pattern, handler, middleware = []) {
+    let node = this.root
+    const names = []
+    for (const segment of splitPath(pattern)) {
+      if (segment.startsWith(':')) {
+        names.push(segment.slice(1))
+        node.param = node.param || createNode()
+        node = node.param
+      } else {
+        if (!node.children.has(segment)) node.children.set(segment, createNode())
+        node = node.children.get(segment)
+      }
+    }
+
+    if (node.methods.has(method)) throw new Error(`Route ${method} ${pattern} is already registered`)
+    node.methods.set(method, { method, pattern, names, run: compose(middleware, handler) })
+    this.routes.push({ method, pattern })
+    return this
+  }
+
+  // Walks static children first and backtracks into a parameter branch only
+  // when the static branch has no route for the rest of the path
+  find(node, segments, index, values) {
+    if (index === segments.length) return node.methods.size > 0 ? node : null
+
+    const child = node.children.get(segments[index])
+    if (child) {
+      const found = this.find(child, segments, index + 1, values)
+      if (found) return found
+    }
+    if (node.param) {
+      values.push(segments[index])
+      const found = this.find(node.param, segments, index + 1, values)
+      if (found) return found
+      values.pop()
+    }
+    return null
+  }
+
+  // Returns { route, params, allowed } for a known path, where route is null
+  // if the path exists but not for this method, or null for an unknown path
+  match(method, path) {
+    const values = []
+    const node = this.find(this.root, splitPath(path), 0, values)
+    if (!node) return null
+
+    const route = node.methods.get(method) || null
+    const params = {}
+    if (route) {
+      route.names.forEach((name, i) => { params[name] = values[i] })
+    }
+    return { route, params, allowed: [...node.methods.keys()] }
+  }
+}
@@ -0,0 +1,162 @@
+// Secondary indexes for searchable collections (see SearchableCollection in
+// lib/db.js). All of them are updated as records are inserted.
+
+// Entries per chunk before it splits in two
+const MAX_CHUNK = 2048
+
+// Records ordered by a numeric key (ties in insertion order). Entries live in
+// a list of small sorted chunks, so an insert moves at most one chunk's worth
+// of entries, and a range scan is two binary searches plus the k entries it
+// returns: O(log n + k). Records are identified by their id.
+export class SortedIndex {
+  constructor() {
+    this.chunks = []
+    this.entries = new Map()
+    this.seq = 0
+  }
+
+  get size() {
+    return this.entries.size
+  }
+
+  // Position of the first entry with key >= value, or key > value when `strict`
+  bound(value, strict = false) {
+    const past = key => (strict ? key > value : key >= value)
+    let low = 0
+    let high = this.chunks.length
+    while (low < high) {
+      const mid = (low + high) >>> 1
+      const chunk = this.chunks[mid]
+      if (past(chunk[chunk.length - 1].key)) high = mid
+      else low = mid + 1
+    }
+    if (low === this.chunks.length) return { chunk: low, offset: 0 }
+
+    const chunk = this.chunks[low]
+    let start = 0
+    let end = chunk.length
+    while (start < end) {
+      const mid = (start + end) >>> 1
+      if (past(chunk[mid].key)) end = mid
+      else start = mid + 1
+    }
+    return { chunk: low, offset: start }
+  }
+
+  insert(key, item) {
+    const entry = { key, seq: this.seq++, item }
+    this.entries.set(item.id, entry)
+    if (this.chunks.length === 0) {
+      this.chunks.push([entry])
+      return entry
+    }
+
+    // Equal keys were inserted earlier, so the new entry goes after all of them
+    let { chunk, offset } = this.bound(key, true)
+    if (chunk === this.chunks.length) {
+      chunk--
+      offset = this.chunks[chunk].length
+    }
+    const entries = this.chunks[chunk]
+    entries.splice(offset, 0, entry)
+    if (entries.length > MAX_CHUNK) {
+      this.chunks.splice(chunk, 1, entries.slice(0, MAX_CHUNK / 2), entries.slice(MAX_CHUNK / 2))
+    }
+    return entry
+  }
+
+  entryOf(id) {
+    return this.entries.get(id)
+  }
+
+  // Position just past `entry`
+  after(entry) {
+    let { chunk, offset } = this.bound(entry.key)
+    while (chunk < this.chunks.length) {
+      const current = this.chunks[chunk][offset]
+      if (current.key !== entry.key || current.seq > entry.seq) break
+      if (++offset === this.chunks[chunk].length) {
+        chunk++
+        offset = 0
+      }
+    }
+    return { chunk, offset }
+  }
+
+  // Number of entries with from <= key <= to
+  count(from, to) {
+    const start = this.bound(from)
+    const end = this.bound(to, true)
+    if (start.chunk > end.chunk || (start.chunk === end.chunk && start.offset >= end.offset)) return 0
+    if (start.chunk === end.chunk) return end.offset - start.offset
+    let total = this.chunks[start.chunk].length - start.offset + end.offset
+    for (let i = start.chunk + 1; i < end.chunk; i++) {
+      total += this.chunks[i].length
+    }
+    return total
+  }
+
+  // Entries with from <= key <= to in key order, starting past `cursor` if given
+  * range(from, to, cursor = null) {
+    let position = this.bound(from)
+    if (cursor) {
+      const next = this.after(cursor)
+      if (next.chunk > position.chunk || (next.chunk === position.chunk && next.offset > position.offset)) {
+        position = next
+      }
+    }
+
+    let { chunk, offset } = position
+    while (chunk < this.chunks.length) {
+      const entries = this.chunks[chunk]
+      for (; offset < entries.length; offset++) {
+        if (entries[offset].key > to) return
+        yield entries[offset]
+      }
+      chunk++
+      offset = 0
+    }
+  }
+}
+
+// Normalized value -> posting list of SortedIndex entries, for exact
+// (case-insensitive) matches. Entries are added in insertion order, so each
+// list is ordered by seq and membership is a binary search.
+export class HashIndex {
+  constructor() {
+    this.lists = new Map()
+  }
+
+  static normalize(value) {
+    return String(value).trim().toLowerCase()
+  }
+
+  add(value, entry) {
+    const key = HashIndex.normalize(value)
+    const list = this.lists.get(key)
+    if (list) list.push(entry)
+    else this.lists.set(key, [entry])
+  }
+
+  get(value) {
+    return this.lists.get(HashIndex.normalize(value)) || EMPTY
+  }
+}
+
+const EMPTY = []
+
+export function contains(list, entry) {
+  let low = 0
+  let high = list.length
+  while (low < high) {
+    const mid = (low + high) >>> 1
+    if (list[mid].seq < entry.seq) low = mid + 1
+    else high = mid
+  }
+  return low < list.length && list[low] === entry
+}
+
+// Lowercased words of a text, for the inverted word index
+export function tokenize(text) {
+  return String(text).toLowerCase().match(/[\p{L}\p{N}]+/gu) || []
+}
@@ -0,0 +1,33 @@
+import fs from 'fs'
+import { COLLECTIONS } from '@/lib/db'
+
+// Seed snapshots are JSON dumps of the bootstrap data (the admin user with its
+// bcrypt hash plus the sample collections), so a cold start can load them
+// instead of hashing the admin password and building the records again.
+
+export const SNAPSHOT_COLLECTIONS = ['users', ...COLLECTIONS]
+
+export function readSeedSnapshot(path) {
+  try {
+    return JSON.parse(fs.readFileSync(path, 'utf8'))
+  } catch (error) {
+    if (error.code === 'ENOENT') return null
+    throw error
+  }
+}
+
+export function writeSeedSnapshot(path, db) {
+  const snapshot = {}
+  for (const name of SNAPSHOT_COLLECTIONS) {
+    snapshot[name] = db[name].all()
+  }
+  fs.writeFileSync(path, JSON.stringify(snapshot))
+}
+
+export function applySeedSnapshot(db, snapshot) {
+  for (const name of SNAPSHOT_COLLECTIONS) {
+    for (const record of snapshot[name] || []) {
+      db[name].insert({ ...record, createdAt: new Date(record.createdAt) })
+    }
+  }
+}
@@ -0,0 +1,146 @@
+import cluster from 'cluster'
+import { SNAPSHOT_COLLECTIONS, applySeedSnapshot } from '@/lib/seed'
+
+// Where writes go. A single process applies them to its own collections and
+// log (LocalStore). Under the cluster launcher (server.js) every worker
+// keeps a full replica for reads, while writes are sequenced by the primary
+// process and applied on every replica before they are acknowledged
+// (ClusterStore), so any worker can serve any user.
+
+export class StoreConflictError extends Error {
+  constructor(message) {
+    super(message)
+    this.name = 'StoreConflictError'
+  }
+}
+
+export class LocalStore {
+  constructor(db, persistence = null, feed = null) {
+    this.db = db
+    this.persistence = persistence
+    // Change feed (lib/event-feed.js) told about every write applied here
+    this.feed = feed
+    // Set to the cluster worker id when requests can land on different workers
+    this.workerId = null
+  }
+
+  // Recover persisted data, or run seed() for a brand-new store. Returns
+  // what recovery found, or null when nothing was recovered.
+  async load(seed) {
+    if (this.persistence) {
+      const recovered = await this.persistence.recover(this.db)
+      if (this.db.users.size > 0) return recovered
+    }
+
+    await seed()
+    // Seed data bypasses the log, so snapshot it to make it durable as well
+    if (this.persistence) await this.persistence.snapshot()
+    return null
+  }
+
+  write(collection, records, seq) {
+    if (records.length === 1) collection.insert(records[0])
+    else collection.insertMany(records)
+    if (this.feed) this.feed.publish(collection.name, records, seq)
+  }
+
+  // Duplicate ids and user emails, checked like the cluster primary does
+  // (server.js), against the collection and within the batch
+  conflict(collection, records) {
+    const ids = new Set()
+    const emails = new Set()
+    for (const record of records) {
+      if (collection.get(record.id) || ids.has(record.id)) return `Duplicate id ${record.id}`
+      ids.add(record.id)
+      if (collection.findByEmail) {
+        if (collection.findByEmail(record.email) || emails.has(record.email)) return 'User already exists'
+        emails.add(record.email)
+      }
+    }
+    return null
+  }
+
+  // Resolves once the records are stored (and durable, with persistence).
+  // Rejects with StoreConflictError for a duplicate id or user email, which
+  // a request can hit after awaiting between its own check and the write.
+  async insert(collection, records) {
+    const conflict = this.conflict(collection, records)
+    if (conflict) throw new StoreConflictError(conflict)
+    this.write(collection, records)
+    if (this.persistence) await this.persistence.append(collection.name, records)
+    return records
+  }
+}
+
+export class ClusterStore extends LocalStore {
+  constructor(db, persistence = null, feed = null) {
+    super(db, persistence, feed)
+    this.workerId = String(cluster.worker.id)
+    // The leader seeds or recovers the data and is the only worker writing the log
+    this.leader = false
+    this.synced = new Promise(resolve => { this.onSynced = resolve })
+    this.nextId = 0
+    this.requests = new Map()
+    process.on('message', message => this.receive(message))
+  }
+
+  receive(message) {
+    if (message?.type === 'store:synced') {
+      this.onSynced(message)
+    } else if (message?.type === 'store:apply') {
+      // Writes arrive in the primary's order on every replica, so the
+      // primary's sequence numbers give every worker the same event ids
+      this.write(this.db[message.name], message.records, message.seq + 1)
+      const durable = this.leader && this.persistence
+        ? this.persistence.append(message.name, message.records)
+        : null
+      Promise.resolve(durable).then(
+        () => process.send({ type: 'store:applied', seq: message.seq }),
+        error => console.error('Replicated write could not be logged:', error)
+      )
+    } else if (message?.type === 'store:result') {
+      const request = this.requests.get(message.id)
+      if (!request) return
+      this.requests.delete(message.id)
+      if (message.error) request.reject(new StoreConflictError(message.error))
+      else request.resolve()
+    }
+  }
+
+  // The first worker to start leads and hands its data to the primary;
+  // every other worker starts from the primary's copy
+  async load(seed) {
+    process.send({ type: 'store:sync' })
+    const { lead, state, epoch, seq } = await this.synced
+    if (this.feed) this.feed.restart(epoch, seq)
+    if (!lead) {
+      applySeedSnapshot(this.db, state)
+      return null
+    }
+
+    this.leader = true
+    const recovered = await super.load(seed)
+    const loaded = {}
+    for (const name of SNAPSHOT_COLLECTIONS) {
+      loaded[name] = this.db[name].all()
+    }
+    process.send({ type: 'store:loaded', state: loaded })
+    return recovered
+  }
+
+  // Resolves once every replica, including this one, holds the records.
+  // Rejects with StoreConflictError for a duplicate id or user email.
+  insert(collection, records) {
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++
+      this.requests.set(id, { resolve: () => resolve(records), reject })
+      process.send({ type: 'store:insert', id, name: collection.name, records })
+    })
+  }
+}
+
+export function createStore(db, persistence = null, feed = null) {
+  return cluster.isWorker && process.env.CLUSTER_STORE === '1'
+    ? new ClusterStore(db, persistence, feed)
+    : new LocalStore(db, persistence, feed)
+}
@@ -0,0 +1,74 @@
+// Bounded LRU of verified JWTs, so repeated authenticated requests skip the
+// signature check and the user lookup. Entries expire with the token's own
+// `exp`, and all of a user's entries are dropped once that user's role no
+// longer matches the role seen when the token was cached.
+export class TokenCache {
+  constructor({ maxEntries = 10000 } = {}) {
+    this.maxEntries = maxEntries
+    // Map iteration order doubles as recency order: oldest entry first
+    this.entries = new Map()
+    this.tokensByUser = new Map()
+  }
+
+  get size() {
+    return this.entries.size
+  }
+
+  get(token) {
+    const entry = this.entries.get(token)
+    if (!entry) return undefined
+    if (entry.expiresAt <= Date.now()) {
+      this.delete(token)
+      return undefined
+    }
+    if (entry.user.role !== entry.role) {
+      this.invalidateUser(entry.user.id)
+      return undefined
+    }
+    this.entries.delete(token)
+    this.entries.set(token, entry)
+    return entry
+  }
+
+  set(token, decoded, user) {
+    if (this.maxEntries <= 0) return
+    this.delete(token)
+    const entry = {
+      decoded,
+      user,
+      role: user.role,
+      expiresAt: decoded.exp ? decoded.exp * 1000 : Infinity
+    }
+    this.entries.set(token, entry)
+
+    let tokens = this.tokensByUser.get(user.id)
+    if (!tokens) {
+      tokens = new Set()
+      this.tokensByUser.set(user.id, tokens)
+    }
+    tokens.add(token)
+
+    if (this.entries.size > this.maxEntries) {
+      this.delete(this.entries.keys().next().value)
+    }
+  }
+
+  delete(token) {
+    const entry = this.entries.get(token)
+    if (!entry) return
+    this.entries.delete(token)
+    const tokens = this.tokensByUser.get(entry.user.id)
+    tokens.delete(token)
+    if (tokens.size === 0) this.tokensByUser.delete(entry.user.id)
+  }
+
+  // Forget every cached token of a user, e.g. after a role change or removal
+  invalidateUser(userId) {
+    const tokens = this.tokensByUser.get(userId)
+    if (!tokens) return
+    for (const token of tokens) {
+      this.entries.delete(token)
+    }
+    this.tokensByUser.delete(userId)
+  }
+}
@@ -0,0 +1,185 @@
+// Cluster launcher: runs the Next.js server on every core and keeps the
+// workers' data in sync (see lib/store.js).
+//
+//   node server.js [-p 3000]      WEB_CONCURRENCY=<workers>, default: one per core
+//
+// The primary process is the shared store. It holds a copy of every
+// collection, hands it to workers as they start, and sequences writes: each
+// one is checked for duplicate ids / user emails, broadcast to all workers,
+// and acknowledged to the writer once every worker has applied it.
+const cluster = require('cluster')
+const crypto = require('crypto')
+const http = require('http')
+const os = require('os')
+
+const COLLECTIONS = ['users', 'rockets', 'missions', 'teams', 'schedules']
+
+class StorePrimary {
+  constructor({ durable = false } = {}) {
+    // With DATA_DIR only the leader's log is durable, so losing it stops the cluster
+    this.durable = durable
+    this.state = null
+    this.ids = {}
+    this.emails = new Set()
+    this.leader = null
+    this.waiting = []
+    this.members = new Set()
+    this.seq = 0
+    // Write sequence numbers double as change feed event ids within this epoch
+    this.epoch = crypto.randomUUID().slice(0, 8)
+    this.pending = new Map()
+  }
+
+  attach(worker) {
+    worker.on('message', message => this.receive(worker, message))
+  }
+
+  receive(worker, message) {
+    if (!message || typeof message.type !== 'string') return
+    if (message.type === 'store:sync') this.sync(worker)
+    else if (message.type === 'store:loaded') this.loaded(worker, message.state)
+    else if (message.type === 'store:insert') this.insert(worker, message)
+    else if (message.type === 'store:applied') this.applied(worker, message.seq)
+  }
+
+  sync(worker) {
+    if (this.state) {
+      this.members.add(worker)
+      worker.send({ type: 'store:synced', lead: false, state: this.state, epoch: this.epoch, seq: this.seq })
+    } else if (!this.leader) {
+      this.leader = worker
+      worker.send({ type: 'store:synced', lead: true, epoch: this.epoch, seq: this.seq })
+    } else {
+      this.waiting.push(worker)
+    }
+  }
+
+  loaded(worker, state) {
+    this.state = {}
+    for (const name of COLLECTIONS) {
+      this.state[name] = state[name] || []
+      this.ids[name] = new Set(this.state[name].map(record => record.id))
+    }
+    for (const user of this.state.users) {
+      this.emails.add(user.email)
+    }
+    this.members.add(worker)
+    for (const waiting of this.waiting.splice(0)) {
+      if (waiting.isConnected()) this.sync(waiting)
+    }
+  }
+
+  insert(worker, { id, name, records }) {
+    const conflict = this.conflict(name, records)
+    if (conflict) {
+      worker.send({ type: 'store:result', id, error: conflict })
+      return
+    }
+
+    for (const record of records) {
+      this.state[name].push(record)
+      this.ids[name].add(record.id)
+      if (name === 'users') this.emails.add(record.email)
+    }
+    const seq = this.seq++
+    this.pending.set(seq, { worker, id, remaining: new Set(this.members) })
+    for (const member of this.members) {
+      member.send({ type: 'store:apply', seq, name, records })
+    }
+  }
+
+  conflict(name, records) {
+    if (!this.state) return 'Store is still loading'
+    if (!this.ids[name]) return `Unknown collection ${name}`
+    const ids = new Set()
+    const emails = new Set()
+    for (const record of records) {
+      if (this.ids[name].has(record.id) || ids.has(record.id)) return `Duplicate id ${record.id}`
+      ids.add(record.id)
+      if (name === 'users') {
+        if (this.emails.has(record.email) || emails.has(record.email)) return 'User already exists'
+        emails.add(record.email)
+      }
+    }
+    return null
+  }
+
+  applied(worker, seq) {
+    const write = this.pending.get(seq)
+    if (!write) return
+    write.remaining.delete(worker)
+    this.settle(seq, write)
+  }
+
+  settle(seq, write) {
+    if (write.remaining.size > 0) return
+    this.pending.delete(seq)
+    if (write.worker.isConnected()) write.worker.send({ type: 'store:result', id: write.id })
+  }
+
+  // A replacement worker syncs from this.state; in-flight writes stop waiting for the dead one
+  remove(worker) {
+    this.members.delete(worker)
+    this.waiting = this.waiting.filter(waiting => waiting !== worker)
+    for (const [seq, write] of this.pending) {
+      write.remaining.delete(worker)
+      this.settle(seq, write)
+    }
+
+    if (worker !== this.leader) return
+    if (this.durable) {
+      console.error('Store leader exited; stopping so the cluster restarts from the write-ahead log')
+      process.exit(1)
+    }
+    this.leader = null
+    // A leader that died while loading leaves the store empty: let the next worker load it
+    if (!this.state && this.waiting.length > 0) this.sync(this.waiting.shift())
+  }
+}
+
+function parsePort(argv) {
+  const index = argv.findIndex(arg => arg === '-p' || arg === '--port')
+  return Number(index >= 0 ? argv[index + 1] : process.env.PORT || 3000)
+}
+
+function startPrimary() {
+  const workers = Number(process.env.WEB_CONCURRENCY) || os.availableParallelism?.() || os.cpus().length
+  const store = new StorePrimary({ durable: Boolean(process.env.DATA_DIR) })
+  // Structured clone keeps Dates (createdAt) intact across IPC
+  cluster.setupPrimary({ serialization: 'advanced' })
+
+  const fork = () => store.attach(cluster.fork({ CLUSTER_STORE: '1' }))
+  for (let i = 0; i < workers; i++) fork()
+
+  cluster.on('exit', (worker, code, signal) => {
+    store.remove(worker)
+    if (!worker.exitedAfterDisconnect) {
+      console.error(`Worker ${worker.id} exited (${signal || code}); starting a replacement`)
+      fork()
+    }
+  })
+  console.log(`Primary ${process.pid} started ${workers} workers`)
+}
+
+async function startWorker() {
+  const next = require('next')
+  const hostname = process.env.HOSTNAME || '0.0.0.0'
+  const port = parsePort(process.argv)
+  const app = next({ dev: false, hostname, port })
+  const handle = app.getRequestHandler()
+  await app.prepare()
+  http.createServer((req, res) => handle(req, res)).listen(port, hostname)
+}
+
+if (require.main === module) {
+  if (cluster.isPrimary) {
+    startPrimary()
+  } else {
+    startWorker().catch(error => {
+      console.error('Worker failed to start:', error)
+      process.exit(1)
+    })
+  }
+}
+
+module.exports = { StorePrimary, startPrimary }
@@ -0,0 +1,929 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the AstroLaunch /api surface (app/api/[[...path]]/route.js)
+Serves on aiohttp (in a child process under backend_test.py --local) so the tests can run offline and without internet latency
+"""
+
+import asyncio
+import base64
+import collections
+import functools
+import hashlib
+import glob
+import hmac
+import json
+import os
+import re
+import resource
+import secrets
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+JWT_SECRET = os.environ.get("JWT_SECRET", "your-secret-key-here")
+TOKEN_TTL = 24 * 60 * 60
+ADMIN_EMAIL = "admin@astrolaunch.com"
+ADMIN_PASSWORD = "admin123"
+COLLECTIONS = ("rockets", "missions", "teams", "schedules")
+MAX_BULK_ITEMS = 100_000
+MAX_BULK_BYTES = 64 * 1024 * 1024
+MAX_PAGE_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 100
+MAX_EVENT_RECORDS = 100
+SEARCHABLE_COLLECTIONS = ("missions", "schedules")
+SEARCH_FIELDS = ("status", "launchSite", "customer", "rocket")
+TEXT_FIELDS = ("name", "missionName", "description")
+FSYNC_POLICIES = ("always", "batch", "interval", "off")
+# Histogram upper bounds in seconds, as BUCKETS in lib/metrics.js
+METRIC_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, If-None-Match, Last-Event-ID",
+    "Access-Control-Expose-Headers": "ETag",
+    "Access-Control-Allow-Credentials": "true"
+}
+
+
+def now_iso():
+    """Timestamp formatted like a JSON-serialized JavaScript Date"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def date_iso(value):
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def parse_time(value):
+    """Epoch milliseconds of an ISO date, or None if it is not one (Date.parse without the NaN)"""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp() * 1000
+
+
+def hash_password(password):
+    salt = secrets.token_hex(8)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 1000).hex()
+    return f"{salt}${digest}"
+
+
+def check_password(password, hashed):
+    salt, digest = hashed.split("$")
+    candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 1000).hex()
+    return hmac.compare_digest(candidate, digest)
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(data):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign_token(payload):
+    """HS256 JWT, same claims and lifetime as jwt.sign in route.js"""
+    issued = int(time.time())
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    body = _b64(json.dumps({**payload, "iat": issued, "exp": issued + TOKEN_TTL}).encode())
+    signature = hmac.new(JWT_SECRET.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64(signature)}"
+
+
+def verify_token(request):
+    """Decoded claims for a valid bearer token, otherwise None"""
+    parts = request.headers.get("Authorization", "").split(" ")
+    if len(parts) < 2 or not parts[1]:
+        return None
+    try:
+        header, body, signature = parts[1].split(".")
+        expected = hmac.new(JWT_SECRET.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_unb64(signature), expected):
+            return None
+        claims = json.loads(_unb64(body))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def public_user(user):
+    return {key: value for key, value in user.items() if key != "password"}
+
+
+class Histogram:
+    """Cumulative latency histogram serialized like Histogram.toJSON() in lib/metrics.js (without percentiles)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(METRIC_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        index = next((i for i, bound in enumerate(METRIC_BUCKETS) if seconds <= bound), len(METRIC_BUCKETS))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def to_json(self):
+        total = 0
+        buckets = []
+        for bound, count in zip(METRIC_BUCKETS + ("+Inf",), self.counts):
+            total += count
+            buckets.append([bound, total])
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+def sample_data():
+    """The same seed records route.js creates in initializeSampleData"""
+    created = now_iso()
+    rockets = [
+        {"name": "Falcon Heavy", "type": "Heavy-lift launch vehicle",
+         "specifications": {"height": "70 m", "diameter": "12.2 m", "mass": "1,420,788 kg", "payloadToLEO": "63,800 kg"},
+         "status": "active"},
+        {"name": "Starship", "type": "Super heavy-lift launch vehicle",
+         "specifications": {"height": "120 m", "diameter": "9 m", "mass": "5,000,000 kg", "payloadToLEO": "150,000 kg"},
+         "status": "development"},
+        {"name": "Dragon Capsule", "type": "Crew and cargo spacecraft",
+         "specifications": {"height": "8.1 m", "diameter": "4 m", "mass": "12,200 kg", "payloadToLEO": "6,000 kg"},
+         "status": "active"}
+    ]
+    missions = [
+        {"name": "Artemis Moon Mission", "description": "Return humans to the Moon and establish a sustainable lunar presence",
+         "status": "planned", "launchDate": date_iso("2025-12-15"), "customer": "NASA", "payload": "Orion Spacecraft", "orbit": "Lunar"},
+        {"name": "Mars Sample Return", "description": "Retrieve samples collected by the Perseverance rover from Mars",
+         "status": "development", "launchDate": date_iso("2025-09-20"), "customer": "NASA/ESA",
+         "payload": "Mars Sample Return Orbiter", "orbit": "Mars Transfer"},
+        {"name": "Starlink Constellation", "description": "Deploy next-generation internet satellites for global coverage",
+         "status": "success", "launchDate": date_iso("2025-01-10"), "customer": "SpaceX", "payload": "Starlink Satellites", "orbit": "LEO"}
+    ]
+    teams = [
+        {"name": "Dr. Sarah Chen", "position": "Chief Technology Officer", "department": "Engineering",
+         "experience": "15 years", "bio": "Leading expert in propulsion systems and spacecraft design."},
+        {"name": "Commander Alex Rodriguez", "position": "Flight Operations Director", "department": "Operations",
+         "experience": "20 years", "bio": "Former astronaut with multiple space missions under their belt."},
+        {"name": "Dr. Michael Kumar", "position": "Lead Scientist", "department": "Science",
+         "experience": "12 years", "bio": "Specialized in planetary science and mission planning."}
+    ]
+    schedules = [
+        {"missionName": "Europa Clipper Mission", "description": "Orbital mission to study Jupiter's moon Europa",
+         "launchDate": date_iso("2025-08-15"), "launchTime": "14:30 UTC", "rocket": "Falcon Heavy",
+         "launchSite": "Kennedy Space Center", "customer": "NASA", "payload": "Europa Clipper", "status": "scheduled"},
+        {"missionName": "ISS Resupply Mission", "description": "Cargo resupply mission to International Space Station",
+         "launchDate": date_iso("2025-03-10"), "launchTime": "11:45 UTC", "rocket": "Dragon Capsule",
+         "launchSite": "Kennedy Space Center", "customer": "NASA", "payload": "Cargo Dragon", "status": "scheduled"}
+    ]
+    data = {"rockets": rockets, "missions": missions, "teams": teams, "schedules": schedules}
+    return {
+        name: [{"id": str(uuid.uuid4()), **record, "createdAt": created} for record in records]
+        for name, records in data.items()
+    }
+
+
+class FakeAstroLaunchAPI:
+    """In-memory implementation of the route.js handlers"""
+
+    def __init__(self, data_dir=None, fsync="batch", fsync_interval=1.0, snapshot_every=100_000, capture_file=None):
+        # Users are indexed by id and email, like the Collection classes in lib/db.js
+        self.users_by_id = {}
+        self.users_by_email = {}
+        self.db = {name: [] for name in COLLECTIONS}
+        # Position of each record in its append-only collection, for keyset cursors
+        self.positions = {name: {} for name in COLLECTIONS}
+        # Bumped on every write; list bodies are cached per (collection, version)
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.versions = {name: 0 for name in COLLECTIONS}
+        self.body_cache = {}
+        # Change feed, like lib/event-feed.js: the last EVENT_RING_SIZE insert events plus live subscriber queues
+        self.event_seq = 0
+        self.events = collections.deque(maxlen=int(os.environ.get("EVENT_RING_SIZE", 1000)))
+        self.subscribers = set()
+        # GET /metrics: request timings per (method, route pattern); no event-loop or bcrypt sampling here
+        self.request_metrics = {}
+        self.errors = collections.Counter()
+        self.started_at = time.time()
+        # Admission for the password routes, like the auth class in lib/admission.js (ADMISSION=off disables):
+        # AUTH_LIMIT hash at once, AUTH_QUEUE more wait, the rest get 503. No lag shedding or rate limits here.
+        self.auth_slots = None if os.environ.get("ADMISSION") == "off" else asyncio.Semaphore(int(os.environ.get("AUTH_LIMIT", 8)))
+        self.auth_queue = int(os.environ.get("AUTH_QUEUE", 32))
+        self.auth_waiting = 0
+        # Optional traffic capture in the lib/capture.js format (larger bodies than CAPTURE_MAX_BODY_BYTES keep only their size)
+        self.capture = open(capture_file, "a", buffering=1) if capture_file else None
+        self.capture_start = time.perf_counter()
+        self.capture_max_body = int(os.environ.get("CAPTURE_MAX_BODY_BYTES", 64 * 1024))
+        if self.capture:
+            self.capture.write(json.dumps({"format": "astrolaunch-capture", "version": 1,
+                                           "startedAt": datetime.now(timezone.utc).isoformat(), "worker": None}) + "\n")
+
+        # Optional write-ahead log + snapshot persistence, like lib/persistence.js
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}")
+        self.data_dir = data_dir
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.lsn = 0
+        self.since_snapshot = 0
+        self.log = None
+        self.last_fsync = time.monotonic()
+        self.group_commit = None
+        if data_dir:
+            self.recover()
+            if self.users_by_id:
+                return
+
+        for name, records in sample_data().items():
+            self.insert_records(name, records)
+        self.insert_records("users", [{
+            "id": str(uuid.uuid4()),
+            "email": ADMIN_EMAIL,
+            "name": "Admin User",
+            "password": hash_password(ADMIN_PASSWORD),
+            "role": "admin",
+            "createdAt": now_iso()
+        }])
+        if data_dir:
+            self.snapshot()
+
+    def add_user(self, user):
+        self.users_by_id[user["id"]] = user
+        self.users_by_email[user["email"]] = user
+
+    def insert_records(self, name, records):
+        """Append records to a collection (or "users") as one write"""
+        if name == "users":
+            for user in records:
+                self.add_user(user)
+            return
+        for record in records:
+            self.positions[name][record["id"]] = len(self.db[name])
+            self.db[name].append(record)
+        if records:
+            self.versions[name] += 1
+
+    def publish(self, name, records):
+        """Record an insert event and hand its SSE frame to every subscriber of that collection"""
+        self.event_seq += 1
+        data = {"collection": name, "records": records} if len(records) <= MAX_EVENT_RECORDS else \
+            {"collection": name, "count": len(records), "ids": [record["id"] for record in records]}
+        event = (self.event_seq, name, f"id: {self.boot_id}-{self.event_seq}\nevent: insert\ndata: {json.dumps(data)}\n\n".encode())
+        self.events.append(event)
+        for wanted, queue in self.subscribers:
+            if wanted is None or name in wanted:
+                queue.put_nowait(event[2])
+
+    async def stream_events(self, request):
+        """GET /events: SSE replay after Last-Event-ID from the ring (or a reset event), then live inserts"""
+        only = request.query.get("collections")
+        wanted = {name.strip() for name in only.split(",")} if only else None
+        unknown = sorted((wanted or set()) - set(COLLECTIONS))
+        if unknown:
+            return {"error": f"Unknown collections: {', '.join(unknown)}"}, 400
+
+        response = web.StreamResponse(status=200, headers={
+            **CORS_HEADERS, "Content-Type": "text/event-stream", "Cache-Control": "no-cache, no-transform"
+        })
+        await response.prepare(request)
+        await response.write(b"retry: 3000\n\n")
+
+        last_event_id = request.headers.get("Last-Event-ID") or request.query.get("lastEventId")
+        if last_event_id:
+            epoch, _, seq = last_event_id.rpartition("-")
+            dropped = self.events[0][0] - 1 if len(self.events) == self.events.maxlen else 0
+            if epoch != self.boot_id or not seq.isdigit() or int(seq) < dropped:
+                await response.write(f"id: {self.boot_id}-{self.event_seq}\nevent: reset\ndata: {{}}\n\n".encode())
+            else:
+                for event_seq, name, frame in list(self.events):
+                    if event_seq > int(seq) and (wanted is None or name in wanted):
+                        await response.write(frame)
+
+        subscriber = (frozenset(wanted) if wanted else None, asyncio.Queue())
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber[1].get(), timeout=15)
+                except asyncio.TimeoutError:
+                    frame = b": ping\n\n"
+                await response.write(frame)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+        return response
+
+    def observe_request(self, method, pattern, status, seconds):
+        series = self.request_metrics.get((method, pattern))
+        if series is None:
+            series = self.request_metrics[(method, pattern)] = {"statuses": collections.Counter(), "duration": Histogram()}
+        series["statuses"][str(status)] += 1
+        series["duration"].observe(seconds)
+
+    async def begin_capture(self, request, route):
+        """Capture entry for a request, read before its handler consumes the body"""
+        path = route + (f"?{request.query_string}" if request.query_string else "")
+        entry = {"t": round((time.perf_counter() - self.capture_start) * 1000, 1), "method": request.method, "path": path}
+        headers = {name: request.headers[name] for name in ("accept", "if-none-match", "last-event-id") if name in request.headers}
+        if headers:
+            entry["headers"] = headers
+        streamed = "application/x-ndjson" in request.content_type
+        if request.can_read_body and (streamed or (request.content_length or 0) > self.capture_max_body):
+            # Left unread like lib/capture.js, so streamed bulk uploads are still parsed as they arrive
+            entry["bodyBytes"] = request.content_length
+            entry["contentType"] = request.content_type
+        elif request.can_read_body:
+            raw = await request.read()
+            if len(raw) > self.capture_max_body:
+                entry["bodyBytes"] = len(raw)
+            elif "application/json" in request.content_type:
+                try:
+                    body = json.loads(raw)
+                except ValueError:
+                    body = raw.decode()
+                if isinstance(body, dict) and "password" in body:
+                    body = {**body, "password": "[redacted]"}
+                entry["body"] = body
+            elif raw:
+                entry["body"] = raw.decode()
+                entry["contentType"] = request.content_type
+        return entry
+
+    def caller_role(self, request):
+        if "Authorization" not in request.headers:
+            return None
+        claims = verify_token(request)
+        user = self.users_by_id.get(claims["userId"]) if claims else None
+        return user["role"] if user else "invalid"
+
+    async def metrics(self, request):
+        """GET /metrics: the JSON form only"""
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {
+            "uptimeSeconds": time.time() - self.started_at,
+            "requests": [
+                {"method": method, "route": pattern, "statuses": dict(series["statuses"]),
+                 "duration": series["duration"].to_json()}
+                for (method, pattern), series in sorted(self.request_metrics.items(), key=lambda item: (item[0][1], item[0][0]))
+            ],
+            "errors": dict(self.errors),
+            "passwordQueueTime": Histogram().to_json(),
+            "eventLoopLag": Histogram().to_json(),
+            # Peak rather than current RSS, which the standard library can't read portably
+            "memory": {"rss": peak_rss, "heapUsed": 0, "heapTotal": 0, "external": 0},
+            "gauges": {
+                "collection_records": {"users": len(self.users_by_id), **{name: len(self.db[name]) for name in COLLECTIONS}},
+                "event_feed_subscribers": len(self.subscribers)
+            }
+        }, 200
+
+    def segment_path(self, lsn):
+        return os.path.join(self.data_dir, f"wal-{lsn:016d}.log")
+
+    def recover(self):
+        """Load snapshot.json, replay newer log entries and open a fresh log segment"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        try:
+            with open(os.path.join(self.data_dir, "snapshot.json")) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = {}
+        self.lsn = snapshot.get("lsn", 0)
+        for name in ("users",) + COLLECTIONS:
+            self.insert_records(name, snapshot.get(name, []))
+
+        replayed = 0
+        for segment in sorted(glob.glob(os.path.join(self.data_dir, "wal-*.log"))):
+            with open(segment) as f:
+                lines = [line for line in f if line.strip()]
+            for number, line in enumerate(lines):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Only the final line may be torn: a write that was never acknowledged
+                    if number == len(lines) - 1:
+                        break
+                    raise
+                if entry["lsn"] > self.lsn:
+                    self.insert_records(entry["collection"], entry["items"])
+                    self.lsn = entry["lsn"]
+                    replayed += 1
+
+        self.since_snapshot = replayed
+        self.log = open(self.segment_path(self.lsn + 1), "a")
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write snapshot.json atomically, start a new segment and delete the ones it covers"""
+        state = {"lsn": self.lsn, "users": list(self.users_by_id.values()), **self.db}
+        target = os.path.join(self.data_dir, "snapshot.json")
+        with open(target + ".tmp", "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(target + ".tmp", target)
+
+        self.log.close()
+        self.log = open(self.segment_path(self.lsn + 1), "a")
+        for segment in glob.glob(os.path.join(self.data_dir, "wal-*.log")):
+            if int(os.path.basename(segment)[4:-4]) <= self.lsn:
+                os.remove(segment)
+        self.since_snapshot = 0
+
+    async def persist(self, name, records):
+        """Log records that were just inserted; returns once durable under the fsync policy"""
+        if not self.data_dir:
+            return
+        self.lsn += 1
+        self.log.write(json.dumps({"lsn": self.lsn, "collection": name, "items": records}) + "\n")
+        self.log.flush()
+        self.since_snapshot += 1
+
+        if self.fsync == "always":
+            os.fsync(self.log.fileno())
+        elif self.fsync == "batch":
+            # Group commit: every write logged during this loop iteration shares one fsync
+            if self.group_commit is None:
+                self.group_commit = asyncio.get_running_loop().create_future()
+                asyncio.get_running_loop().call_soon(self.commit_group)
+            await asyncio.shield(self.group_commit)
+        elif self.fsync == "interval" and time.monotonic() - self.last_fsync >= self.fsync_interval:
+            os.fsync(self.log.fileno())
+            self.last_fsync = time.monotonic()
+
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def commit_group(self):
+        group, self.group_commit = self.group_commit, None
+        os.fsync(self.log.fileno())
+        group.set_result(None)
+
+    def admit_auth(self, handler):
+        async def admitted(request):
+            if self.auth_slots is None:
+                return await handler(request)
+            if self.auth_slots.locked() and self.auth_waiting >= self.auth_queue:
+                return web.json_response({"error": "Server busy, please retry"}, status=503,
+                                         headers={**CORS_HEADERS, "Retry-After": "1"})
+            self.auth_waiting += 1
+            try:
+                await self.auth_slots.acquire()
+            finally:
+                self.auth_waiting -= 1
+            try:
+                return await handler(request)
+            finally:
+                self.auth_slots.release()
+        return admitted
+
+    def issue_token(self, user):
+        return sign_token({"userId": user["id"], "email": user["email"], "role": user["role"]})
+
+    async def root(self, request):
+        return {"message": "AstroLaunch API"}, 200
+
+    async def register(self, request):
+        body = await request.json()
+        email, password, name = body.get("email"), body.get("password"), body.get("name")
+        if not email or not password or not name:
+            return {"error": "Email, password, and name are required"}, 400
+        if email in self.users_by_email:
+            return {"error": "User already exists"}, 400
+
+        # Hash off the event loop, like the real server's worker pool
+        hashed = await asyncio.to_thread(hash_password, password)
+        if email in self.users_by_email:
+            return {"error": "User already exists"}, 400
+
+        user = {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "name": name,
+            "password": hashed,
+            "role": "user",
+            "createdAt": now_iso()
+        }
+        self.add_user(user)
+        await self.persist("users", [user])
+        return {"user": public_user(user), "token": self.issue_token(user)}, 200
+
+    async def login(self, request):
+        body = await request.json()
+        email, password = body.get("email"), body.get("password")
+        if not email or not password:
+            return {"error": "Email and password are required"}, 400
+
+        user = self.users_by_email.get(email)
+        if not user or not await asyncio.to_thread(check_password, password, user["password"]):
+            return {"error": "Invalid credentials"}, 401
+        return {"user": public_user(user), "token": self.issue_token(user)}, 200
+
+    async def verify(self, request):
+        decoded = verify_token(request)
+        user = self.users_by_id.get(decoded["userId"]) if decoded else None
+        if not user:
+            return {"valid": False}, 401
+        return {"valid": True, "user": public_user(user)}, 200
+
+    def list_collection(self, name):
+        async def handler(request):
+            query = request.query
+            if query.get("after") and query["after"] not in self.positions[name]:
+                return {"error": "Invalid cursor"}, 400
+
+            ndjson = "application/x-ndjson" in request.headers.get("Accept", "")
+            etag = f'"{self.boot_id}-{name}-{self.versions[name]}{"-ndjson" if ndjson else ""}"'
+            headers = {**CORS_HEADERS, "ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+            if any(tag.strip().removeprefix("W/") in (etag, "*") for tag in request.headers.get("If-None-Match", "").split(",")):
+                return web.Response(status=304, headers=headers)
+            if ndjson:
+                return await self.stream_collection(request, name, headers)
+
+            text, status = self.list_body(name, query, request.query_string)
+            if status != 200:
+                return text, status
+            return web.Response(text=text, content_type="application/json", headers=headers)
+        return handler
+
+    def list_body(self, name, query, query_string):
+        """Serialized list page, cached per collection version and query string"""
+        key = (name, self.versions[name], query_string)
+        if key not in self.body_cache:
+            body, status = self.page_collection(name, query)
+            if status != 200:
+                return body, status
+            self.body_cache = {k: v for k, v in self.body_cache.items() if k[1] == self.versions[k[0]]}
+            self.body_cache[key] = json.dumps(body)
+        return self.body_cache[key], 200
+
+    async def dashboard(self, request):
+        """Every collection in one body, built from the cached list bodies"""
+        query = request.query
+        if "after" in query:
+            return {"error": "Cursors are per collection; continue paging through the collection's own route"}, 400
+
+        version = f"{self.boot_id}-{'.'.join(str(self.versions[name]) for name in COLLECTIONS)}"
+        etag = f'"{version}-dashboard"'
+        headers = {**CORS_HEADERS, "ETag": etag, "Cache-Control": "no-cache"}
+        if any(tag.strip().removeprefix("W/") in (etag, "*") for tag in request.headers.get("If-None-Match", "").split(",")):
+            return web.Response(status=304, headers=headers)
+
+        parts = []
+        for name in COLLECTIONS:
+            text, status = self.list_body(name, query, request.query_string)
+            if status != 200:
+                return text, status
+            parts.append(f'"{name}":{text}')
+        body = f'{{"version":{json.dumps(version)},{",".join(parts)}}}'
+        return web.Response(text=body, content_type="application/json", headers=headers)
+
+    async def stream_collection(self, request, name, headers):
+        """NDJSON list: records are written in ~64 KB chunks, each awaiting the socket drain"""
+        query = request.query
+        try:
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError:
+            limit = 0
+        if limit is not None and limit < 1:
+            return {"error": "limit must be a positive integer"}, 400
+
+        records = self.db[name][:]
+        index = self.positions[name][query["after"]] if query.get("after") else len(records)
+        status = query.get("status")
+        keys = ["id"] + [field.strip() for field in query["fields"].split(",") if field.strip()] if query.get("fields") else None
+
+        response = web.StreamResponse(status=200, headers={**headers, "Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        sent = 0
+        chunk = []
+        size = 0
+        while index > 0 and (limit is None or sent < limit):
+            index -= 1
+            record = records[index]
+            if status and record.get("status") != status:
+                continue
+            if keys:
+                record = {key: record[key] for key in keys if key in record}
+            line = json.dumps(record) + "\n"
+            chunk.append(line)
+            size += len(line)
+            sent += 1
+            if size >= 64 * 1024:
+                await response.write("".join(chunk).encode())
+                chunk, size = [], 0
+        if chunk:
+            await response.write("".join(chunk).encode())
+        await response.write_eof()
+        return response
+
+    def page_collection(self, name, query):
+        """Newest-first page of a collection for ?limit=&after=&status=&fields="""
+        records = self.db[name]
+        limit = None
+        if "limit" in query:
+            try:
+                limit = int(query["limit"])
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return {"error": "limit must be a positive integer"}, 400
+            limit = min(limit, MAX_PAGE_SIZE)
+
+        # Records are appended in createdAt order, so newest first walks backwards
+        index = len(records)
+        if query.get("after"):
+            index = self.positions[name][query["after"]]
+
+        status = query.get("status")
+        items = []
+        while index > 0 and (limit is None or len(items) < limit):
+            index -= 1
+            if not status or records[index].get("status") == status:
+                items.append(records[index])
+
+        if query.get("fields"):
+            keys = ["id"] + [field.strip() for field in query["fields"].split(",") if field.strip()]
+            items = [{key: item[key] for key in keys if key in item} for item in items]
+
+        if limit is None:
+            return items, 200
+        next_cursor = items[-1]["id"] if len(items) == limit and index > 0 else None
+        return {"items": items, "nextCursor": next_cursor}, 200
+
+    def search_collection(self, name):
+        """Launch-date ordered search by range, exact fields and words; a linear scan instead of indexes"""
+        async def handler(request):
+            query = request.query
+            bounds = {"from": float("-inf"), "to": float("inf")}
+            for bound in bounds:
+                if bound in query:
+                    bounds[bound] = parse_time(query[bound])
+                    if bounds[bound] is None:
+                        return {"error": f"{bound} must be a date"}, 400
+            try:
+                limit = int(query.get("limit", DEFAULT_SEARCH_LIMIT))
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return {"error": "limit must be a positive integer"}, 400
+            limit = min(limit, MAX_PAGE_SIZE)
+
+            where = {field: query[field].strip().lower() for field in SEARCH_FIELDS if field in query}
+            words = set(re.findall(r"\w+", query.get("q", "").lower().replace("_", " ")))
+            matches = []
+            for seq, record in enumerate(self.db[name]):
+                key = parse_time(record["launchDate"]) if record.get("launchDate") is not None else None
+                if key is None:
+                    continue
+                text = " ".join(str(record[field]) for field in TEXT_FIELDS if record.get(field) is not None)
+                if (bounds["from"] <= key <= bounds["to"]
+                        and all(record.get(field) is not None and str(record[field]).strip().lower() == value for field, value in where.items())
+                        and words <= set(re.findall(r"\w+", text.lower().replace("_", " ")))):
+                    matches.append((key, seq, record))
+            matches.sort(key=lambda match: match[:2])
+
+            if query.get("after"):
+                position = next((i for i, match in enumerate(matches) if match[2]["id"] == query["after"]), None)
+                if position is None and query["after"] not in self.positions[name]:
+                    return {"error": "Invalid cursor"}, 400
+                if position is None:
+                    # A cursor outside the results still marks a place in launchDate order
+                    record = self.db[name][self.positions[name][query["after"]]]
+                    cursor = (parse_time(record.get("launchDate")), self.positions[name][query["after"]])
+                    if cursor[0] is None:
+                        return {"error": "Invalid cursor"}, 400
+                    matches = [match for match in matches if match[:2] > cursor]
+                else:
+                    matches = matches[position + 1:]
+
+            items = [record for _, _, record in matches[:limit]]
+            if query.get("fields"):
+                keys = ["id"] + [field.strip() for field in query["fields"].split(",") if field.strip()]
+                items = [{key: item[key] for key in keys if key in item} for item in items]
+            next_cursor = matches[limit - 1][2]["id"] if len(matches) > limit else None
+            return {"items": items, "nextCursor": next_cursor}, 200
+        return handler
+
+    async def get_record(self, name, record_id, request):
+        position = self.positions[name].get(record_id)
+        if position is None:
+            return {"error": f"No record {record_id} in {name}"}, 404
+        return self.db[name][position], 200
+
+    def create_in_collection(self, name):
+        async def handler(request):
+            decoded = verify_token(request)
+            if not decoded:
+                return {"error": "Unauthorized"}, 401
+            user = self.users_by_id.get(decoded["userId"])
+            if not user or user["role"] != "admin":
+                return {"error": "Admin privileges required"}, 403
+
+            record = {"id": str(uuid.uuid4()), **(await request.json()), "createdAt": now_iso()}
+            self.insert_records(name, [record])
+            self.publish(name, [record])
+            await self.persist(name, [record])
+            return record, 201
+        return handler
+
+    def bulk_insert(self, name):
+        """POST /<name>/bulk: a JSON array or NDJSON body, validated in full before anything is inserted"""
+        async def handler(request):
+            decoded = verify_token(request)
+            if not decoded:
+                return {"error": "Unauthorized"}, 401
+            user = self.users_by_id.get(decoded["userId"])
+            if not user or user["role"] != "admin":
+                return {"error": "Admin privileges required"}, 403
+
+            too_large = {"error": f"Body larger than {MAX_BULK_BYTES} bytes", "index": None}, 413
+            if (request.content_length or 0) > MAX_BULK_BYTES:
+                return too_large
+            raw = bytearray()
+            async for chunk in request.content.iter_any():
+                raw += chunk
+                if len(raw) > MAX_BULK_BYTES:
+                    return too_large
+            text = raw.decode()
+            if "application/x-ndjson" in request.headers.get("Content-Type", ""):
+                items = []
+                for line in text.split("\n"):
+                    if not line.strip():
+                        continue
+                    try:
+                        items.append(json.loads(line))
+                    except ValueError:
+                        return {"error": "Invalid JSON line", "index": len(items)}, 400
+            else:
+                try:
+                    items = json.loads(text)
+                except ValueError:
+                    items = None
+                if not isinstance(items, list):
+                    return {"error": "Body must be a JSON array", "index": None}, 400
+
+            for index, item in enumerate(items):
+                if not isinstance(item, dict):
+                    return {"error": "Each item must be a JSON object", "index": index}, 400
+                if index >= MAX_BULK_ITEMS:
+                    return {"error": f"At most {MAX_BULK_ITEMS} items per request", "index": index}, 400
+
+            created_at = now_iso()
+            records = [{"id": str(uuid.uuid4()), **item, "createdAt": created_at} for item in items]
+            ids = []
+            seen = set()
+            for index, record in enumerate(records):
+                if record["id"] in self.positions[name] or record["id"] in seen:
+                    return {"error": f"Duplicate id {record['id']}", "index": index}, 400
+                seen.add(record["id"])
+                ids.append(record["id"])
+
+            self.insert_records(name, records)
+            self.publish(name, records)
+            await self.persist(name, records)
+            return {"count": len(records), "ids": ids}, 201
+        return handler
+
+    def routes(self):
+        table = {
+            ("/", "GET"): self.root,
+            ("/auth/register", "POST"): self.admit_auth(self.register),
+            ("/auth/login", "POST"): self.admit_auth(self.login),
+            ("/auth/verify", "GET"): self.verify,
+            ("/dashboard", "GET"): self.dashboard,
+            ("/events", "GET"): self.stream_events,
+            ("/metrics", "GET"): self.metrics
+        }
+        for name in COLLECTIONS:
+            table[(f"/{name}", "GET")] = self.list_collection(name)
+            table[(f"/{name}", "POST")] = self.create_in_collection(name)
+            table[(f"/{name}/bulk", "POST")] = self.bulk_insert(name)
+        for name in SEARCHABLE_COLLECTIONS:
+            table[(f"/{name}/search", "GET")] = self.search_collection(name)
+        return table
+
+    def make_app(self):
+        table = self.routes()
+
+        async def respond(request, route):
+            """(response, route pattern or "(unmatched)") for one request"""
+            handler = table.get((route, request.method))
+            pattern = route
+            allowed = [method for path, method in table if path == route]
+            parts = route.strip("/").split("/")
+            if handler is None and not allowed and len(parts) == 2 and parts[0] in COLLECTIONS:
+                # The only parameterized route: GET /<collection>/:id
+                allowed = ["GET"]
+                pattern = f"/{parts[0]}/:id"
+                if request.method == "GET":
+                    handler = functools.partial(self.get_record, parts[0], parts[1])
+            if handler is None:
+                pattern = "(unmatched)"
+            try:
+                if handler is None and allowed:
+                    body, status = {"error": f"Method {request.method} not allowed on {route}"}, 405
+                    return web.json_response(body, status=status, headers={**CORS_HEADERS, "Allow": ", ".join(allowed)}), pattern
+                if handler is None:
+                    body, status = {"error": f"Route {route} not found"}, 404
+                else:
+                    result = await handler(request)
+                    if isinstance(result, web.StreamResponse):
+                        return result, pattern
+                    body, status = result
+            except Exception as e:
+                self.errors[type(e).__name__] += 1
+                print(f"API Error: {e}")
+                body, status = {"error": "Internal server error"}, 500
+            return web.json_response(body, status=status, headers=CORS_HEADERS), pattern
+
+        async def dispatch(request):
+            if request.method == "OPTIONS":
+                return web.Response(status=200, headers=CORS_HEADERS)
+
+            route = "/" + request.match_info["path"].strip("/")
+            captured = await self.begin_capture(request, route) if self.capture else None
+            start = time.perf_counter()
+            response, pattern = await respond(request, route)
+            elapsed = time.perf_counter() - start
+            self.observe_request(request.method, pattern, response.status, elapsed)
+            if captured:
+                captured.update(route=pattern, role=self.caller_role(request), status=response.status, ms=round(elapsed * 1000, 3))
+                self.capture.write(json.dumps(captured) + "\n")
+            return response
+
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/api{path:.*}", dispatch)
+        return app
+
+
+# Repository root, the working directory the stand-in is started from as `-m tests.fake_api`
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@contextmanager
+def local_api_server(host="127.0.0.1", port=0, timeout=30):
+    """Fixture that serves a fresh stand-in API in a child process and yields its base URL.
+    A separate process keeps the server off the caller's GIL, so load runs time the server
+    rather than their own contention with it."""
+    if not port:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+    process = subprocess.Popen([sys.executable, "-m", "tests.fake_api", "--host", host, "--port", str(port)],
+                               cwd=REPO_DIR, stdout=subprocess.DEVNULL)
+    base_url = f"http://{host}:{port}/api"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Local API server exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"{base_url}/", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Local API server failed to start")
+                time.sleep(0.05)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the AstroLaunch API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    args = parser.parse_args()
+    api = FakeAstroLaunchAPI(
+        data_dir=os.environ.get("DATA_DIR"),
+        fsync=os.environ.get("WAL_FSYNC", "batch"),
+        fsync_interval=int(os.environ.get("WAL_FSYNC_INTERVAL_MS", 1000)) / 1000,
+        snapshot_every=int(os.environ.get("WAL_SNAPSHOT_EVERY", 100_000)),
+        capture_file=os.environ.get("CAPTURE_FILE")
+    )
+    web.run_app(api.make_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()